@@ -29,24 +29,32 @@ from src.application.orchestration.orchestrator import Orchestrator
 # create_orchestrator removed in favor of setup_orchestrator from src.utils.cli
 
 
-def print_answer(result):
-    """Print the answer with citations."""
-    print("\n" + "=" * 60)
-    print("ANSWER:")
-    print("=" * 60)
-    print(result.answer)
-
-    if result.citations:
+def print_sources(citations):
+    """Print the citation list."""
+    if citations:
         print("\n" + "-" * 60)
         print("SOURCES:")
         print("-" * 60)
-        for i, citation in enumerate(result.citations, 1):
+        for i, citation in enumerate(citations, 1):
             print(f"\n[{i}] {citation.key.document_id}")
             print(f"    Chunk: {citation.key.chunk_id}")
             print(f"    Preview: {citation.content_snippet}...")
     print()
 
 
+def stream_answer(orchestrator: Orchestrator, question: str):
+    """Print the answer as it is generated, followed by its sources."""
+    stream = orchestrator.answer_stream(question)
+    citations = next(stream)
+    print("\n" + "=" * 60)
+    print("ANSWER:")
+    print("=" * 60)
+    for fragment in stream:
+        print(fragment, end="", flush=True)
+    print()
+    print_sources(citations)
+
+
 def interactive_mode(orchestrator: Orchestrator):
     """Run interactive question-answering loop."""
     print("\n" + "=" * 60)
@@ -88,8 +96,7 @@ def interactive_mode(orchestrator: Orchestrator):
 
         print("\nSearching and generating answer...")
         try:
-            result = orchestrator.answer(question)
-            print_answer(result)
+            stream_answer(orchestrator, question)
         except Exception as e:
             print(f"\nError: {e}\n")
 
@@ -98,8 +105,7 @@ def single_question_mode(orchestrator: Orchestrator, question: str):
     """Answer a single question and exit."""
     print(f"\nQuestion: {question}")
     print("Searching and generating answer...")
-    result = orchestrator.answer(question)
-    print_answer(result)
+    stream_answer(orchestrator, question)
 
 
 def extract_questions(markdown_path: Path) -> list[tuple[str, str]]:
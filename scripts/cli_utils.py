@@ -2,11 +2,13 @@
 Shared utilities for CLI scripts.
 """
 
-from typing import Dict, Any, Tuple
-from langchain_ollama import OllamaLLM
-from src.config import OLLAMA_BASE_URL, SQLITE_DB_PATH
+from typing import Dict, Any, Optional, Tuple
+from src.config import SQLITE_DB_PATH
 from src.infrastructure.database.factory import get_db_client
 from src.infrastructure.database.base import VectorDatabaseClient
+from src.rag.ingestion.embedder import EmbeddingClient
+from src.rag.llm import create_llm
+from src.rag.llm_cache import LLMResponseCache
 from src.application.orchestration.orchestrator import Orchestrator
 
 def print_banner(title: str, config: Dict[str, Any]):
@@ -18,14 +20,19 @@ def print_banner(title: str, config: Dict[str, Any]):
         print(f"{key:12}: {value}")
     print("=" * 60 + "\n")
 
-def setup_orchestrator(model: str, temperature: float) -> Tuple[VectorDatabaseClient, Orchestrator]:
+def setup_orchestrator(
+    model: str,
+    temperature: float,
+    llm_cache: Optional[LLMResponseCache] = None
+) -> Tuple[VectorDatabaseClient, Orchestrator]:
     """
     Setup the database client and orchestrator with the given model and temperature.
+    Pass llm_cache to serve repeated low-temperature prompts from the response cache.
     
     Returns:
         Tuple of (db_client, orchestrator)
     """
     db_client = get_db_client()
-    llm = OllamaLLM(base_url=OLLAMA_BASE_URL, model=model, temperature=temperature)
-    orchestrator = Orchestrator(client=db_client, llm=llm)
+    llm = create_llm(model=model, temperature=temperature, cache=llm_cache)
+    orchestrator = Orchestrator(client=db_client, llm=llm, embedding_client=EmbeddingClient())
     return db_client, orchestrator
@@ -15,7 +15,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.rag.ingestion.document_loader import load_document, load_corpus as load_corpus_documents, Document
 from src.rag.ingestion.chunker import chunk_document, Chunk
-from src.rag.ingestion.embedder import generate_embeddings, Embedding
+from src.rag.ingestion.embedder import generate_embeddings, Embedding, EmbeddingClient
 from src.infrastructure.database.factory import get_db_client
 from src.infrastructure.database.base import VectorDatabaseClient, ChunkKey, ChunkRecord
 
@@ -69,32 +69,45 @@ def _build_chunk_records(
     return records
 
 
-def _process_document(document: Document, client: VectorDatabaseClient) -> int:
+def _process_document(
+    document: Document,
+    client: VectorDatabaseClient,
+    embedding_client: EmbeddingClient = None
+) -> int:
     """
     Process a single document: chunk, embed, and store.
 
     Args:
         document: Document to process
         client: Vector database client for storage
+        embedding_client: Optional embedding client. If None, uses generate_embeddings.
 
     Returns:
         Number of chunks stored
     """
     chunks = chunk_document(document)
     texts = [chunk.content for chunk in chunks]
-    embeddings = generate_embeddings(texts)
+    if embedding_client is not None:
+        embeddings = embedding_client.embed_many(texts)
+    else:
+        embeddings = generate_embeddings(texts)
     chunk_records = _build_chunk_records(document.document_id, chunks, embeddings)
     client.batch_insert_chunks(chunk_records)
     return len(chunk_records)
 
 
-def ingest_document(document_path: Path, client: VectorDatabaseClient = None) -> IngestionResult:
+def ingest_document(
+    document_path: Path,
+    client: VectorDatabaseClient = None,
+    embedding_client: EmbeddingClient = None
+) -> IngestionResult:
     """
     Ingest a single document through the full pipeline.
 
     Args:
         document_path: Path to the markdown document
         client: Optional database client. If None, creates one from config.
+        embedding_client: Optional embedding client. If None, uses the shared one.
 
     Returns:
         IngestionResult with document_id and chunks_stored count
@@ -102,7 +115,7 @@ def ingest_document(document_path: Path, client: VectorDatabaseClient = None) ->
     document = load_document(document_path)
     if client is None:
         client = get_db_client()
-    chunks_stored = _process_document(document, client)
+    chunks_stored = _process_document(document, client, embedding_client)
 
     return IngestionResult(
         document_id=document.document_id,
@@ -110,13 +123,18 @@ def ingest_document(document_path: Path, client: VectorDatabaseClient = None) ->
     )
 
 
-def ingest_corpus(corpus_path: Path, client: VectorDatabaseClient = None) -> CorpusIngestionResult:
+def ingest_corpus(
+    corpus_path: Path,
+    client: VectorDatabaseClient = None,
+    embedding_client: EmbeddingClient = None
+) -> CorpusIngestionResult:
     """
     Ingest all documents from a corpus directory.
 
     Args:
         corpus_path: Path to the corpus directory
         client: Optional database client. If None, creates one from config.
+        embedding_client: Optional embedding client. If None, uses the shared one.
 
     Returns:
         CorpusIngestionResult with documents_processed, total_chunks_stored,
@@ -129,7 +147,7 @@ def ingest_corpus(corpus_path: Path, client: VectorDatabaseClient = None) -> Cor
     document_results = []
     total_chunks_stored = 0
     for document in documents:
-        chunks_stored = _process_document(document, client)
+        chunks_stored = _process_document(document, client, embedding_client)
         total_chunks_stored += chunks_stored
         document_results.append(IngestionResult(
             document_id=document.document_id,
@@ -17,7 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from langchain_ollama import OllamaLLM
 from src.config import (
     OLLAMA_BASE_URL, OLLAMA_CHAT_MODEL, SQLITE_DB_PATH, OLLAMA_EMBEDDING_MODEL,
-    LLM_TEMPERATURE, RETRIEVAL_TOP_K, SIMILARITY_THRESHOLD
+    LLM_TEMPERATURE, RETRIEVAL_TOP_K, SIMILARITY_THRESHOLD, LLM_MAX_CONCURRENCY
 )
 from scripts.cli_utils import print_banner, setup_orchestrator
 from src.infrastructure.database.sqlite_client import SQLiteClient
@@ -26,9 +26,9 @@ from src.domain.stores.questionnaire_store import QuestionnaireStore
 from src.domain.stores.run_store import RunStore
 from src.application.runners.questionnaire_runner import QuestionnaireRunner
 from src.rag.rag_system import RAGSystem
+from src.rag.llm_cache import LLMResponseCache
 from src.application.evaluation.evaluator import RAGEvaluator
 from src.domain.stores.evaluation_store import EvaluationStore
-from src.rag.ingestion.embedder import generate_embedding
 
 def main():
     parser = argparse.ArgumentParser(description="Automated evaluation runner.")
@@ -38,11 +38,15 @@ def main():
     parser.add_argument("--questionnaire", type=str, default="sample_questionnaire", help="Questionnaire ID to evaluate (default: sample_questionnaire)")
     parser.add_argument("--temp", type=float, default=LLM_TEMPERATURE, help=f"LLM temperature (default: {LLM_TEMPERATURE}, optimized for llama3.2)")
     parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD, help=f"Similarity threshold (default: {SIMILARITY_THRESHOLD}, optimized for llama3.2)")
+    parser.add_argument("--workers", type=int, default=LLM_MAX_CONCURRENCY, help=f"Questions answered in parallel; match OLLAMA_NUM_PARALLEL (default: {LLM_MAX_CONCURRENCY})")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Continue an interrupted run, skipping questions it already answered")
+    parser.add_argument("--llm-cache", action="store_true", help="Reuse cached LLM responses for identical prompts (temperature <= LLM_CACHE_MAX_TEMPERATURE)")
     args = parser.parse_args()
 
     # 1. Setup Dependencies
     temp = args.temp
-    db_client, orchestrator = setup_orchestrator(model=args.model, temperature=temp)
+    llm_cache = LLMResponseCache() if args.llm_cache else None
+    db_client, orchestrator = setup_orchestrator(model=args.model, temperature=temp, llm_cache=llm_cache)
     # Cast to SQLiteClient for specialized stores
     sqlite_client = cast(SQLiteClient, db_client)
     
@@ -51,9 +55,9 @@ def main():
     
     q_store = QuestionnaireStore(sqlite_client)
     run_store = RunStore(sqlite_client)
-    runner = QuestionnaireRunner(rag_system, q_store, run_store)
+    runner = QuestionnaireRunner(rag_system, q_store, run_store, max_workers=args.workers)
     
-    run_id = f"eval-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    run_id = args.resume or f"eval-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
     questionnaire_id = args.questionnaire
     
     # Determine ground truth run ID based on questionnaire
@@ -92,12 +96,12 @@ def main():
     
     # 3. Execute Run
     print(f"Executing questionnaire '{questionnaire_id}'...")
-    runner.run_questionnaire(questionnaire_id, run)
+    runner.run_questionnaire(questionnaire_id, run, resume=bool(args.resume))
     
     # 4. Evaluate against Ground Truth
     print(f"Comparing results against ground truth ('{gt_run_id}')...")
     
-    evaluator = RAGEvaluator(run_store=run_store, embedder=generate_embedding)
+    evaluator = RAGEvaluator(run_store=run_store, embedding_client=rag_system.retriever.embedding_client)
     report = evaluator.evaluate_run(run_id, gt_run_id)
     
     # Save evaluation report to database
@@ -25,6 +25,8 @@ from src.domain.stores.questionnaire_store import QuestionnaireStore
 from src.domain.stores.run_store import RunStore
 from src.domain.stores.evaluation_store import EvaluationStore
 from src.experiments.run_experiments import ExperimentRunner
+from src.rag.ingestion.embedder import EmbeddingClient
+from src.rag.llm_cache import LLMResponseCache
 
 
 def create_experiment_configs():
@@ -198,6 +200,16 @@ def main():
         default=1,
         help="Number of trials per configuration (default: 1)"
     )
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        help="Reuse cached LLM responses for low-temperature configs (repeat trials become identical)"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip trials that already have an evaluation report and continue interrupted runs"
+    )
     parser.add_argument(
         "--list",
         action="store_true",
@@ -226,7 +238,9 @@ def main():
         db_client=db_client,
         questionnaire_store=questionnaire_store,
         run_store=run_store,
-        evaluation_store=evaluation_store
+        evaluation_store=evaluation_store,
+        embedding_client=EmbeddingClient(),
+        llm_cache=LLMResponseCache() if args.llm_cache else None
     )
     
     # Run experiments
@@ -234,7 +248,8 @@ def main():
         questionnaire_id=args.questionnaire,
         ground_truth_run_id=ground_truth_run_id,
         configs=configs,
-        trials_per_config=args.trials
+        trials_per_config=args.trials,
+        resume=args.resume
     )
     
     # Display results
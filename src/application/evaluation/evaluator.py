@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Callable
+from typing import Dict, List, Any, Callable, Optional
 from src.domain.stores.run_store import RunStore
 from src.domain.models import AnswerSuccess
-from src.rag.ingestion.embedder import Embedding
+from src.rag.ingestion.embedder import Embedding, EmbeddingClient, generate_embedding
 from src.application.evaluation.metrics import AnswerRelevancyMetric
 
 @dataclass
@@ -23,7 +23,23 @@ class EvaluationReport:
 class RAGEvaluator:
     """Coordinates evaluation of RAG runs against ground truth."""
 
-    def __init__(self, run_store: RunStore, embedder: Callable[[str], Embedding]):
+    def __init__(
+        self,
+        run_store: RunStore,
+        embedder: Optional[Callable[[str], Embedding]] = None,
+        embedding_client: Optional[EmbeddingClient] = None
+    ):
+        """
+        Initialize the evaluator.
+
+        Args:
+            run_store: Store to load run and ground truth answers from
+            embedder: Embedding function used by the relevancy metric
+            embedding_client: EmbeddingClient to embed with when no embedder is given.
+                Falls back to the shared client behind generate_embedding.
+        """
+        if embedder is None:
+            embedder = embedding_client.embed if embedding_client else generate_embedding
         self.run_store = run_store
         self.relevancy_metric = AnswerRelevancyMetric(embedder=embedder)
 
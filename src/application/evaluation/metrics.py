@@ -1,5 +1,5 @@
-import math
 from typing import List, Optional, Callable
+import numpy as np
 from src.rag.ingestion.embedder import Embedding
 
 
@@ -33,16 +33,16 @@ class AnswerRelevancyMetric:
 
 def calculate_cosine_similarity(emb_a: Embedding, emb_b: Embedding) -> float:
     """Calculate cosine similarity between two Embedding objects."""
-    vec_a, vec_b = emb_a.vector, emb_b.vector
+    vec_a = emb_a.array.astype(np.float64)
+    vec_b = emb_b.array.astype(np.float64)
     
-    dot_product = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(a * a for a in vec_a))
-    norm_b = math.sqrt(sum(b * b for b in vec_b))
+    norm_a = np.linalg.norm(vec_a)
+    norm_b = np.linalg.norm(vec_b)
     
     if norm_a == 0 or norm_b == 0:
         return 0.0
         
-    return dot_product / (norm_a * norm_b)
+    return float(np.dot(vec_a, vec_b) / (norm_a * norm_b))
 
 
 def _get_relevant_count_at_k(retrieved_ids: List[str], expected_ids: List[str], k: Optional[int] = None) -> tuple[int, int]:
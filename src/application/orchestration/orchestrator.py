@@ -7,8 +7,11 @@ Future LangGraph integration will add:
 - Human-in-the-loop capabilities
 """
 
-from typing import List
-from src.rag.rag_system import RAGSystem, GeneratedAnswer
+import asyncio
+from typing import Iterator, List, Union
+from src.config import EMBEDDING_MAX_CONCURRENCY, LLM_MAX_CONCURRENCY, SEARCH_MAX_CONCURRENCY
+from src.domain.models import Citation
+from src.rag.rag_system import RAGSystem, GeneratedAnswer, PipelineLimits
 
 
 class Orchestrator:
@@ -18,18 +21,46 @@ class Orchestrator:
     for stateful workflows and conditional routing in Phase 6 Component 2.
     """
 
-    def __init__(self, client=None, llm=None, top_k=5, similarity_threshold=0.0):
+    def __init__(self, client=None, llm=None, top_k=5, similarity_threshold=0.0, embedding_client=None):
         self.rag_system = RAGSystem(
             client=client,
             llm=llm,
             top_k=top_k,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            embedding_client=embedding_client
         )
 
     def answer(self, question: str) -> GeneratedAnswer:
         """Answer a single question using RAG."""
         return self.rag_system.answer(question)
 
+    def answer_stream(self, question: str) -> Iterator[Union[List[Citation], str]]:
+        """Answer a single question, yielding citations first and then answer text as it is generated."""
+        return self.rag_system.answer_stream(question)
+
     def process_questionnaire(self, questions: List[str]) -> List[GeneratedAnswer]:
         """Process multiple questions and return answers in order."""
         return [self.answer(q) for q in questions]
+
+    async def aprocess_questionnaire(
+        self,
+        questions: List[str],
+        embedding_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        llm_concurrency: int = LLM_MAX_CONCURRENCY,
+        search_concurrency: int = SEARCH_MAX_CONCURRENCY
+    ) -> List[GeneratedAnswer]:
+        """
+        Process multiple questions concurrently and return answers in order.
+
+        Every question starts at once; the stage limits decide how many
+        embed, search or generate simultaneously, so question N+1 is retrieved
+        while question N is still generating.
+        """
+        limits = PipelineLimits(embedding_concurrency, llm_concurrency, search_concurrency)
+        try:
+            return list(await asyncio.gather(
+                *(self.rag_system.aanswer(q, limits) for q in questions)
+            ))
+        finally:
+            # The embedding HTTP client is bound to this loop; asyncio.run() closes it next
+            await self.rag_system.aclose()
@@ -1,6 +1,9 @@
 """Questionnaire runner module."""
 
-from src.domain.models import Run, Answer, AnswerSuccess, AnswerFailure, Citation, ChunkKey
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from src.config import LLM_MAX_CONCURRENCY, ANSWER_COMMIT_BATCH_SIZE
+from src.domain.models import Run, Question, Answer, AnswerSuccess, AnswerFailure, Citation, ChunkKey
 from src.domain.stores.questionnaire_store import QuestionnaireStore
 from src.domain.stores.run_store import RunStore
 from src.rag.rag_system import RAGSystem
@@ -14,39 +17,94 @@ class QuestionnaireRunner:
         rag_system: RAGSystem,
         questionnaire_store: QuestionnaireStore,
         run_store: RunStore,
+        max_workers: int = LLM_MAX_CONCURRENCY,
+        commit_batch_size: int = ANSWER_COMMIT_BATCH_SIZE,
     ):
+        """
+        Initialize the runner.
+
+        Args:
+            rag_system: RAGSystem that answers each question
+            questionnaire_store: Store to read questions from
+            run_store: Store to save the run and its answers
+            max_workers: Questions answered in parallel; 1 answers them one by one.
+                Match Ollama's OLLAMA_NUM_PARALLEL to use its parallel slots.
+            commit_batch_size: Answers written per transaction in concurrent mode
+        """
         self.rag_system = rag_system
         self.questionnaire_store = questionnaire_store
         self.run_store = run_store
+        self.max_workers = max_workers
+        self.commit_batch_size = commit_batch_size
+
+    def run_questionnaire(self, questionnaire_id: str, run: Run, resume: bool = False) -> None:
+        """
+        Run all questions in a questionnaire and save results.
 
-    def run_questionnaire(self, questionnaire_id: str, run: Run) -> None:
-        """Run all questions in a questionnaire and save results."""
+        With resume, a run that already exists is reopened instead of
+        rejected, and questions it answered successfully are skipped;
+        failed answers are retried and replaced.
+        """
         questions = self.questionnaire_store.get_questions(questionnaire_id)
         if not questions:
             return
 
-        # Save the run configuration first
-        self.run_store.save_run(run)
+        if resume and self.run_store.get_run(run.id) is not None:
+            answered = self.run_store.get_answered_question_ids(run.id)
+            questions = [q for q in questions if q.id not in answered]
+            print(f"Resuming run {run.id}: {len(answered)} answered, {len(questions)} remaining")
+            if not questions:
+                return
+        else:
+            # Save the run configuration first
+            self.run_store.save_run(run)
+
+        if self.max_workers > 1:
+            self._run_concurrently(questions, run)
+            return
 
         total = len(questions)
         for i, question in enumerate(questions, 1):
             print(f"[{i}/{total}] Processing question: {question.id}...")
-            try:
-                # Generate answer using full Question object for section metadata
-                generated = self.rag_system.answer(question)
-                
-                # Create answer object using factory
-                answer = AnswerSuccess.from_GeneratedAnswer(
-                    run_id=run.id,
-                    question=question,
-                    generated_answer=generated
-                )
-            except Exception as e:
-                # Create failure object using factory
-                answer = AnswerFailure.from_exception(
-                    run_id=run.id,
-                    question=question,
-                    exception=e
-                )
-            
-            self.run_store.save_answer(answer)
+            self.run_store.save_answer(self._answer(question, run))
+
+    def _run_concurrently(self, questions: List[Question], run: Run) -> None:
+        """
+        Answer questions on a worker pool and save them from this thread.
+
+        Workers only call RAGSystem.answer(). This thread is the single
+        writer: it takes results in question order and saves them in batched
+        transactions, so answers are stored in the same order as sequential mode.
+        """
+        total = len(questions)
+        pending: List[Answer] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [pool.submit(self._answer, question, run) for question in questions]
+            for i, (question, future) in enumerate(zip(questions, futures), 1):
+                pending.append(future.result())
+                print(f"[{i}/{total}] Answered question: {question.id}")
+                if len(pending) >= self.commit_batch_size:
+                    self.run_store.save_answers(pending)
+                    pending = []
+        if pending:
+            self.run_store.save_answers(pending)
+
+    def _answer(self, question: Question, run: Run) -> Answer:
+        """Answer one question, turning any error into an AnswerFailure."""
+        try:
+            # Generate answer using full Question object for section metadata
+            generated = self.rag_system.answer(question)
+
+            # Create answer object using factory
+            return AnswerSuccess.from_GeneratedAnswer(
+                run_id=run.id,
+                question=question,
+                generated_answer=generated
+            )
+        except Exception as e:
+            # Create failure object using factory
+            return AnswerFailure.from_exception(
+                run_id=run.id,
+                question=question,
+                exception=e
+            )
@@ -8,6 +8,7 @@ for all components of the system.
 import os
 import logging
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -51,14 +52,51 @@ OLLAMA_CHAT_MODEL: str = os.getenv("OLLAMA_CHAT_MODEL", "llama3.2")
 # Performance tuning showed 0.3 optimal for llama3.2 (vs default 0.8)
 LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.3"))
 
+# Ollama generation options, applied wherever an LLM is built (src/rag/llm.py)
+# keep_alive keeps the model loaded between questions (Ollama default: 5m).
+# num_ctx and num_predict are opt-in: unset, they are not sent and the model's
+# own defaults apply. num_ctx must stay identical across calls or Ollama
+# reloads the model; num_predict caps answer length (-1 = unlimited), which
+# can cut long answers short.
+LLM_KEEP_ALIVE: str = os.getenv("LLM_KEEP_ALIVE", "30m")
+LLM_NUM_CTX: Optional[int] = int(os.environ["LLM_NUM_CTX"]) if os.getenv("LLM_NUM_CTX") else None
+LLM_NUM_PREDICT: Optional[int] = int(os.environ["LLM_NUM_PREDICT"]) if os.getenv("LLM_NUM_PREDICT") else None
+
+# Concurrent LLM calls in the async answer pipeline
+# Ollama serves one generation per model at a time unless OLLAMA_NUM_PARALLEL is raised
+LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "1"))
+
+# Database searches in flight for the async answer pipeline (each one occupies
+# a worker thread; SQLiteClient still runs them one at a time under its lock)
+SEARCH_MAX_CONCURRENCY: int = int(os.getenv("SEARCH_MAX_CONCURRENCY", "2"))
+
+# Answers written per transaction by concurrent QuestionnaireRunner workers
+ANSWER_COMMIT_BATCH_SIZE: int = int(os.getenv("ANSWER_COMMIT_BATCH_SIZE", "10"))
+
 # Embedding dimensions for mxbai-embed-large
 EMBEDDING_DIMENSIONS: int = 1024
 
+# Batched embedding requests (Ollama /api/embed accepts a list of inputs)
+# Batch size caps the number of texts per request; the character budget keeps
+# one long chunk from stalling a batch of short ones.
+EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_MAX_BATCH_CHARS: int = int(os.getenv("EMBEDDING_MAX_BATCH_CHARS", "16000"))
+
+# Embedding HTTP client (keep-alive connection pool with retry and backoff)
+EMBEDDING_POOL_SIZE: int = int(os.getenv("EMBEDDING_POOL_SIZE", "8"))
+EMBEDDING_TIMEOUT: float = float(os.getenv("EMBEDDING_TIMEOUT", "60"))
+EMBEDDING_MAX_RETRIES: int = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+EMBEDDING_RETRY_BACKOFF: float = float(os.getenv("EMBEDDING_RETRY_BACKOFF", "0.5"))
+
+# Maximum embedding requests in flight for the asyncio API
+EMBEDDING_MAX_CONCURRENCY: int = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+
 # ============================================================================
 # Retrieval Configuration (optimized for llama3.2)
 # ============================================================================
 
 # Similarity threshold for filtering retrieved chunks
+# Cosine similarity on every backend (SQLite vec0 uses distance_metric=cosine)
 # Performance tuning showed 0.3 optimal for llama3.2 (filters low-quality matches)
 # Higher values = more strict filtering (may miss relevant context)
 # Lower values = more permissive (may include irrelevant chunks)
@@ -69,6 +107,37 @@ SIMILARITY_THRESHOLD: float = float(os.getenv("SIMILARITY_THRESHOLD", "0.3"))
 # More chunks = more context but potential noise
 RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", "5"))
 
+# Retrieval mode: "vector" (embedding search only) or "hybrid" (FTS5 BM25 and
+# vector search merged by reciprocal-rank fusion; SQLite backend only)
+RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "vector")
+
+# Reciprocal-rank fusion constant: score = sum(1 / (RRF_K + rank))
+# 60 is the value from the original RRF paper; larger values flatten rank differences
+RRF_K: int = int(os.getenv("RRF_K", "60"))
+
+# Maximal marginal relevance reranking of retrieved chunks
+# MMR_LAMBDA = 1.0 disables it (pure relevance); lower values trade relevance
+# for diversity among near-duplicate neighbouring chunks
+# MMR_FETCH_K candidates are over-fetched and reduced to top_k
+MMR_LAMBDA: float = float(os.getenv("MMR_LAMBDA", "1.0"))
+MMR_FETCH_K: int = int(os.getenv("MMR_FETCH_K", "20"))
+
+# Query embeddings kept in each Retriever's in-process LRU (0 disables it)
+# Experiments re-ask the same questionnaire for every config and trial
+QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+
+# Queries whose vector search results each Retriever caches (0 disables it)
+# Entries are dropped when the corpus generation changes; one entry fetched
+# with a larger top_k / lower threshold serves narrower requests
+RETRIEVAL_CACHE_SIZE: int = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+
+# Token budget for retrieved context in the prompt (0 = no limit, the default)
+# Opt-in because it changes prompts: chunks are packed in rank order and the
+# last one is cut at a sentence (or else word) boundary. E.g. 1500 leaves room
+# for instructions, question and answer with LLM_NUM_CTX=2048; prompt length
+# dominates CPU-only latency
+CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "0"))
+
 # ============================================================================
 # Document Ingestion Configuration
 # ============================================================================
@@ -91,6 +160,25 @@ DB_PROVIDER: str = os.getenv("DB_PROVIDER", "sqlite")
 # SQLite configuration
 SQLITE_DB_PATH: Path = Path(os.getenv("SQLITE_DB_PATH", str(PROJECT_ROOT / "data" / "complaila.db")))
 
+# Persistent embedding cache (separate SQLite file next to the main database)
+# Keyed by (model, dimensions, sha256 of text); least recently used entries
+# are evicted once the cache grows beyond EMBEDDING_CACHE_MAX_ENTRIES.
+EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_PATH: Path = Path(os.getenv("EMBEDDING_CACHE_PATH", str(SQLITE_DB_PATH.parent / "embedding_cache.db")))
+EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+
+# Persistent LLM response cache (opt-in per run, e.g. tuning.py --llm-cache)
+# Keyed by (model, temperature, generation options, sha256 of prompt). Calls
+# above LLM_CACHE_MAX_TEMPERATURE always go to the model, since their answers
+# are meant to vary between runs.
+LLM_CACHE_PATH: Path = Path(os.getenv("LLM_CACHE_PATH", str(SQLITE_DB_PATH.parent / "llm_cache.db")))
+LLM_CACHE_MAX_TEMPERATURE: float = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+
+# Vector index for SQLite: "sqlite" (vec0 KNN per query) or "memory"
+# (all active embeddings loaded into an in-process NumPy matrix)
+VECTOR_INDEX: str = os.getenv("VECTOR_INDEX", "sqlite")
+
 # Table name for storing document chunks
 CHUNKS_TABLE: str = "document_chunks"
 
@@ -94,6 +94,24 @@ class RetrievedChunk:
     rank: int
 
 
+@dataclass
+class StageTimings:
+    """Wall-clock milliseconds per answer stage, plus LLM token counts when reported."""
+
+    embedding_ms: Optional[float] = None
+    search_ms: Optional[float] = None
+    prompt_ms: Optional[float] = None
+    generation_ms: Optional[float] = None
+    prompt_tokens: Optional[int] = None  # Ollama prompt_eval_count
+    completion_tokens: Optional[int] = None  # Ollama eval_count
+
+    @property
+    def total_ms(self) -> float:
+        """Sum of the recorded stage times."""
+        stages = (self.embedding_ms, self.search_ms, self.prompt_ms, self.generation_ms)
+        return sum(ms for ms in stages if ms is not None)
+
+
 @dataclass
 class Answer:
     """Base class for an answer outcome."""
@@ -115,6 +133,8 @@ class AnswerSuccess(Answer):
     citations: List[Citation] = field(default_factory=list)
     query_embedding: Optional[List[float]] = None
     generation_time_ms: Optional[int] = None
+    context_tokens: Optional[int] = None
+    timings: Optional[StageTimings] = None
 
     def save_on(self, store: Any) -> None:
         """Double dispatch to store.save_answer_success."""
@@ -123,13 +143,18 @@ class AnswerSuccess(Answer):
     @staticmethod
     def from_GeneratedAnswer(run_id: str, question: Question, generated_answer: Any) -> "AnswerSuccess":
         """Factory method to create AnswerSuccess from a GeneratedAnswer."""
+        timings = generated_answer.timings
+        generation_ms = timings.generation_ms if timings is not None else None
         return AnswerSuccess(
             id=f"ans-{run_id}-{question.question_id}",
             run_id=run_id,
             question_id=question.id,
             answer_text=generated_answer.answer,
             retrieved_chunks=[],  # TODO: map retrieved chunks when available in GeneratedAnswer
-            citations=[Citation.from_generated(c) for c in generated_answer.citations]
+            citations=[Citation.from_generated(c) for c in generated_answer.citations],
+            context_tokens=generated_answer.context_tokens,
+            generation_time_ms=round(generation_ms) if generation_ms is not None else None,
+            timings=timings
         )
 
 
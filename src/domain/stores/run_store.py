@@ -1,9 +1,9 @@
 """Storage for runs and answers."""
 
 import json
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
-from src.domain.models import Run, RunConfig, Answer, AnswerSuccess, AnswerFailure, RetrievedChunk, Citation, ChunkKey
+from src.domain.models import Run, RunConfig, Answer, AnswerSuccess, AnswerFailure, RetrievedChunk, Citation, ChunkKey, StageTimings
 from src.infrastructure.database.sqlite_client import SQLiteClient
 
 
@@ -13,6 +13,8 @@ class RunStore:
     def __init__(self, db_client: SQLiteClient):
         self.db_client = db_client
         self.conn = db_client.conn
+        # Set while save_answers() groups several answers into one transaction
+        self._in_batch = False
 
     def save_config(self, config: RunConfig) -> None:
         """Save a run configuration."""
@@ -103,9 +105,50 @@ class RunStore:
             return None
         return self._row_to_run(row)
 
+    def find_latest_run_for_config(self, config_id: str) -> Optional[Run]:
+        """Retrieve the most recently created run of a configuration, if any."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT 
+                r.id as run_id, r.name as run_name, r.status as run_status,
+                rc.id as config_id, rc.name as config_name, rc.llm_model, 
+                rc.llm_temperature, rc.retrieval_top_k, rc.similarity_threshold,
+                rc.chunk_size, rc.chunk_overlap, rc.embedding_model, 
+                rc.embedding_dimensions, rc.description
+            FROM runs r
+            JOIN run_configurations rc ON r.run_configuration_id = rc.id
+            WHERE rc.id = ?
+            ORDER BY r.created_at DESC, r.rowid DESC
+            LIMIT 1
+        """, (config_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return self._row_to_run(row)
+
     def save_answer(self, answer: Answer) -> None:
         """Save an answer using double dispatch."""
-        answer.save_on(self)
+        with self.db_client.lock:
+            answer.save_on(self)
+
+    def save_answers(self, answers: List[Answer]) -> None:
+        """Save several answers in a single transaction, in list order."""
+        with self.db_client.lock:
+            self._in_batch = True
+            try:
+                for answer in answers:
+                    answer.save_on(self)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                self._in_batch = False
+
+    def _commit(self) -> None:
+        """Commit unless save_answers() is collecting a batch."""
+        if not self._in_batch:
+            self.conn.commit()
 
     def save_answer_success(self, answer: AnswerSuccess) -> None:
         """Save a successful answer."""
@@ -115,7 +158,8 @@ class RunStore:
         
         meta_json = json.dumps({
             "query_embedding": answer.query_embedding,
-            "generation_time_ms": answer.generation_time_ms
+            "generation_time_ms": answer.generation_time_ms,
+            "context_tokens": answer.context_tokens
         })
 
         cursor.execute("""
@@ -135,8 +179,9 @@ class RunStore:
 
         self._save_citations(cursor, answer.id, answer.citations)
         self._save_retrieved_chunks(cursor, answer.id, answer.retrieved_chunks)
+        self._save_timings(cursor, answer)
 
-        self.conn.commit()
+        self._commit()
 
     def save_answer_failure(self, answer: AnswerFailure) -> None:
         """Save a failed answer."""
@@ -156,7 +201,7 @@ class RunStore:
             answer.error_message,
             None
         ))
-        self.conn.commit()
+        self._commit()
 
     def get_answer(self, id: str) -> Optional[Answer]:
         """Retrieve an answer by ID."""
@@ -173,6 +218,15 @@ class RunStore:
         cursor.execute("SELECT * FROM answers WHERE run_id = ?", (run_id,))
         return [self._row_to_answer(row) for row in cursor.fetchall()]
 
+    def get_answered_question_ids(self, run_id: str) -> Set[str]:
+        """Return IDs of the questions a run already answered successfully."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT question_id FROM answers
+            WHERE run_id = ? AND is_success = 1
+        """, (run_id,))
+        return {row['question_id'] for row in cursor.fetchall()}
+
     def get_answer_by_run_and_question(self, run_id: str, question_id: str) -> Optional[Answer]:
         """Retrieve a specific answer by run ID and question ID."""
         cursor = self.conn.cursor()
@@ -185,6 +239,16 @@ class RunStore:
             return None
         return self._row_to_answer(row)
 
+    def get_timings_for_run(self, run_id: str) -> Dict[str, StageTimings]:
+        """Retrieve stage timings of a run's answers, keyed by question ID."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT a.question_id, t.* FROM answer_timings t
+            JOIN answers a ON a.id = t.answer_id
+            WHERE t.run_id = ?
+        """, (run_id,))
+        return {row['question_id']: self._row_to_timings(row) for row in cursor.fetchall()}
+
     def list_runs_by_status(self, status: str) -> list[Run]:
         """List runs filtered by status."""
         cursor = self.conn.cursor()
@@ -241,7 +305,9 @@ class RunStore:
                 retrieved_chunks=retrieved_chunks,
                 citations=citations,
                 query_embedding=meta.get('query_embedding'),
-                generation_time_ms=meta.get('generation_time_ms')
+                generation_time_ms=meta.get('generation_time_ms'),
+                context_tokens=meta.get('context_tokens'),
+                timings=self._load_timings(row['id'])
             )
         else:
             return AnswerFailure(
@@ -297,4 +363,39 @@ class RunStore:
                 similarity_score=c['similarity_score'],
                 rank=c['rank']
             ) for c in cursor.fetchall()
-        ]
\ No newline at end of file
+        ]
+
+    def _save_timings(self, cursor, answer: AnswerSuccess) -> None:
+        """Save stage timings to the answer_timings table."""
+        cursor.execute("DELETE FROM answer_timings WHERE answer_id = ?", (answer.id,))
+        t = answer.timings
+        if t is None:
+            return
+        cursor.execute("""
+            INSERT INTO answer_timings
+            (answer_id, run_id, embedding_ms, search_ms, prompt_ms, generation_ms,
+             prompt_tokens, completion_tokens)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            answer.id, answer.run_id, t.embedding_ms, t.search_ms, t.prompt_ms,
+            t.generation_ms, t.prompt_tokens, t.completion_tokens
+        ))
+
+    def _load_timings(self, answer_id: str) -> Optional[StageTimings]:
+        """Load stage timings for a specific answer."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT * FROM answer_timings WHERE answer_id = ?", (answer_id,))
+        row = cursor.fetchone()
+        return self._row_to_timings(row) if row else None
+
+    @staticmethod
+    def _row_to_timings(row) -> StageTimings:
+        """Convert an answer_timings row to StageTimings."""
+        return StageTimings(
+            embedding_ms=row['embedding_ms'],
+            search_ms=row['search_ms'],
+            prompt_ms=row['prompt_ms'],
+            generation_ms=row['generation_ms'],
+            prompt_tokens=row['prompt_tokens'],
+            completion_tokens=row['completion_tokens']
+        )
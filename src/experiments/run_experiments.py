@@ -2,12 +2,14 @@
 
 from typing import Optional
 from datetime import datetime
-from langchain_ollama import OllamaLLM
-from src.config import OLLAMA_BASE_URL
 from src.domain.models import Run, RunConfig, AnswerSuccess, AnswerFailure
 from src.application.evaluation.evaluator import RAGEvaluator
-from src.rag.ingestion.embedder import generate_embedding
+from src.rag.ingestion.embedder import EmbeddingClient
+from src.experiments.scheduler import affinity_key, count_model_loads, declaration_order, schedule_trials
+from src.rag.llm import create_llm, warm_up_llm
+from src.rag.llm_cache import LLMResponseCache
 from src.rag.rag_system import RAGSystem
+from src.rag.retriever import Retriever
 
 # Retry configuration
 MAX_RETRIES = 3
@@ -27,7 +29,9 @@ class ExperimentRunner:
         questionnaire_store, 
         run_store, 
         evaluation_store,
-        rag_system: Optional[RAGSystem] = None
+        rag_system: Optional[RAGSystem] = None,
+        embedding_client: Optional[EmbeddingClient] = None,
+        llm_cache: Optional[LLMResponseCache] = None
     ):
         """Initialize ExperimentRunner.
         
@@ -38,48 +42,69 @@ class ExperimentRunner:
             evaluation_store: Store for saving evaluation reports
             rag_system: Optional pre-configured RAGSystem for testing.
                        If None, will create RAGSystem from config for each experiment.
+            embedding_client: Optional EmbeddingClient shared by retrieval and evaluation.
+            llm_cache: Optional LLM response cache. Trials of a config at or below
+                       LLM_CACHE_MAX_TEMPERATURE then reuse the first trial's answers.
         """
         self.db_client = db_client
         self.questionnaire_store = questionnaire_store
         self.run_store = run_store
         self.evaluation_store = evaluation_store
         self._test_rag_system = rag_system  # Only used for testing
+        self.embedding_client = embedding_client
+        self.llm_cache = llm_cache
+        # Shared by every config and trial so repeated questions reuse query embeddings
+        self._retriever: Optional[Retriever] = None
+
+    @property
+    def retriever(self) -> Retriever:
+        """Retriever shared by all RAGSystems this runner creates."""
+        if self._retriever is None:
+            self._retriever = Retriever(client=self.db_client, embedding_client=self.embedding_client)
+        return self._retriever
     
     def _create_rag_system(self, config: RunConfig) -> RAGSystem:
         """Create RAGSystem from config, or return test instance if provided."""
         if self._test_rag_system:
             return self._test_rag_system
         
-        llm = OllamaLLM(
-            base_url=OLLAMA_BASE_URL,
-            model=config.llm_model,
-            temperature=config.llm_temperature
-        )
+        llm = create_llm(model=config.llm_model, temperature=config.llm_temperature, cache=self.llm_cache)
         
         return RAGSystem(
             client=self.db_client,
             llm=llm,
             top_k=config.retrieval_top_k,
-            similarity_threshold=config.similarity_threshold
+            similarity_threshold=config.similarity_threshold,
+            retriever=self.retriever
         )
     
-    def run_experiment(self, questionnaire_id, ground_truth_run_id, config):
+    def run_experiment(self, questionnaire_id, ground_truth_run_id, config, resume=False):
         """Run single experiment with specific configuration.
         
         Creates a RAGSystem configured with parameters from RunConfig.
+        With resume, the latest run of the config is reopened and questions
+        it already answered successfully are skipped.
         """
         # Create RAGSystem from config (or use test instance)
         rag_system = self._create_rag_system(config)
         
-        # Generate unique run ID with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        run = Run(id=f"run-{config.id}-{timestamp}", config=config)
-        self.run_store.save_run(run)
+        run = self.run_store.find_latest_run_for_config(config.id) if resume else None
+        answered = set()
+        if run is not None:
+            answered = self.run_store.get_answered_question_ids(run.id)
+            print(f"{_timestamp()}   Resuming {run.id} ({len(answered)} questions already answered)")
+        else:
+            # Generate unique run ID with timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            run = Run(id=f"run-{config.id}-{timestamp}", config=config)
+            self.run_store.save_run(run)
         
         questions = self.questionnaire_store.get_questions(questionnaire_id)
         total_questions = len(questions)
         
         for idx, question in enumerate(questions, 1):
+            if question.id in answered:
+                continue
             print(f"{_timestamp()}   Question {idx}/{total_questions}", end="", flush=True)
             
             # Retry up to MAX_RETRIES times on failure
@@ -101,7 +126,7 @@ class ExperimentRunner:
                         answer = AnswerFailure.from_exception(run.id, question, e)
                         answer.save_on(self.run_store)
         
-        evaluator = RAGEvaluator(run_store=self.run_store, embedder=generate_embedding)
+        evaluator = RAGEvaluator(run_store=self.run_store, embedding_client=self.embedding_client)
         report = evaluator.evaluate_run(run.id, ground_truth_run_id)
         
         self.evaluation_store.save_report(report)
@@ -113,52 +138,151 @@ class ExperimentRunner:
             "success": True
         }
     
-    def run_experiments(self, questionnaire_id, ground_truth_run_id, configs, trials_per_config):
+    def run_experiments(self, questionnaire_id, ground_truth_run_id, configs, trials_per_config, resume=False):
         """Run multiple experiments with multiple trials per config.
         
+        Trials run grouped by model (see scheduler.schedule_trials) and each
+        model is loaded into Ollama once before its group; the returned
+        dictionary keeps declaration order regardless.
+        
         Args:
             questionnaire_id: ID of questionnaire to run
             ground_truth_run_id: ID of ground truth run for evaluation
             configs: List of RunConfig objects
             trials_per_config: Number of trials to run for each config
+            resume: Skip trials whose latest run already has an evaluation
+                report and continue unfinished runs instead of restarting them
             
         Returns:
             Dictionary keyed by config ID, each containing list of trial results
         """
-        results = {}
+        # Filled by schedule position; keys and trial lists stay in declaration order
+        results = {config.id: {"trials": [None] * trials_per_config} for config in configs}
         total_experiments = len(configs) * trials_per_config
-        current_experiment = 0
-        
-        for config in configs:
-            trials = []
-            for trial_num in range(trials_per_config):
-                current_experiment += 1
-                print(f"\n{_timestamp()} [{current_experiment}/{total_experiments}] Running: {config.name} - Trial {trial_num + 1}")
-                
-                # Create unique config ID for each trial
-                trial_config = RunConfig(
-                    id=f"{config.id}-trial{trial_num + 1}",
-                    name=f"{config.name} - Trial {trial_num + 1}",
-                    llm_model=config.llm_model,
-                    llm_temperature=config.llm_temperature,
-                    retrieval_top_k=config.retrieval_top_k,
-                    similarity_threshold=config.similarity_threshold,
-                    chunk_size=config.chunk_size,
-                    chunk_overlap=config.chunk_overlap,
-                    embedding_model=config.embedding_model,
-                    embedding_dimensions=config.embedding_dimensions,
-                    description=config.description
-                )
-                
-                trial_result = self.run_experiment(
-                    questionnaire_id=questionnaire_id,
-                    ground_truth_run_id=ground_truth_run_id,
-                    config=trial_config
-                )
-                trials.append(trial_result)
-                
-                print(f"{_timestamp()}   ✓ {config.name} - Trial {trial_num + 1} Completed - Mean Relevancy: {trial_result['mean_answer_relevancy']:.4f}")
+        schedule = schedule_trials(configs, trials_per_config)
+        loaded_key = None
+        load_seconds = []
+        
+        questions = self.questionnaire_store.get_questions(questionnaire_id)
+        self.prefetch_retrieval(questions, configs)
+        
+        for current_experiment, scheduled in enumerate(schedule, 1):
+            config, trial_num = scheduled.config, scheduled.trial_index
+            print(f"\n{_timestamp()} [{current_experiment}/{total_experiments}] Running: {config.name} - Trial {trial_num + 1}")
+            
+            # Create unique config ID for each trial
+            trial_config = RunConfig(
+                id=f"{config.id}-trial{trial_num + 1}",
+                name=f"{config.name} - Trial {trial_num + 1}",
+                llm_model=config.llm_model,
+                llm_temperature=config.llm_temperature,
+                retrieval_top_k=config.retrieval_top_k,
+                similarity_threshold=config.similarity_threshold,
+                chunk_size=config.chunk_size,
+                chunk_overlap=config.chunk_overlap,
+                embedding_model=config.embedding_model,
+                embedding_dimensions=config.embedding_dimensions,
+                description=config.description
+            )
             
-            results[config.id] = {"trials": trials}
+            completed = self._completed_trial(trial_config) if resume else None
+            if completed is not None:
+                print(f"{_timestamp()}   ↷ Already evaluated in {completed['run_id']} - skipping")
+                results[config.id]["trials"][trial_num] = completed
+                continue
+            
+            # Load the model once per group, right before its first trial that runs
+            key = affinity_key(config)
+            if key != loaded_key:
+                seconds = self._warm_up(key)
+                if seconds is not None:
+                    load_seconds.append(seconds)
+                loaded_key = key
+            
+            trial_result = self.run_experiment(
+                questionnaire_id=questionnaire_id,
+                ground_truth_run_id=ground_truth_run_id,
+                config=trial_config,
+                resume=resume
+            )
+            results[config.id]["trials"][trial_num] = trial_result
+            
+            print(f"{_timestamp()}   ✓ {config.name} - Trial {trial_num + 1} Completed - Mean Relevancy: {trial_result['mean_answer_relevancy']:.4f}")
+        
+        avoided_loads = count_model_loads(declaration_order(configs, trials_per_config)) - count_model_loads(schedule)
+        if avoided_loads > 0 and load_seconds:
+            mean_load = sum(load_seconds) / len(load_seconds)
+            print(f"\n{_timestamp()} Model-affinity scheduling avoided {avoided_loads} model loads "
+                  f"(~{avoided_loads * mean_load:.0f}s at {mean_load:.1f}s per load)")
+        
+        if self._retriever is not None:
+            stats = self._retriever.cache_stats()
+            print(f"\n{_timestamp()} Query embedding cache: {stats['hits']} hits, "
+                  f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+            stats = self._retriever.result_cache.stats()
+            print(f"{_timestamp()} Retrieval cache: {stats['hits']} hits, "
+                  f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+        if self.llm_cache is not None:
+            stats = self.llm_cache.stats()
+            print(f"{_timestamp()} LLM response cache: {stats['hits']} hits, "
+                  f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
         
         return results
+    
+    def prefetch_retrieval(self, questions, configs) -> None:
+        """
+        Retrieve context for every question once for the whole sweep.
+
+        Retrieval depends only on the question, top_k, threshold and corpus,
+        so each question is searched once at the largest top_k and lowest
+        threshold of any config. The retriever's result cache then serves
+        every config and trial by filtering and slicing that superset; only
+        generation repeats.
+        """
+        retriever = self._test_rag_system.retriever if self._test_rag_system else self.retriever
+        if not questions or not configs or not retriever.caches_results:
+            return
+        top_k = max(config.retrieval_top_k for config in configs)
+        threshold = min(config.similarity_threshold for config in configs)
+        if len(questions) > retriever.result_cache.max_entries:
+            print(f"{_timestamp()} Skipping retrieval prefetch: {len(questions)} questions "
+                  f"exceed the retrieval cache ({retriever.result_cache.max_entries})")
+            return
+        
+        print(f"{_timestamp()} Prefetching retrieval for {len(questions)} questions "
+              f"(top_k={top_k}, threshold={threshold})")
+        retriever.search_many(
+            [RAGSystem.build_query(question) for question in questions],
+            top_k=top_k,
+            threshold=threshold
+        )
+    
+    def _warm_up(self, key) -> Optional[float]:
+        """Load the (model, num_ctx) of key into Ollama; returns load seconds, None if skipped or failed."""
+        if self._test_rag_system:
+            return None
+        model, num_ctx = key
+        try:
+            seconds = warm_up_llm(model, num_ctx=num_ctx)
+        except Exception as e:
+            # The trials themselves retry and record failures; warming is only an optimization
+            print(f"{_timestamp()}   Could not preload {model}: {e}")
+            return None
+        context = f" (num_ctx={num_ctx})" if num_ctx is not None else ""
+        print(f"{_timestamp()}   Loaded {model}{context} in {seconds:.1f}s")
+        return seconds
+    
+    def _completed_trial(self, config: RunConfig) -> Optional[dict]:
+        """Result of the config's latest run if it has an evaluation report, else None."""
+        run = self.run_store.find_latest_run_for_config(config.id)
+        if run is None:
+            return None
+        report = self.evaluation_store.get_report(run.id)
+        if report is None:
+            return None
+        return {
+            "run_id": run.id,
+            "questions_answered": len(report.results),
+            "mean_answer_relevancy": report.overall_metrics.get("mean_answer_relevancy", 0.0),
+            "success": True
+        }
@@ -0,0 +1,64 @@
+"""
+Model-affinity scheduling of experiment trials.
+
+Ollama keeps a limited number of models in memory and reloads a model when
+its num_ctx changes, so running configs in declaration order can swap models
+on every trial. Trials are grouped by (model, num_ctx) instead, groups in order
+of first appearance and trials within a group in declaration order, so each
+model is loaded once per sweep.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from src.config import LLM_NUM_CTX
+from src.domain.models import RunConfig
+
+# (llm_model, num_ctx): trials sharing a key run on the same loaded model;
+# num_ctx is None when it is left to the model's default
+AffinityKey = Tuple[str, Optional[int]]
+
+
+@dataclass
+class ScheduledTrial:
+    """One trial of a config, with its position in declaration order."""
+    config: RunConfig
+    trial_index: int  # 0-based trial number within the config
+
+
+def affinity_key(config: RunConfig) -> AffinityKey:
+    """Key of the loaded model a config needs; num_ctx comes from create_llm's default."""
+    return (config.llm_model, LLM_NUM_CTX)
+
+
+def declaration_order(configs: List[RunConfig], trials_per_config: int) -> List[ScheduledTrial]:
+    """Trials in the order configs were declared, all trials of a config together."""
+    return [
+        ScheduledTrial(config=config, trial_index=trial)
+        for config in configs
+        for trial in range(trials_per_config)
+    ]
+
+
+def schedule_trials(configs: List[RunConfig], trials_per_config: int) -> List[ScheduledTrial]:
+    """
+    Order trials so trials needing the same model run back to back.
+
+    Returns:
+        All trials, grouped by affinity_key() in order of first appearance
+    """
+    groups: Dict[AffinityKey, List[ScheduledTrial]] = {}
+    for trial in declaration_order(configs, trials_per_config):
+        groups.setdefault(affinity_key(trial.config), []).append(trial)
+    return [trial for group in groups.values() for trial in group]
+
+
+def count_model_loads(trials: List[ScheduledTrial]) -> int:
+    """Number of model loads when trials run in the given order (one per key change)."""
+    loads = 0
+    previous = None
+    for trial in trials:
+        key = affinity_key(trial.config)
+        if key != previous:
+            loads += 1
+            previous = key
+    return loads
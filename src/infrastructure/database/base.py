@@ -11,14 +11,41 @@ from src.domain.models import ChunkKey
 
 @dataclass
 class ChunkRecord:
-    """Represents a chunk ready for database insertion."""
+    """
+    Represents a chunk ready for database insertion.
+
+    embedding is None on records read back without their vector
+    (include_embeddings=False).
+    """
     key: ChunkKey
     status: str
     content: str
-    embedding: Embedding
+    embedding: Optional[Embedding]
     metadata: Optional[Dict[str, Any]] = None
 
 
+@dataclass(frozen=True)
+class ChunkFilter:
+    """
+    Structured restriction applied inside a search. Unset fields match every chunk.
+
+    header2 and header3 match the "Header2"/"Header3" chunk metadata written
+    by the markdown chunker (the enclosing ## and ### section titles).
+    """
+    document_id: Optional[str] = None
+    header2: Optional[str] = None
+    header3: Optional[str] = None
+
+    def metadata_match(self) -> Dict[str, str]:
+        """Return the set header constraints keyed by their chunk metadata name."""
+        match = {}
+        if self.header2 is not None:
+            match["Header2"] = self.header2
+        if self.header3 is not None:
+            match["Header3"] = self.header3
+        return match
+
+
 @dataclass
 class SearchResult:
     """A chunk with its similarity score from vector search."""
@@ -29,6 +56,13 @@ class SearchResult:
 class VectorDatabaseClient(ABC):
     """Abstract base class for vector database operations."""
 
+    # Corpus version, bumped by every chunk write. None means the backend
+    # cannot report changes, so result caches are bypassed.
+    generation: Optional[int] = None
+
+    # Whether search_by_text() is implemented; hybrid retrieval requires it
+    supports_text_search: bool = False
+
     @abstractmethod
     def is_connected(self) -> bool:
         """Check if the client is connected to the database."""
@@ -50,12 +84,22 @@ class VectorDatabaseClient(ABC):
         pass
 
     @abstractmethod
-    def get_chunk_revisions(self, document_id: str, chunk_id: str) -> Dict[int, ChunkRecord]:
+    def get_chunk_revisions(
+        self,
+        document_id: str,
+        chunk_id: str,
+        include_embeddings: bool = True
+    ) -> Dict[int, ChunkRecord]:
         """Get all revisions for a specific chunk."""
         pass
 
     @abstractmethod
-    def query_chunks_by_status(self, document_id: str, status: str) -> List[ChunkRecord]:
+    def query_chunks_by_status(
+        self,
+        document_id: str,
+        status: str,
+        include_embeddings: bool = True
+    ) -> List[ChunkRecord]:
         """Query chunks filtered by document_id and status."""
         pass
 
@@ -65,7 +109,52 @@ class VectorDatabaseClient(ABC):
         query_embedding: Embedding,
         top_k: int = 5,
         threshold: float = 0.0,
-        status: str = "active"
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
     ) -> List[SearchResult]:
-        """Search for similar chunks by embedding."""
+        """Search for similar chunks by embedding, restricted to chunks matching filters."""
         pass
+
+    def search_by_embeddings(
+        self,
+        query_embeddings: List[Embedding],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query embeddings at once.
+
+        Returns one result list per query, in query order. The default runs
+        search_by_embedding per query; backends override it with a batched path.
+        """
+        return [
+            self.search_by_embedding(
+                query_embedding,
+                top_k=top_k,
+                threshold=threshold,
+                status=status,
+                include_embeddings=include_embeddings,
+                filters=filters
+            )
+            for query_embedding in query_embeddings
+        ]
+
+    def search_by_text(
+        self,
+        query: str,
+        top_k: int = 5,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Search for chunks by lexical (full-text) match.
+
+        SearchResult.similarity is a backend-specific relevance score, higher
+        is better; it is not comparable with cosine similarity.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support full-text search")
@@ -2,7 +2,7 @@
 Factory for creating database clients.
 """
 
-from src.config import DB_PROVIDER
+from src.config import DB_PROVIDER, VECTOR_INDEX
 from src.infrastructure.database.base import VectorDatabaseClient
 
 
@@ -21,6 +21,9 @@ def get_db_client() -> VectorDatabaseClient:
         return SupabaseClient()
     elif DB_PROVIDER == "sqlite":
         from src.infrastructure.database.sqlite_client import SQLiteClient
+        if VECTOR_INDEX == "memory":
+            from src.infrastructure.database.memory_index import InMemoryVectorIndex
+            return InMemoryVectorIndex(SQLiteClient())
         return SQLiteClient()
     else:
         raise ValueError(f"Unknown DB_PROVIDER: {DB_PROVIDER}")
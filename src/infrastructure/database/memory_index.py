@@ -0,0 +1,255 @@
+"""
+In-memory vector index layered over SQLiteClient.
+
+Loads all chunk embeddings of a status once into a contiguous, L2-normalized
+float32 matrix and answers searches with a single mat-vec product plus
+argpartition top-k. Writes go straight to SQLite; the client's generation
+counter tells the index when to reload.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.config import EMBEDDING_DIMENSIONS
+from src.infrastructure.database.base import VectorDatabaseClient, ChunkFilter, ChunkKey, ChunkRecord, SearchResult
+from src.infrastructure.database.sqlite_client import SQLiteClient
+from src.rag.ingestion.embedder import Embedding
+
+
+@dataclass
+class _Snapshot:
+    """Chunks of one status stored as parallel arrays, row i of each belonging together."""
+    generation: int
+    matrix: np.ndarray          # (n, dims) float32, rows normalized to unit length
+    document_ids: List[str]
+    chunk_ids: List[str]
+    revisions: np.ndarray       # (n,) int64
+    contents: List[str]
+    metadata: List[Optional[str]]  # raw JSON, parsed only for returned results
+    status: str
+    labels: Dict[str, np.ndarray]  # (n,) object arrays for ChunkFilter fields
+
+    def __len__(self) -> int:
+        return len(self.document_ids)
+
+    def candidates(self, filters: Optional[ChunkFilter]) -> Optional[np.ndarray]:
+        """Row indices matching filters, or None when every row matches."""
+        if filters is None:
+            return None
+        mask = None
+        for field, value in (
+            ("document_id", filters.document_id),
+            ("header2", filters.header2),
+            ("header3", filters.header3),
+        ):
+            if value is None:
+                continue
+            matches = self.labels[field] == value
+            mask = matches if mask is None else mask & matches
+        return None if mask is None else np.flatnonzero(mask)
+
+    def record(self, i: int, include_embedding: bool = False) -> ChunkRecord:
+        """Materialize row i as a ChunkRecord (embedding, if included, is the normalized vector)."""
+        return ChunkRecord(
+            key=ChunkKey(
+                document_id=self.document_ids[i],
+                chunk_id=self.chunk_ids[i],
+                revision=int(self.revisions[i])
+            ),
+            status=self.status,
+            content=self.contents[i],
+            embedding=Embedding(vector=self.matrix[i]) if include_embedding else None,
+            metadata=json.loads(self.metadata[i]) if self.metadata[i] else None
+        )
+
+
+class InMemoryVectorIndex(VectorDatabaseClient):
+    """VectorDatabaseClient that serves searches from memory and delegates everything else to SQLite."""
+
+    supports_text_search = True  # delegated to SQLite's FTS5 index
+
+    def __init__(self, client: Optional[SQLiteClient] = None):
+        """
+        Initialize the index.
+
+        Args:
+            client: SQLiteClient holding the chunks. Creates one from config if not provided.
+        """
+        self.client = client or SQLiteClient()
+        self._snapshots: Dict[str, _Snapshot] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose the wrapped client's attributes (e.g. conn for the domain stores)."""
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    @property
+    def generation(self) -> int:
+        """Corpus generation of the wrapped client."""
+        return self.client.generation
+
+    def is_connected(self) -> bool:
+        """Check if the underlying SQLite connection is open."""
+        return self.client.is_connected()
+
+    def insert_chunk(self, chunk_record: ChunkRecord) -> Dict[str, Any]:
+        """Insert a single chunk."""
+        return self.client.insert_chunk(chunk_record)
+
+    def batch_insert_chunks(self, chunk_records: List[ChunkRecord]) -> List[Dict[str, Any]]:
+        """Batch insert multiple chunks."""
+        return self.client.batch_insert_chunks(chunk_records)
+
+    def delete_chunk(self, key: ChunkKey) -> None:
+        """Delete a specific chunk."""
+        self.client.delete_chunk(key)
+
+    def get_chunk_revisions(
+        self,
+        document_id: str,
+        chunk_id: str,
+        include_embeddings: bool = True
+    ) -> Dict[int, ChunkRecord]:
+        """Get all revisions for a specific chunk."""
+        return self.client.get_chunk_revisions(document_id, chunk_id, include_embeddings)
+
+    def query_chunks_by_status(
+        self,
+        document_id: str,
+        status: str,
+        include_embeddings: bool = True
+    ) -> List[ChunkRecord]:
+        """Query chunks filtered by document_id and status."""
+        return self.client.query_chunks_by_status(document_id, status, include_embeddings)
+
+    def search_by_text(
+        self,
+        query: str,
+        top_k: int = 5,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[SearchResult]:
+        """Full-text search is served by SQLite's FTS5 index."""
+        return self.client.search_by_text(
+            query, top_k, status, include_embeddings=include_embeddings, filters=filters
+        )
+
+    def search_by_embedding(
+        self,
+        query_embedding: Embedding,
+        top_k: int = 5,
+        threshold: float = 0.0,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Search for similar chunks by cosine similarity against the in-memory matrix.
+
+        Returns:
+            List of SearchResult objects, sorted by similarity descending
+        """
+        return self.search_by_embeddings(
+            [query_embedding], top_k, threshold, status,
+            include_embeddings=include_embeddings, filters=filters
+        )[0]
+
+    def search_by_embeddings(
+        self,
+        query_embeddings: List[Embedding],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query embeddings with one matrix-matrix product.
+
+        Filters select the candidate rows before scoring, so only matching
+        chunks are multiplied.
+
+        Returns:
+            One list of SearchResult objects per query, each sorted by similarity descending
+        """
+        snapshot = self._snapshot(status)
+        if not query_embeddings:
+            return []
+        rows = snapshot.candidates(filters)
+        matrix = snapshot.matrix if rows is None else snapshot.matrix[rows]
+        if len(matrix) == 0 or top_k <= 0:
+            return [[] for _ in query_embeddings]
+
+        queries = np.stack([q.array for q in query_embeddings])
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        scores = (queries / norms) @ matrix.T  # (queries, candidates)
+
+        k = min(top_k, len(matrix))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        if rows is not None:
+            top = rows[top]
+
+        return [
+            [
+                SearchResult(chunk=snapshot.record(i, include_embeddings), similarity=float(score))
+                for i, score in zip(row, row_scores)
+                if score >= threshold
+            ]
+            for row, row_scores in zip(top, top_scores)
+        ]
+
+    def _snapshot(self, status: str) -> _Snapshot:
+        """Return the loaded snapshot for status, reloading it if SQLite has changed."""
+        snapshot = self._snapshots.get(status)
+        if snapshot is None or snapshot.generation != self.client.generation:
+            # Concurrent searches wait for a single reload instead of each loading
+            with self.client.lock:
+                snapshot = self._snapshots.get(status)
+                if snapshot is None or snapshot.generation != self.client.generation:
+                    snapshot = self._load(status)
+                    self._snapshots[status] = snapshot
+        return snapshot
+
+    def _load(self, status: str) -> _Snapshot:
+        """Read all chunks of a status from SQLite into parallel arrays."""
+        generation = self.client.generation
+        document_ids, chunk_ids, revisions, contents, metadata, blobs = [], [], [], [], [], []
+        header2, header3 = [], []
+        for row in self.client.iter_chunk_vectors(status):
+            document_ids.append(row['document_id'])
+            chunk_ids.append(row['chunk_id'])
+            revisions.append(row['revision'])
+            contents.append(row['content'])
+            metadata.append(row['metadata'])
+            header2.append(row['header2'])
+            header3.append(row['header3'])
+            blobs.append(row['embedding'])
+
+        matrix = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(-1, EMBEDDING_DIMENSIONS).copy()
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+
+        return _Snapshot(
+            generation=generation,
+            matrix=matrix,
+            document_ids=document_ids,
+            chunk_ids=chunk_ids,
+            revisions=np.asarray(revisions, dtype=np.int64),
+            contents=contents,
+            metadata=metadata,
+            status=status,
+            labels={
+                "document_id": np.array(document_ids, dtype=object),
+                "header2": np.array(header2, dtype=object),
+                "header3": np.array(header3, dtype=object),
+            }
+        )
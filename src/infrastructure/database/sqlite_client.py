@@ -3,23 +3,56 @@ SQLite implementation of the vector database client.
 Uses sqlite-vec for vector similarity search.
 """
 
+import functools
 import json
+import re
 import sqlite3
+import threading
 import sqlite_vec
-import struct
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from src.config import SQLITE_DB_PATH, EMBEDDING_DIMENSIONS
-from src.infrastructure.database.base import VectorDatabaseClient, ChunkKey, ChunkRecord, SearchResult
+from src.infrastructure.database.base import VectorDatabaseClient, ChunkFilter, ChunkKey, ChunkRecord, SearchResult
 from src.rag.ingestion.embedder import Embedding
 
 
+# vec0 column definition for vec_document_chunks. status, document_id and the
+# section headers are metadata columns so KNN queries filter on them inside
+# sqlite-vec instead of scoring every chunk. vec0 metadata cannot be NULL, so
+# missing headers are stored as ''. Cosine distance keeps similarity scores
+# comparable with the Supabase backend and config.SIMILARITY_THRESHOLD.
+# Changing this triggers a rebuild in _migrate_vec_table().
+VEC_TABLE_COLUMNS = (
+    "status text, document_id text, header2 text, header3 text, "
+    f"embedding float[{EMBEDDING_DIMENSIONS}] distance_metric=cosine"
+)
+
+# Word tokens kept when turning free text into an FTS5 query
+_FTS_TOKEN = re.compile(r"\w+")
+
+
+def _synchronized(method):
+    """Run the method while holding the client's connection lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class SQLiteClient(VectorDatabaseClient):
     """Client for SQLite database operations with vector support."""
 
+    supports_text_search = True  # FTS5 index over chunk content
+
     def __init__(self, db_path: str = str(SQLITE_DB_PATH)):
         """Initialize SQLite connection and load sqlite-vec extension."""
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
+        # Bumped on every chunk write so caching layers can detect stale data
+        self.generation = 0
+        # One connection shared by worker threads (e.g. QuestionnaireRunner with
+        # max_workers > 1); every statement sequence runs under this lock
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
         
         # Enable foreign key support
@@ -50,13 +83,17 @@ class SQLiteClient(VectorDatabaseClient):
             )
         """)
         
-        # Virtual table for vector search (existing)
+        # Virtual table for vector search
+        self._migrate_vec_table(cursor)
         cursor.execute(f"""
             CREATE VIRTUAL TABLE IF NOT EXISTS vec_document_chunks USING vec0(
-                embedding float[{EMBEDDING_DIMENSIONS}]
+                {VEC_TABLE_COLUMNS}
             )
         """)
         
+        # Full-text index over chunk content (rowid = document_chunks.id)
+        self._init_fts_table(cursor)
+        
         # Domain: Questionnaires
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS questionnaires (
@@ -146,6 +183,24 @@ class SQLiteClient(VectorDatabaseClient):
             )
         """)
         
+        # Domain: Per-stage answer timings
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS answer_timings (
+                answer_id TEXT PRIMARY KEY REFERENCES answers(id) ON DELETE CASCADE,
+                run_id TEXT REFERENCES runs(id) ON DELETE CASCADE,
+                embedding_ms REAL,
+                search_ms REAL,
+                prompt_ms REAL,
+                generation_ms REAL,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_answer_timings_run_id
+            ON answer_timings(run_id)
+        """)
+        
         # Evaluation: Reports
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS evaluation_reports (
@@ -169,6 +224,71 @@ class SQLiteClient(VectorDatabaseClient):
         
         self.conn.commit()
 
+    def _migrate_vec_table(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Rebuild vec_document_chunks if it was created with an older column layout.
+
+        vec0 tables cannot be altered, so existing embeddings are read out,
+        the table is recreated with VEC_TABLE_COLUMNS and the rows are
+        re-inserted with their metadata taken from document_chunks. The
+        rebuild runs in one transaction: if any row fails to re-insert, the
+        old table and its embeddings are restored and the error is raised.
+        """
+        row = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'vec_document_chunks'"
+        ).fetchone()
+        if row is None:
+            return
+        existing = row[0][row[0].index("(") + 1:row[0].rindex(")")]
+        if " ".join(existing.split()) == " ".join(VEC_TABLE_COLUMNS.split()):
+            return
+
+        # DDL would otherwise autocommit, leaving the rows only in memory
+        if self.conn.in_transaction:
+            self.conn.commit()
+        cursor.execute("BEGIN")
+        try:
+            rows = cursor.execute("""
+                SELECT v.rowid, c.status, c.document_id,
+                       coalesce(CAST(json_extract(c.metadata, '$.Header2') AS TEXT), ''),
+                       coalesce(CAST(json_extract(c.metadata, '$.Header3') AS TEXT), ''),
+                       v.embedding
+                FROM vec_document_chunks v
+                JOIN document_chunks c ON c.id = v.rowid
+            """).fetchall()
+            cursor.execute("DROP TABLE vec_document_chunks")
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE vec_document_chunks USING vec0(
+                    {VEC_TABLE_COLUMNS}
+                )
+            """)
+            cursor.executemany("""
+                INSERT INTO vec_document_chunks (rowid, status, document_id, header2, header3, embedding)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [tuple(r) for r in rows])
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def _init_fts_table(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Create fts_document_chunks, backfilling it from document_chunks.
+
+        Databases created before the full-text index existed get every
+        existing chunk indexed once, the first time they are opened.
+        """
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'fts_document_chunks'"
+        ).fetchone()
+        if exists:
+            return
+        cursor.execute("CREATE VIRTUAL TABLE fts_document_chunks USING fts5(content)")
+        cursor.execute("""
+            INSERT INTO fts_document_chunks (rowid, content)
+            SELECT id, content FROM document_chunks
+        """)
+
     def is_connected(self) -> bool:
         """Check if connection is open."""
         try:
@@ -181,6 +301,7 @@ class SQLiteClient(VectorDatabaseClient):
         """Insert a single chunk."""
         return self.batch_insert_chunks([chunk_record])[0]
 
+    @_synchronized
     def batch_insert_chunks(self, chunk_records: List[ChunkRecord]) -> List[Dict[str, Any]]:
         """Batch insert multiple chunks."""
         cursor = self.conn.cursor()
@@ -189,12 +310,31 @@ class SQLiteClient(VectorDatabaseClient):
         for record in chunk_records:
             # Handle status: supersede previous active revisions if this one is active
             if record.status == "active":
+                cursor.execute("""
+                    UPDATE vec_document_chunks
+                    SET status = 'superseded'
+                    WHERE rowid IN (
+                        SELECT id FROM document_chunks
+                        WHERE document_id = ? AND chunk_id = ? AND status = 'active'
+                    )
+                """, (record.key.document_id, record.key.chunk_id))
                 cursor.execute("""
                     UPDATE document_chunks 
                     SET status = 'superseded' 
                     WHERE document_id = ? AND chunk_id = ? AND status = 'active'
                 """, (record.key.document_id, record.key.chunk_id))
 
+            # Re-inserting an existing revision replaces its row (and rowid),
+            # so drop the old vector and text entries first; vec0 does not
+            # support OR REPLACE.
+            for index_table in ("vec_document_chunks", "fts_document_chunks"):
+                cursor.execute(f"""
+                    DELETE FROM {index_table} WHERE rowid IN (
+                        SELECT id FROM document_chunks
+                        WHERE document_id = ? AND chunk_id = ? AND revision = ?
+                    )
+                """, (record.key.document_id, record.key.chunk_id, record.key.revision))
+
             # Insert into main table
             cursor.execute("""
                 INSERT OR REPLACE INTO document_chunks 
@@ -214,10 +354,21 @@ class SQLiteClient(VectorDatabaseClient):
             # Insert into vector table using same rowid
             # sqlite-vec's vec0 uses rowid automatically if not specified, 
             # but we want to ensure they match.
+            metadata = record.metadata or {}
+            cursor.execute("""
+                INSERT INTO vec_document_chunks (rowid, status, document_id, header2, header3, embedding)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                rowid,
+                record.status,
+                record.key.document_id,
+                _header_label(metadata.get("Header2")),
+                _header_label(metadata.get("Header3")),
+                record.embedding.to_bytes()
+            ))
             cursor.execute("""
-                INSERT OR REPLACE INTO vec_document_chunks (rowid, embedding)
-                VALUES (?, ?)
-            """, (rowid, sqlite_vec.serialize_float32(record.embedding.vector)))
+                INSERT INTO fts_document_chunks (rowid, content) VALUES (?, ?)
+            """, (rowid, record.content))
             
             results.append({
                 "document_id": record.key.document_id,
@@ -226,8 +377,10 @@ class SQLiteClient(VectorDatabaseClient):
             })
 
         self.conn.commit()
+        self.generation += 1
         return results
 
+    @_synchronized
     def delete_chunk(self, key: ChunkKey) -> None:
         """Delete a specific chunk."""
         cursor = self.conn.cursor()
@@ -242,85 +395,185 @@ class SQLiteClient(VectorDatabaseClient):
             rowid = row['id']
             cursor.execute("DELETE FROM document_chunks WHERE id = ?", (rowid,))
             cursor.execute("DELETE FROM vec_document_chunks WHERE rowid = ?", (rowid,))
+            cursor.execute("DELETE FROM fts_document_chunks WHERE rowid = ?", (rowid,))
             self.conn.commit()
+            self.generation += 1
 
-    def get_chunk_revisions(self, document_id: str, chunk_id: str) -> Dict[int, ChunkRecord]:
+    @_synchronized
+    def get_chunk_revisions(
+        self,
+        document_id: str,
+        chunk_id: str,
+        include_embeddings: bool = True
+    ) -> Dict[int, ChunkRecord]:
         """Get all revisions for a specific chunk."""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT c.*, v.embedding 
-            FROM document_chunks c
-            JOIN vec_document_chunks v ON c.id = v.rowid
+        cursor.execute(f"""
+            SELECT {_chunk_columns(include_embeddings)}
             WHERE c.document_id = ? AND c.chunk_id = ?
         """, (document_id, chunk_id))
         
         rows = cursor.fetchall()
         return {row['revision']: self._row_to_record(row) for row in rows}
 
-    def query_chunks_by_status(self, document_id: str, status: str) -> List[ChunkRecord]:
+    @_synchronized
+    def query_chunks_by_status(
+        self,
+        document_id: str,
+        status: str,
+        include_embeddings: bool = True
+    ) -> List[ChunkRecord]:
         """Query chunks filtered by document_id and status."""
         cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT c.*, v.embedding 
-            FROM document_chunks c
-            JOIN vec_document_chunks v ON c.id = v.rowid
+        cursor.execute(f"""
+            SELECT {_chunk_columns(include_embeddings)}
             WHERE c.document_id = ? AND c.status = ?
         """, (document_id, status))
         
         return [self._row_to_record(row) for row in cursor.fetchall()]
 
+    def iter_chunk_vectors(self, status: str) -> Iterator[sqlite3.Row]:
+        """
+        Stream every chunk with the given status together with its raw embedding blob.
+
+        Used by in-process indexes (see InMemoryVectorIndex) to bulk-load
+        vectors without building a ChunkRecord per row. Callers sharing the
+        client between threads must hold self.lock while iterating.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT c.id, c.document_id, c.chunk_id, c.revision, c.status,
+                   c.content, c.metadata, v.header2, v.header3, v.embedding
+            FROM document_chunks c
+            JOIN vec_document_chunks v ON c.id = v.rowid
+            WHERE c.status = ?
+            ORDER BY c.id
+        """, (status,))
+        return iter(cursor)
+
     def search_by_embedding(
         self,
         query_embedding: Embedding,
         top_k: int = 5,
         threshold: float = 0.0,
-        status: str = "active"
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
     ) -> List[SearchResult]:
-        """Search for similar chunks by embedding using L2 distance."""
+        """
+        Search for similar chunks by embedding using the vec0 KNN index.
+
+        Similarity is cosine similarity (1 - cosine distance). Rows below the
+        threshold are dropped inside sqlite-vec via a distance constraint, and
+        filters become equality constraints on the vec0 metadata columns.
+        Records carry no embedding unless include_embeddings is set.
+        """
+        return self.search_by_embeddings(
+            [query_embedding], top_k, threshold, status,
+            include_embeddings=include_embeddings, filters=filters
+        )[0]
+
+    @_synchronized
+    def search_by_embeddings(
+        self,
+        query_embeddings: List[Embedding],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several query embeddings in one pass.
+
+        vec0 KNN takes one query vector per statement, so the same prepared
+        KNN statement runs once per query and returns only rowids and
+        distances. Chunk rows for all hits are then fetched with a single
+        query and shared between queries that retrieved the same chunk.
+        """
+        cursor = self.conn.cursor()
+
+        # KNN query form: sqlite-vec scores only rows whose status and filter
+        # metadata match and returns the k nearest within the distance bound.
+        filter_sql, filter_params = _vec_filter_clause(filters)
+        hits = []
+        for query_embedding in query_embeddings:
+            cursor.execute(f"""
+                SELECT rowid, distance
+                FROM vec_document_chunks
+                WHERE embedding MATCH ? AND k = ? AND status = ? AND distance <= ?{filter_sql}
+                ORDER BY distance ASC
+            """, (query_embedding.to_bytes(), top_k, status, 1.0 - threshold, *filter_params))
+            hits.append([(row['rowid'], row['distance']) for row in cursor.fetchall()])
+
+        records = self._fetch_records(
+            {rowid for query_hits in hits for rowid, _ in query_hits}, include_embeddings
+        )
+        return [
+            [
+                SearchResult(chunk=records[rowid], similarity=_cosine_similarity(distance))
+                for rowid, distance in query_hits
+                if rowid in records
+            ]
+            for query_hits in hits
+        ]
+
+    @_synchronized
+    def search_by_text(
+        self,
+        query: str,
+        top_k: int = 5,
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[SearchResult]:
+        """
+        Search chunk content with FTS5, ranked by BM25.
+
+        Every word of the query is matched as a quoted term and terms are
+        OR-ed, so exact identifiers like "AES-256" or "SOC 2" rank highly
+        without FTS5 query syntax leaking through. SearchResult.similarity
+        is the negated bm25() score (higher is better). Filters are applied
+        in the same statement against document_chunks.
+        """
+        match = _fts_query(query)
+        if not match or top_k <= 0:
+            return []
+        filter_sql, filter_params = _chunk_filter_clause(filters)
         cursor = self.conn.cursor()
-        
-        # sqlite-vec uses distance functions. vec_distance_L2 is common.
-        # We need to convert distance to similarity if we want to respect threshold.
-        # For now, let's just return top_k.
-        
         cursor.execute(f"""
-            SELECT 
-                c.*, 
-                v.embedding,
-                vec_distance_L2(v.embedding, ?) as distance
-            FROM vec_document_chunks v
-            JOIN document_chunks c ON v.rowid = c.id
-            WHERE c.status = ?
-            ORDER BY distance ASC
+            SELECT f.rowid, bm25(fts_document_chunks) AS score
+            FROM fts_document_chunks f
+            JOIN document_chunks c ON c.id = f.rowid
+            WHERE fts_document_chunks MATCH ? AND c.status = ?{filter_sql}
+            ORDER BY score
             LIMIT ?
-        """, (sqlite_vec.serialize_float32(query_embedding.vector), status, top_k))
-        
-        results = []
-        for row in cursor.fetchall():
-            # Rough conversion from L2 distance to a "similarity" score
-            # (Higher is better, 1.0 is perfect)
-            distance = row['distance']
-            similarity = 1.0 / (1.0 + distance)
-            
-            if similarity >= threshold:
-                results.append(SearchResult(
-                    chunk=self._row_to_record(row),
-                    similarity=similarity
-                ))
-                
-        return results
+        """, (match, status, *filter_params, top_k))
+        hits = [(row['rowid'], row['score']) for row in cursor.fetchall()]
+
+        records = self._fetch_records({rowid for rowid, _ in hits}, include_embeddings)
+        return [
+            SearchResult(chunk=records[rowid], similarity=-score)
+            for rowid, score in hits
+            if rowid in records
+        ]
 
-    def _deserialize_embedding(self, blob: bytes) -> List[float]:
-        """Deserialize a binary blob into a list of floats."""
-        # Each float32 is 4 bytes
-        count = len(blob) // 4
-        return list(struct.unpack(f"{count}f", blob))
+    def _fetch_records(self, rowids: Set[int], include_embeddings: bool) -> Dict[int, ChunkRecord]:
+        """Load ChunkRecords for the given chunk ids, keyed by id."""
+        if not rowids:
+            return {}
+        ids = list(rowids)
+        placeholders = ",".join("?" * len(ids))
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT {_chunk_columns(include_embeddings)}
+            WHERE c.id IN ({placeholders})
+        """, ids)
+        return {row['id']: self._row_to_record(row) for row in cursor.fetchall()}
 
     def _row_to_record(self, row: sqlite3.Row) -> ChunkRecord:
-        """Convert a SQLite row to a ChunkRecord."""
-        # sqlite-vec returns embeddings as blobs
-        embedding_vector = self._deserialize_embedding(row['embedding'])
-        
+        """Convert a SQLite row to a ChunkRecord (embedding is None if the row has none)."""
+        blob = row['embedding'] if 'embedding' in row.keys() else None
         return ChunkRecord(
             key=ChunkKey(
                 document_id=row['document_id'],
@@ -329,6 +582,67 @@ class SQLiteClient(VectorDatabaseClient):
             ),
             status=row['status'],
             content=row['content'],
-            embedding=Embedding(vector=embedding_vector),
+            # sqlite-vec returns float32 blobs; view them without unpacking
+            embedding=Embedding.from_bytes(blob) if blob is not None else None,
             metadata=json.loads(row['metadata']) if row['metadata'] else None
         )
+
+
+def _chunk_columns(include_embeddings: bool) -> str:
+    """
+    SELECT list and FROM clause for reading chunks as alias c.
+
+    The vec0 join is only made when embeddings are wanted, so lightweight
+    reads never touch the vector table.
+    """
+    if include_embeddings:
+        return """c.*, v.embedding
+            FROM document_chunks c
+            JOIN vec_document_chunks v ON c.id = v.rowid"""
+    return "c.* FROM document_chunks c"
+
+
+def _header_label(value: Any) -> str:
+    """Section header as stored in the vec0 text metadata columns ('' when missing)."""
+    return "" if value is None else str(value)
+
+
+def _vec_filter_clause(filters: Optional[ChunkFilter]) -> Tuple[str, List[str]]:
+    """Extra KNN WHERE terms on the vec0 metadata columns for the set filter fields."""
+    if filters is None:
+        return "", []
+    terms = [
+        (column, value)
+        for column, value in (
+            ("document_id", filters.document_id),
+            ("header2", filters.header2),
+            ("header3", filters.header3),
+        )
+        if value is not None
+    ]
+    return "".join(f" AND {column} = ?" for column, _ in terms), [value for _, value in terms]
+
+
+def _chunk_filter_clause(filters: Optional[ChunkFilter]) -> Tuple[str, List[str]]:
+    """Extra WHERE terms on document_chunks (alias c) for the set filter fields."""
+    if filters is None:
+        return "", []
+    sql, params = "", []
+    if filters.document_id is not None:
+        sql += " AND c.document_id = ?"
+        params.append(filters.document_id)
+    for key, value in filters.metadata_match().items():
+        # Same text cast as the vec0 header columns, so numeric headers match too
+        sql += f" AND CAST(json_extract(c.metadata, '$.{key}') AS TEXT) = ?"
+        params.append(value)
+    return sql, params
+
+
+def _fts_query(text: str) -> str:
+    """Build an FTS5 MATCH expression that ORs the quoted word tokens of text."""
+    return " OR ".join(f'"{token}"' for token in _FTS_TOKEN.findall(text))
+
+
+def _cosine_similarity(distance: float) -> float:
+    """Convert a vec0 cosine distance to a similarity clamped to [-1, 1]."""
+    return max(-1.0, min(1.0, 1.0 - distance))
@@ -12,7 +12,7 @@ from supabase import create_client, Client
 from typing import Dict, Any, Optional, List, cast
 from src.config import SUPABASE_URL, SUPABASE_KEY, CHUNKS_TABLE
 from src.rag.ingestion.embedder import Embedding
-from src.infrastructure.database.base import VectorDatabaseClient, ChunkKey, ChunkRecord, SearchResult
+from src.infrastructure.database.base import VectorDatabaseClient, ChunkFilter, ChunkKey, ChunkRecord, SearchResult
 
 
 class SupabaseClient(VectorDatabaseClient):
@@ -143,40 +143,52 @@ class SupabaseClient(VectorDatabaseClient):
             "revision", key.revision
         ).execute()
 
-    def get_chunk_revisions(self, document_id: str, chunk_id: str) -> Dict[int, ChunkRecord]:
+    def get_chunk_revisions(
+        self,
+        document_id: str,
+        chunk_id: str,
+        include_embeddings: bool = True
+    ) -> Dict[int, ChunkRecord]:
         """
         Get all revisions for a specific chunk.
 
         Args:
             document_id: The document ID
             chunk_id: The chunk ID
+            include_embeddings: Whether to fetch and parse the embedding column
 
         Returns:
             Dictionary keyed by revision number containing ChunkRecord objects
         """
-        response = self.client.table(self.table_name).select("*").eq(
+        response = self.client.table(self.table_name).select(
+            _select_columns(include_embeddings)
+        ).eq(
             "document_id", document_id
         ).eq(
             "chunk_id", chunk_id
         ).execute()
 
         rows = cast(List[Dict[str, Any]], response.data)
-        return {row["revision"]: self._row_to_chunk_record(row) for row in rows}
+        return {row["revision"]: self._row_to_chunk_record(row, include_embeddings) for row in rows}
 
-    def _row_to_chunk_record(self, row: Dict[str, Any]) -> ChunkRecord:
+    def _row_to_chunk_record(self, row: Dict[str, Any], include_embeddings: bool = True) -> ChunkRecord:
         """
         Convert a database row to a ChunkRecord.
 
         Args:
             row: Dictionary containing database row data
+            include_embeddings: Whether to parse the embedding (left as None otherwise)
 
         Returns:
             ChunkRecord reconstructed from the row
         """
-        # Embedding may be returned as JSON string from Supabase
-        embedding_data = row["embedding"]
-        if isinstance(embedding_data, str):
-            embedding_data = json.loads(embedding_data)
+        embedding = None
+        if include_embeddings:
+            # Embedding may be returned as JSON string from Supabase
+            embedding_data = row["embedding"]
+            if isinstance(embedding_data, str):
+                embedding_data = json.loads(embedding_data)
+            embedding = Embedding(vector=embedding_data)
 
         return ChunkRecord(
             key=ChunkKey(
@@ -186,36 +198,46 @@ class SupabaseClient(VectorDatabaseClient):
             ),
             status=row["status"],
             content=row["content"],
-            embedding=Embedding(vector=embedding_data),
+            embedding=embedding,
             metadata=row.get("metadata")
         )
 
-    def query_chunks_by_status(self, document_id: str, status: str) -> List[ChunkRecord]:
+    def query_chunks_by_status(
+        self,
+        document_id: str,
+        status: str,
+        include_embeddings: bool = True
+    ) -> List[ChunkRecord]:
         """
         Query chunks filtered by document_id and status.
 
         Args:
             document_id: The document ID to filter by
             status: The status to filter by (e.g., "active", "superseded")
+            include_embeddings: Whether to fetch and parse the embedding column
 
         Returns:
             List of ChunkRecord objects matching the criteria
         """
-        response = self.client.table(self.table_name).select("*").eq(
+        response = self.client.table(self.table_name).select(
+            _select_columns(include_embeddings)
+        ).eq(
             "document_id", document_id
         ).eq(
             "status", status
         ).execute()
 
         rows = cast(List[Dict[str, Any]], response.data)
-        return [self._row_to_chunk_record(row) for row in rows]
+        return [self._row_to_chunk_record(row, include_embeddings) for row in rows]
 
     def search_by_embedding(
         self,
         query_embedding: Embedding,
         top_k: int = 5,
         threshold: float = 0.0,
-        status: str = "active"
+        status: str = "active",
+        include_embeddings: bool = False,
+        filters: Optional[ChunkFilter] = None
     ) -> List[SearchResult]:
         """
         Search for chunks similar to the query embedding using pgvector.
@@ -225,22 +247,36 @@ class SupabaseClient(VectorDatabaseClient):
             top_k: Maximum number of results to return
             threshold: Minimum similarity score (0.0 to 1.0)
             status: Filter by chunk status (default: "active")
+            include_embeddings: Whether to parse the returned embeddings
+            filters: Restrict to a document and/or section (evaluated by search_chunks)
 
         Returns:
             List of SearchResult objects, sorted by similarity descending
         """
-        response = self.client.rpc(
-            "search_chunks",
-            {
-                "query_embedding": query_embedding.vector,
-                "max_results": top_k,
-                "similarity_threshold": threshold,
-                "status_filter": status
-            }
-        ).execute()
+        params = {
+            "query_embedding": query_embedding.vector,
+            "max_results": top_k,
+            "similarity_threshold": threshold,
+            "status_filter": status
+        }
+        # Only sent when set, so deployments without the filter arguments keep working
+        if filters is not None:
+            params["document_filter"] = filters.document_id
+            params["metadata_filter"] = filters.metadata_match()
+        response = self.client.rpc("search_chunks", params).execute()
 
         rows = cast(List[Dict[str, Any]], response.data)
         return [
-            SearchResult(chunk=self._row_to_chunk_record(row), similarity=row["similarity"])
+            SearchResult(
+                chunk=self._row_to_chunk_record(row, include_embeddings),
+                similarity=row["similarity"]
+            )
             for row in rows
         ]
+
+
+def _select_columns(include_embeddings: bool) -> str:
+    """Column list for chunk reads; leaves out the embedding unless it is wanted."""
+    if include_embeddings:
+        return "*"
+    return "document_id,chunk_id,revision,status,content,metadata"
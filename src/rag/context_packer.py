@@ -0,0 +1,129 @@
+"""
+Token-budgeted packing of retrieved chunks into prompt context.
+
+Chunks are added in rank order until the budget is spent; the chunk that
+does not fit is cut at the last sentence boundary that does, or at the last
+word boundary if not even its first sentence fits. Prompt length
+drives prefill time, so the budget is effectively an answer-latency cap.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from src.config import CONTEXT_TOKEN_BUDGET
+from src.infrastructure.database.base import SearchResult
+
+# Average characters per token for English text with Llama-family BPE tokenizers
+CHARS_PER_TOKEN = 4.0
+
+# Sentence ends: terminal punctuation followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Word boundaries, for the hard cut when no sentence fits
+_WHITESPACE = re.compile(r"\s+")
+
+
+def approximate_token_count(text: str) -> int:
+    """Estimate tokens from character length; fast and tokenizer-free."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class PackedContext:
+    """Context text built from the chunks that fit in the budget."""
+    text: str
+    results: List[SearchResult] = field(default_factory=list)  # chunks included, in rank order
+    tokens: int = 0
+    truncated: bool = False  # True if a chunk was cut or dropped
+
+
+class ContextPacker:
+    """Packs ranked search results into a token budget."""
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = CONTEXT_TOKEN_BUDGET,
+        token_counter: Callable[[str], int] = approximate_token_count
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            token_budget: Maximum context tokens; None or 0 packs every chunk
+            token_counter: Counts tokens in a string. Defaults to a character
+                based approximation; pass the model's tokenizer for exact counts.
+        """
+        self.token_budget = token_budget
+        self.count_tokens = token_counter
+
+    def pack(self, results: List[SearchResult]) -> PackedContext:
+        """
+        Format results as numbered context entries within the token budget.
+
+        Returns:
+            PackedContext with the context text, included results and tokens used
+        """
+        parts: List[str] = []
+        included: List[SearchResult] = []
+        used = 0
+        truncated = False
+
+        for result in results:
+            entry = self._entry(len(included) + 1, result.chunk.content)
+            # Entries are joined by a blank line, which counts against the budget too
+            cost = self.count_tokens(("\n\n" if parts else "") + entry)
+            if not self.token_budget or used + cost <= self.token_budget:
+                parts.append(entry)
+                included.append(result)
+                used += cost
+                continue
+
+            truncated = True
+            remaining = self.token_budget - used
+            cut = self._truncate(len(included) + 1, result.chunk.content, remaining, bool(parts))
+            if cut is not None:
+                entry, cost = cut
+                parts.append(entry)
+                included.append(result)
+                used += cost
+            break
+
+        return PackedContext(text="\n\n".join(parts), results=included, tokens=used, truncated=truncated)
+
+    def _truncate(self, index: int, content: str, remaining: int, separated: bool):
+        """
+        Longest prefix of content whose entry fits in remaining tokens, with its cost.
+
+        Prefers whole sentences and falls back to whole words; returns None
+        if not even the first word fits.
+        """
+        separator = "\n\n" if separated else ""
+        for boundary in (_SENTENCE_END, _WHITESPACE):
+            # Cut where the whitespace after a sentence (or word) starts, so the
+            # kept prefix is the source text unchanged, newlines included
+            cuts = [match.start() for match in boundary.finditer(content) if match.start() > 0]
+            best = self._longest_prefix(index, content, cuts, remaining, separator)
+            if best is not None:
+                return best
+        return None
+
+    def _longest_prefix(self, index: int, content: str, cuts: List[int], remaining: int, separator: str):
+        """Entry and cost of the longest content[:cut] that fits, or None."""
+        best = None
+        # Cut offsets ascend and cost grows with them, so binary search the longest fitting prefix
+        low, high = 0, len(cuts) - 1
+        while low <= high:
+            mid = (low + high) // 2
+            entry = self._entry(index, content[:cuts[mid]])
+            cost = self.count_tokens(separator + entry)
+            if cost <= remaining:
+                best = (entry, cost)
+                low = mid + 1
+            else:
+                high = mid - 1
+        return best
+
+    @staticmethod
+    def _entry(index: int, content: str) -> str:
+        return f"[{index}] {content}"
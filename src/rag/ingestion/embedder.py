@@ -4,94 +4,472 @@ Document embedder for generating vector embeddings via Ollama.
 Uses mxbai-embed-large model to generate 1024-dimensional embeddings.
 """
 
-from dataclasses import dataclass
-from typing import List
+import asyncio
+from typing import Dict, List, Optional, Sequence, Union
+import httpx
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.config import (
+    OLLAMA_BASE_URL, OLLAMA_EMBEDDING_MODEL,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_MAX_BATCH_CHARS,
+    EMBEDDING_POOL_SIZE, EMBEDDING_TIMEOUT,
+    EMBEDDING_MAX_RETRIES, EMBEDDING_RETRY_BACKOFF,
+    EMBEDDING_MAX_CONCURRENCY, EMBEDDING_CACHE_ENABLED
+)
+from src.rag.ingestion.embedding_cache import EmbeddingCache
 
 
 # Constants
-OLLAMA_API_URL = "http://127.0.0.1:11434/api/embeddings"
-EMBEDDING_MODEL = "mxbai-embed-large"
+EMBEDDING_MODEL = OLLAMA_EMBEDDING_MODEL
 EXPECTED_DIMENSIONS = 1024
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Lazily created shared instances (see get_embedding_cache / get_embedding_client)
+_default_cache: Optional[EmbeddingCache] = None
+_default_client: Optional["EmbeddingClient"] = None
 
 
-@dataclass
 class Embedding:
-    """Represents a 1024-dimensional embedding vector."""
-    
-    vector: List[float]
-    
-    def __post_init__(self):
-        """Validate embedding dimensions."""
-        if len(self.vector) != EXPECTED_DIMENSIONS:
+    """
+    Represents a 1024-dimensional embedding vector.
+
+    Backed by a contiguous float32 NumPy array (4 KB instead of 1024 boxed
+    Python floats). `vector` remains available as a list view for callers
+    that expect plain floats.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, vector: Union[Sequence[float], np.ndarray]):
+        """
+        Wrap a vector, converting it to float32 if needed.
+
+        Args:
+            vector: Sequence of floats or a NumPy array. A float32 array is
+                used as-is, without copying.
+
+        Raises:
+            ValueError: If the vector does not have EXPECTED_DIMENSIONS values
+        """
+        array = np.asarray(vector, dtype=np.float32)
+        if array.ndim != 1 or len(array) != EXPECTED_DIMENSIONS:
             raise ValueError(
-                f"Expected {EXPECTED_DIMENSIONS} dimensions, got {len(self.vector)}"
+                f"Expected {EXPECTED_DIMENSIONS} dimensions, got {array.size}"
             )
-    
+        self.array = array
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "Embedding":
+        """Create an Embedding viewing a float32 blob (e.g. from sqlite-vec) without copying."""
+        return cls(np.frombuffer(blob, dtype=np.float32))
+
+    def to_bytes(self) -> memoryview:
+        """Return a zero-copy float32 buffer, accepted by sqlite3 as a BLOB."""
+        return memoryview(np.ascontiguousarray(self.array))
+
+    @property
+    def vector(self) -> List[float]:
+        """The embedding as a list of Python floats."""
+        return self.array.tolist()
+
     def __len__(self) -> int:
         """Return the dimensionality of the embedding."""
-        return len(self.vector)
+        return len(self.array)
+
+    def __eq__(self, other: object) -> bool:
+        """Embeddings are equal when their vectors are identical."""
+        if not isinstance(other, Embedding):
+            return NotImplemented
+        return bool(np.array_equal(self.array, other.array))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Embedding(dimensions={len(self)})"
+
+
+class EmbeddingClient:
+    """Ollama embedding client with a pooled keep-alive HTTP session."""
+
+    def __init__(
+        self,
+        base_url: str = OLLAMA_BASE_URL,
+        model: str = EMBEDDING_MODEL,
+        pool_size: int = EMBEDDING_POOL_SIZE,
+        timeout: float = EMBEDDING_TIMEOUT,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+        backoff_factor: float = EMBEDDING_RETRY_BACKOFF,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_batch_chars: int = EMBEDDING_MAX_BATCH_CHARS,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Ollama server URL, e.g. "http://localhost:11434"
+            model: Embedding model name
+            pool_size: Maximum number of pooled keep-alive connections
+            timeout: Request timeout in seconds
+            max_retries: Retries for failed connections and 429/5xx responses
+            backoff_factor: Exponential backoff factor between retries
+            batch_size: Maximum number of texts per /api/embed request
+            max_batch_chars: Maximum total characters per request
+            max_concurrency: Maximum requests in flight for the async API
+            cache: EmbeddingCache to use. Defaults to get_embedding_cache().
+        """
+        self.base_url = base_url.rstrip("/")
+        self.embed_url = f"{self.base_url}/api/embed"
+        self.model = model
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.max_batch_chars = max_batch_chars
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_concurrency = max_concurrency
+        self._cache = cache
+
+        # Async state is bound to the event loop it was created on
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_semaphore: Optional[asyncio.Semaphore] = None
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def cache(self) -> Optional[EmbeddingCache]:
+        """The embedding cache in use, if any."""
+        return self._cache if self._cache is not None else get_embedding_cache()
+
+    def embed(self, text: str, cache: Optional[EmbeddingCache] = None) -> Embedding:
+        """
+        Generate an embedding for a single text.
+
+        Args:
+            text: Text to embed
+            cache: Overrides the client's cache for this call
+
+        Returns:
+            Embedding object with 1024-dimensional vector
+
+        Raises:
+            ValueError: If text is empty
+            ConnectionError: If Ollama service is unavailable
+            requests.exceptions.HTTPError: If Ollama returns an error
+        """
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+        return self.embed_many([text], cache=cache)[0]
+
+    def embed_many(self, texts: List[str], cache: Optional[EmbeddingCache] = None) -> List[Embedding]:
+        """
+        Generate embeddings for multiple texts, maintaining order.
+
+        Texts found in the cache are not sent at all. The remaining distinct
+        texts go to Ollama's multi-input /api/embed endpoint in batches grouped
+        by length (see _plan_batches), and results are written back to the
+        position of each input text.
+
+        Args:
+            texts: List of texts to embed
+            cache: Overrides the client's cache for this call
+
+        Returns:
+            List of Embedding objects in the same order as input texts
+
+        Raises:
+            ValueError: If texts list is empty or any text is empty
+            ConnectionError: If Ollama service is unavailable
+            requests.exceptions.HTTPError: If Ollama returns an error
+        """
+        if cache is None:
+            cache = self.cache
+        embeddings, pending = self._lookup_cached(texts, cache)
+
+        for batch_texts in self._pending_batches(pending):
+            vectors = self._embed_batch(batch_texts)
+            self._store_batch(embeddings, pending, batch_texts, vectors, cache)
+
+        return embeddings
+
+    async def aembed(self, text: str, cache: Optional[EmbeddingCache] = None) -> Embedding:
+        """Async version of embed()."""
+        if not text or not text.strip():
+            raise ValueError("Text cannot be empty")
+        return (await self.aembed_many([text], cache=cache))[0]
+
+    async def aembed_many(self, texts: List[str], cache: Optional[EmbeddingCache] = None) -> List[Embedding]:
+        """
+        Async version of embed_many().
+
+        Batches are sent concurrently, with at most max_concurrency requests
+        in flight across all callers on the same event loop. Results are
+        returned in input order.
+        """
+        if cache is None:
+            cache = self.cache
+        embeddings, pending = self._lookup_cached(texts, cache)
+
+        batches = self._pending_batches(pending)
+        results = await asyncio.gather(*(self._aembed_batch(batch) for batch in batches))
+        for batch_texts, vectors in zip(batches, results):
+            self._store_batch(embeddings, pending, batch_texts, vectors, cache)
+
+        return embeddings
+
+    def _lookup_cached(self, texts: List[str], cache: Optional[EmbeddingCache]):
+        """
+        Validate texts and resolve what the cache already has.
 
+        Returns:
+            Tuple of (embeddings with cache hits filled in and None elsewhere,
+            mapping of each distinct uncached text to its input positions)
+        """
+        if not texts:
+            raise ValueError("Texts list cannot be empty")
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Text cannot be empty")
 
-def generate_embedding(text: str) -> Embedding:
+        embeddings: List[Optional[Embedding]] = [None] * len(texts)
+        if cache is not None:
+            for i, vector in cache.get_many(texts, self.model, EXPECTED_DIMENSIONS).items():
+                embeddings[i] = Embedding(vector=vector)
+
+        # Embed each distinct uncached text once
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if embeddings[i] is None:
+                pending.setdefault(text, []).append(i)
+        return embeddings, pending
+
+    def _pending_batches(self, pending: Dict[str, List[int]]) -> List[List[str]]:
+        """Group the uncached texts into request batches (see _plan_batches)."""
+        missing = list(pending)
+        return [
+            [missing[j] for j in batch]
+            for batch in _plan_batches(missing, self.batch_size, self.max_batch_chars)
+        ]
+
+    def _store_batch(
+        self,
+        embeddings: List[Optional[Embedding]],
+        pending: Dict[str, List[int]],
+        batch_texts: List[str],
+        vectors: List[List[float]],
+        cache: Optional[EmbeddingCache]
+    ) -> None:
+        """Write a batch of vectors back to their input positions and the cache."""
+        for text, vector in zip(batch_texts, vectors):
+            embedding = Embedding(vector=vector)
+            for i in pending[text]:
+                embeddings[i] = embedding
+        if cache is not None:
+            cache.put_many(batch_texts, self.model, EXPECTED_DIMENSIONS, vectors)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    async def aclose(self) -> None:
+        """
+        Close the async HTTP client, if one was opened.
+
+        Call it before the event loop that used the client ends (e.g. at the
+        end of the coroutine passed to asyncio.run()): its connections belong
+        to that loop and cannot be closed from another one.
+        """
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    def _async_resources(self):
+        """Return (AsyncClient, Semaphore) for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+            self._async_semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._async_loop = loop
+        return self._async_client, self._async_semaphore
+
+    async def _aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Send one /api/embed request, bounded by the semaphore, with retry and backoff."""
+        client, semaphore = self._async_resources()
+        async with semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await client.post(
+                        self.embed_url,
+                        json={"model": self.model, "input": texts}
+                    )
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                        break
+                except httpx.TransportError as e:
+                    if attempt == self.max_retries:
+                        raise ConnectionError(
+                            f"Failed to connect to Ollama at {self.embed_url}. "
+                            "Is Ollama running?"
+                        ) from e
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            response.raise_for_status()
+
+        vectors = response.json()["embeddings"]
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Send one multi-input request to Ollama's /api/embed endpoint."""
+        try:
+            response = self.session.post(
+                self.embed_url,
+                json={"model": self.model, "input": texts},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.exceptions.ConnectionError as e:
+            raise ConnectionError(
+                f"Failed to connect to Ollama at {self.embed_url}. "
+                "Is Ollama running?"
+            ) from e
+
+        vectors = response.json()["embeddings"]
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the shared persistent embedding cache.
+
+    The cache file is opened on first use. Returns None when
+    EMBEDDING_CACHE_ENABLED is false.
+    """
+    global _default_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = EmbeddingCache()
+    return _default_cache
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """Return the shared EmbeddingClient configured from src.config."""
+    global _default_client
+    if _default_client is None:
+        _default_client = EmbeddingClient()
+    return _default_client
+
+
+def generate_embedding(text: str, cache: Optional[EmbeddingCache] = None) -> Embedding:
     """
     Generate a 1024-dimensional embedding for text via Ollama.
+
+    Convenience wrapper around the shared EmbeddingClient.
     
     Args:
         text: Text to embed
+        cache: EmbeddingCache to use. Defaults to get_embedding_cache().
         
     Returns:
         Embedding object with 1024-dimensional vector
         
     Raises:
         ValueError: If text is empty
-        requests.exceptions.ConnectionError: If Ollama service is unavailable
+        ConnectionError: If Ollama service is unavailable
         requests.exceptions.HTTPError: If Ollama returns an error
     """
-    if not text or not text.strip():
-        raise ValueError("Text cannot be empty")
-    
-    try:
-        response = requests.post(
-            OLLAMA_API_URL,
-            json={"model": EMBEDDING_MODEL, "prompt": text},
-            timeout=30
-        )
-        response.raise_for_status()
-    except requests.exceptions.ConnectionError as e:
-        raise ConnectionError(
-            f"Failed to connect to Ollama at {OLLAMA_API_URL}. "
-            "Is Ollama running?"
-        ) from e
-    
-    vector = response.json()["embedding"]
-    return Embedding(vector=vector)
+    return get_embedding_client().embed(text, cache=cache)
 
 
-def generate_embeddings(texts: List[str]) -> List[Embedding]:
+def generate_embeddings(texts: List[str], cache: Optional[EmbeddingCache] = None) -> List[Embedding]:
     """
     Generate embeddings for multiple texts, maintaining order.
 
-    Processes texts sequentially to ensure order is preserved.
-    For large batches, consider processing in smaller chunks.
+    Convenience wrapper around the shared EmbeddingClient.
 
     Args:
         texts: List of texts to embed
+        cache: EmbeddingCache to use. Defaults to get_embedding_cache().
 
     Returns:
         List of Embedding objects in the same order as input texts
 
     Raises:
         ValueError: If texts list is empty or any text is empty
-        requests.exceptions.ConnectionError: If Ollama service is unavailable
+        ConnectionError: If Ollama service is unavailable
         requests.exceptions.HTTPError: If Ollama returns an error
     """
-    if not texts:
-        raise ValueError("Texts list cannot be empty")
+    return get_embedding_client().embed_many(texts, cache=cache)
+
+
+async def agenerate_embedding(text: str, cache: Optional[EmbeddingCache] = None) -> Embedding:
+    """
+    Async version of generate_embedding().
+
+    Requests share the shared EmbeddingClient's connection pool and are
+    bounded by EMBEDDING_MAX_CONCURRENCY requests in flight.
+    """
+    return await get_embedding_client().aembed(text, cache=cache)
+
 
-    embeddings = []
-    for text in texts:
-        embedding = generate_embedding(text)
-        embeddings.append(embedding)
+async def agenerate_embeddings(texts: List[str], cache: Optional[EmbeddingCache] = None) -> List[Embedding]:
+    """
+    Async version of generate_embeddings().
+
+    Batches are sent concurrently (at most EMBEDDING_MAX_CONCURRENCY in
+    flight) and embeddings are returned in input order.
+    """
+    return await get_embedding_client().aembed_many(texts, cache=cache)
+
+
+def _plan_batches(texts: List[str], batch_size: int, max_batch_chars: int) -> List[List[int]]:
+    """
+    Group text indices into request batches.
+
+    Indices are ordered by text length so texts of similar size share a batch,
+    then packed until either batch_size or max_batch_chars is reached. A text
+    longer than max_batch_chars gets a batch of its own, so one long chunk never
+    holds back a batch of short ones.
+
+    Returns:
+        List of batches, each a list of indices into texts
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
 
-    return embeddings
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+    for i in sorted(range(len(texts)), key=lambda i: len(texts[i])):
+        size = len(texts[i])
+        if current and (len(current) >= batch_size or current_chars + size > max_batch_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += size
+    if current:
+        batches.append(current)
+    return batches
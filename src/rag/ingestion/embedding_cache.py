@@ -0,0 +1,171 @@
+"""
+Persistent, content-addressed cache for embedding vectors.
+
+Stores vectors in a SQLite file keyed by (model, dimensions, sha256 of text),
+so identical chunks, repeated questions and ground-truth answers are only
+embedded once across ingests, trials and tuning sweeps.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from src.config import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache of embedding vectors."""
+
+    def __init__(
+        self,
+        db_path: str = str(EMBEDDING_CACHE_PATH),
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite cache file (":memory:" for tests)
+            max_entries: Maximum number of cached vectors before LRU eviction
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Shared by worker threads (hybrid retrieval, concurrent runners)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                dimensions INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, dimensions, text_hash)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used
+            ON embedding_cache(last_used)
+        """)
+        self.conn.commit()
+        # Running entry count, so puts do not scan the table to decide on eviction
+        self._entries = self.conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+
+    @staticmethod
+    def hash_text(text: str) -> str:
+        """Return the sha256 hex digest used as the content address of text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, text: str, model: str, dimensions: int) -> Optional[np.ndarray]:
+        """Return the cached vector for text, or None on a miss."""
+        return self.get_many([text], model, dimensions).get(0)
+
+    def get_many(self, texts: List[str], model: str, dimensions: int) -> Dict[int, np.ndarray]:
+        """
+        Look up several texts at once.
+
+        Returns:
+            Dictionary mapping the index of each cached text to its vector.
+            Indices missing from the result are cache misses.
+        """
+        with self._lock:
+            hashes = [self.hash_text(text) for text in texts]
+            found: Dict[str, np.ndarray] = {
+                text_hash: self._deserialize(blob)
+                for text_hash, blob in self._select(
+                    "text_hash, vector", model, dimensions, list(dict.fromkeys(hashes))
+                )
+            }
+
+            if found:
+                now = time.time()
+                self.conn.executemany("""
+                    UPDATE embedding_cache SET last_used = ?
+                    WHERE model = ? AND dimensions = ? AND text_hash = ?
+                """, [(now, model, dimensions, h) for h in found])
+                self.conn.commit()
+
+            result = {i: found[h] for i, h in enumerate(hashes) if h in found}
+            self.hits += len(result)
+            self.misses += len(texts) - len(result)
+            return result
+
+    def put(self, text: str, model: str, dimensions: int, vector: Union[Sequence[float], np.ndarray]) -> None:
+        """Store the vector for a single text."""
+        self.put_many([text], model, dimensions, [vector])
+
+    def put_many(
+        self,
+        texts: List[str],
+        model: str,
+        dimensions: int,
+        vectors: List[Union[Sequence[float], np.ndarray]]
+    ) -> None:
+        """Store vectors for several texts and evict old entries if over capacity."""
+        now = time.time()
+        # Later duplicates win, as they would with row-by-row INSERT OR REPLACE
+        blobs = {self.hash_text(text): self._serialize(vector) for text, vector in zip(texts, vectors)}
+        with self._lock:
+            replaced = len(self._select("text_hash", model, dimensions, list(blobs)))
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO embedding_cache
+                (model, dimensions, text_hash, vector, last_used)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(model, dimensions, text_hash, blob, now) for text_hash, blob in blobs.items()])
+            self._entries += len(blobs) - replaced
+            self._evict()
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, hit rate and current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self)
+        }
+
+    def __len__(self) -> int:
+        """Return the number of cached vectors."""
+        with self._lock:
+            return self._entries
+
+    def _select(self, columns: str, model: str, dimensions: int, hashes: List[str]) -> List[tuple]:
+        """Return the given columns of the cached rows among hashes."""
+        rows: List[tuple] = []
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(hashes), 500):
+            part = hashes[start:start + 500]
+            placeholders = ",".join("?" * len(part))
+            rows.extend(self.conn.execute(f"""
+                SELECT {columns} FROM embedding_cache
+                WHERE model = ? AND dimensions = ? AND text_hash IN ({placeholders})
+            """, (model, dimensions, *part)).fetchall())
+        return rows
+
+    def _evict(self) -> None:
+        """Delete least recently used entries beyond max_entries."""
+        excess = self._entries - self.max_entries
+        if excess > 0:
+            deleted = self.conn.execute("""
+                DELETE FROM embedding_cache WHERE rowid IN (
+                    SELECT rowid FROM embedding_cache ORDER BY last_used ASC LIMIT ?
+                )
+            """, (excess,)).rowcount
+            self._entries -= deleted
+
+    @staticmethod
+    def _serialize(vector: Union[Sequence[float], np.ndarray]) -> bytes:
+        """Pack a vector as little-endian float32."""
+        return np.asarray(vector, dtype="<f4").tobytes()
+
+    @staticmethod
+    def _deserialize(blob: bytes) -> np.ndarray:
+        """View a float32 blob as a read-only array without copying."""
+        return np.frombuffer(blob, dtype="<f4")
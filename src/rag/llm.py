@@ -0,0 +1,145 @@
+"""
+Factory for the Ollama chat LLM.
+
+Every entry point builds its LLM here so the generation options are the same
+everywhere: Ollama reloads a model when num_ctx changes, and unloads it after
+keep_alive expires, both of which cost seconds per question.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple, Union
+import requests
+from langchain_core.language_models import BaseLLM
+from langchain_ollama import OllamaLLM
+from src.config import (
+    OLLAMA_BASE_URL, OLLAMA_CHAT_MODEL, LLM_TEMPERATURE,
+    LLM_KEEP_ALIVE, LLM_NUM_CTX, LLM_NUM_PREDICT
+)
+from src.rag.llm_cache import CachedLLM, LLMResponseCache
+
+
+def create_llm(
+    model: str = OLLAMA_CHAT_MODEL,
+    temperature: float = LLM_TEMPERATURE,
+    keep_alive: Union[str, int] = LLM_KEEP_ALIVE,
+    num_ctx: Optional[int] = LLM_NUM_CTX,
+    num_predict: Optional[int] = LLM_NUM_PREDICT,
+    base_url: str = OLLAMA_BASE_URL,
+    cache: Optional[LLMResponseCache] = None
+) -> Union[OllamaLLM, CachedLLM]:
+    """
+    Create an OllamaLLM with the configured runtime options.
+
+    Args:
+        model: Ollama model name
+        temperature: Sampling temperature
+        keep_alive: How long Ollama keeps the model loaded after a call (e.g. "30m", -1 forever)
+        num_ctx: Context window in tokens (None = model default, not sent)
+        num_predict: Maximum tokens to generate (-1 = unlimited, None = model default, not sent)
+        base_url: Ollama server URL
+        cache: Optional response cache; when given the LLM is wrapped in CachedLLM
+
+    Returns:
+        Configured OllamaLLM, or a CachedLLM around it
+    """
+    options = {
+        name: value
+        for name, value in (("num_ctx", num_ctx), ("num_predict", num_predict))
+        if value is not None
+    }
+    llm = OllamaLLM(
+        base_url=base_url,
+        model=model,
+        temperature=temperature,
+        keep_alive=keep_alive,
+        **options
+    )
+    return CachedLLM(llm, cache) if cache is not None else llm
+
+
+def invoke_with_usage(llm, prompt: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Generate a response and the token counts reported by the model server.
+
+    LangChain LLMs are called through generate(), whose generation_info
+    carries Ollama's final response (prompt_eval_count, eval_count). Cache
+    hits and plain invoke()-only LLMs report no counts.
+
+    Returns:
+        Tuple of (response text, {"prompt_tokens": ..., "completion_tokens": ...})
+    """
+    if isinstance(llm, CachedLLM):
+        key, cached = llm.lookup(prompt)
+        if cached is not None:
+            return cached, {}
+        response, usage = invoke_with_usage(llm.llm, prompt)
+        llm.store(key, response)
+        return response, usage
+    if not isinstance(llm, BaseLLM):
+        return llm.invoke(prompt), {}
+
+    return _text_and_usage(llm.generate([prompt]))
+
+
+async def ainvoke_with_usage(llm, prompt: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Async variant of invoke_with_usage().
+
+    LangChain LLMs are called through agenerate(); other LLMs through
+    ainvoke() when they have it, otherwise invoke() in a worker thread.
+    """
+    if isinstance(llm, CachedLLM):
+        key, cached = llm.lookup(prompt)
+        if cached is not None:
+            return cached, {}
+        response, usage = await ainvoke_with_usage(llm.llm, prompt)
+        llm.store(key, response)
+        return response, usage
+    if isinstance(llm, BaseLLM):
+        return _text_and_usage(await llm.agenerate([prompt]))
+    if hasattr(llm, "ainvoke"):
+        return await llm.ainvoke(prompt), {}
+    return await asyncio.to_thread(llm.invoke, prompt), {}
+
+
+def _text_and_usage(result) -> Tuple[str, Dict[str, int]]:
+    """Text of the first generation and the token counts in its generation_info."""
+    generation = result.generations[0][0]
+    info = generation.generation_info or {}
+    usage = {
+        name: info[field]
+        for name, field in (("prompt_tokens", "prompt_eval_count"), ("completion_tokens", "eval_count"))
+        if info.get(field) is not None
+    }
+    return generation.text, usage
+
+
+def warm_up_llm(
+    model: str,
+    num_ctx: Optional[int] = LLM_NUM_CTX,
+    keep_alive: Union[str, int] = LLM_KEEP_ALIVE,
+    base_url: str = OLLAMA_BASE_URL,
+    timeout: float = 600.0
+) -> float:
+    """
+    Load a model into Ollama without generating anything.
+
+    Ollama answers a /api/generate request with an empty prompt once the
+    model is loaded, so the first real question does not pay the load time.
+    num_ctx must match the LLM's, or Ollama loads the model again on first use;
+    None sends no num_ctx, matching an LLM built without one.
+
+    Returns:
+        Seconds the load took
+
+    Raises:
+        requests.exceptions.RequestException: If Ollama is unreachable or returns an error
+    """
+    payload = {"model": model, "prompt": "", "keep_alive": keep_alive}
+    if num_ctx is not None:
+        payload["options"] = {"num_ctx": num_ctx}
+    start = time.perf_counter()
+    response = requests.post(f"{base_url}/api/generate", json=payload, timeout=timeout)
+    response.raise_for_status()
+    return time.perf_counter() - start
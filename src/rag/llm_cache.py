@@ -0,0 +1,225 @@
+"""
+Persistent cache of LLM responses for deterministic re-runs.
+
+Responses are stored in a SQLite file keyed by (model, temperature, generation
+options, sha256 of prompt), so re-running a questionnaire against the same
+corpus and model returns the earlier answers instead of regenerating them.
+CachedLLM wraps the llm passed to RAGSystem; calls above a temperature cutoff
+bypass the cache because their answers are meant to vary.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+from src.config import LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_MAX_TEMPERATURE
+
+# OllamaLLM fields that change the generated text (keep_alive, base_url etc. do not)
+_OPTION_FIELDS = (
+    "num_ctx", "num_predict", "top_k", "top_p", "seed", "stop", "format",
+    "repeat_penalty", "repeat_last_n", "mirostat", "mirostat_eta", "mirostat_tau", "tfs_z"
+)
+
+# (model, temperature, options, prompt_hash)
+CacheKey = Tuple[str, float, str, str]
+
+
+class LLMResponseCache:
+    """SQLite-backed LRU cache of LLM responses."""
+
+    def __init__(
+        self,
+        db_path: str = str(LLM_CACHE_PATH),
+        max_entries: int = LLM_CACHE_MAX_ENTRIES
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite cache file (":memory:" for tests)
+            max_entries: Maximum number of cached responses before LRU eviction
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Shared by worker threads and the event loop, so access is serialized
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_response_cache (
+                model TEXT NOT NULL,
+                temperature REAL NOT NULL,
+                options TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, temperature, options, prompt_hash)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_used
+            ON llm_response_cache(last_used)
+        """)
+        self.conn.commit()
+        # Running entry count, so puts do not scan the table to decide on eviction
+        self._entries = self.conn.execute("SELECT COUNT(*) FROM llm_response_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, temperature: float, options: Dict[str, Any], prompt: str) -> CacheKey:
+        """Build the cache key; options are serialized with sorted keys so order does not matter."""
+        return (
+            model,
+            float(temperature),
+            json.dumps(options, sort_keys=True),
+            hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        )
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT response FROM llm_response_cache
+                WHERE model = ? AND temperature = ? AND options = ? AND prompt_hash = ?
+            """, key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("""
+                UPDATE llm_response_cache SET last_used = ?
+                WHERE model = ? AND temperature = ? AND options = ? AND prompt_hash = ?
+            """, (time.time(), *key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key: CacheKey, response: str) -> None:
+        """Store a response and evict old entries if over capacity."""
+        with self._lock:
+            exists = self.conn.execute("""
+                SELECT 1 FROM llm_response_cache
+                WHERE model = ? AND temperature = ? AND options = ? AND prompt_hash = ?
+            """, key).fetchone() is not None
+            self.conn.execute("""
+                INSERT OR REPLACE INTO llm_response_cache
+                (model, temperature, options, prompt_hash, response, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (*key, response, time.time()))
+            if not exists:
+                self._entries += 1
+            self._evict()
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, hit rate and current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self)
+        }
+
+    def __len__(self) -> int:
+        """Return the number of cached responses."""
+        with self._lock:
+            return self._entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries beyond max_entries."""
+        excess = self._entries - self.max_entries
+        if excess > 0:
+            deleted = self.conn.execute("""
+                DELETE FROM llm_response_cache WHERE rowid IN (
+                    SELECT rowid FROM llm_response_cache ORDER BY last_used ASC LIMIT ?
+                )
+            """, (excess,)).rowcount
+            self._entries -= deleted
+
+
+class CachedLLM:
+    """Wraps an LLM so low-temperature responses are served from an LLMResponseCache."""
+
+    def __init__(
+        self,
+        llm,
+        cache: LLMResponseCache,
+        max_temperature: float = LLM_CACHE_MAX_TEMPERATURE
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            llm: LLM with invoke() (and optionally ainvoke()/stream()), e.g. OllamaLLM
+            cache: Response cache to read and write
+            max_temperature: Calls with a higher temperature bypass the cache
+        """
+        self.llm = llm
+        self.cache = cache
+        self.max_temperature = max_temperature
+
+    def __getattr__(self, name: str):
+        # Expose model, temperature, etc. of the wrapped LLM
+        return getattr(self.llm, name)
+
+    def cache_key(self, prompt: str) -> Optional[CacheKey]:
+        """Return the cache key for prompt, or None if this LLM bypasses the cache."""
+        temperature = getattr(self.llm, "temperature", None) or 0.0
+        if temperature > self.max_temperature:
+            return None
+        options = {name: getattr(self.llm, name, None) for name in _OPTION_FIELDS}
+        model = getattr(self.llm, "model", type(self.llm).__name__)
+        return LLMResponseCache.make_key(model, temperature, options, prompt)
+
+    def lookup(self, prompt: str) -> Tuple[Optional[CacheKey], Optional[str]]:
+        """Return the cache key for prompt (None if bypassed) and the cached response, if any."""
+        key = self.cache_key(prompt)
+        return key, self.cache.get(key) if key is not None else None
+
+    def store(self, key: Optional[CacheKey], response: str) -> None:
+        """Cache a response under a key from lookup(); bypassed keys are ignored."""
+        if key is not None:
+            self.cache.put(key, response)
+
+    def invoke(self, prompt: str) -> str:
+        """Return the cached response, or generate and cache it."""
+        key, cached = self.lookup(prompt)
+        if cached is not None:
+            return cached
+        response = self.llm.invoke(prompt)
+        self.store(key, response)
+        return response
+
+    async def ainvoke(self, prompt: str) -> str:
+        """Async variant of invoke()."""
+        key, cached = self.lookup(prompt)
+        if cached is not None:
+            return cached
+        if hasattr(self.llm, "ainvoke"):
+            response = await self.llm.ainvoke(prompt)
+        else:
+            response = await asyncio.to_thread(self.llm.invoke, prompt)
+        self.store(key, response)
+        return response
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """Yield the cached response whole, or stream from the LLM and cache the full text."""
+        key, cached = self.lookup(prompt)
+        if cached is not None:
+            yield cached
+            return
+        if not hasattr(self.llm, "stream"):
+            response = self.llm.invoke(prompt)
+            fragments = [response]
+            yield response
+        else:
+            fragments = []
+            for fragment in self.llm.stream(prompt):
+                fragments.append(fragment)
+                yield fragment
+        # Only a completed stream is cached; an abandoned one never reaches here
+        self.store(key, "".join(fragments))
@@ -4,18 +4,59 @@ RAGSystem module for answer generation.
 Uses retrieved chunks and LLM to generate answers with citations.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Union
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Union
+from src.config import EMBEDDING_MAX_CONCURRENCY, LLM_MAX_CONCURRENCY, SEARCH_MAX_CONCURRENCY
 from src.infrastructure.database.base import VectorDatabaseClient, SearchResult
-from src.domain.models import Citation, Question
+from src.domain.models import Citation, Question, StageTimings
+from src.rag.ingestion.embedder import EmbeddingClient
+from src.rag.context_packer import ContextPacker, PackedContext
+from src.rag.llm import ainvoke_with_usage, invoke_with_usage
 from src.rag.retriever import Retriever
 
 
+NO_ANSWER = "I cannot find this information in the documentation."
+
+# Static instructions that open every prompt. Keeping them byte-identical and
+# first lets Ollama reuse the cached KV prefix instead of re-prefilling them
+# for each question; everything question-specific comes after.
+PROMPT_PREFIX = f"""You are a compliance assistant. Answer the question using ONLY the provided context.
+If the answer cannot be found in the context, say "{NO_ANSWER}"
+
+Context:
+"""
+
+
 @dataclass
 class GeneratedAnswer:
     """Answer with citations."""
     answer: str
     citations: List[Citation]
+    context_tokens: Optional[int] = None  # prompt context size after packing
+    timings: Optional[StageTimings] = None
+
+
+@dataclass
+class PipelineLimits:
+    """
+    Per-stage concurrency bounds for the async answer pipeline.
+
+    Shared by all aanswer() calls of one batch, so retrieval for later
+    questions proceeds while earlier ones wait for the LLM.
+    """
+    embedding_concurrency: int = EMBEDDING_MAX_CONCURRENCY
+    llm_concurrency: int = LLM_MAX_CONCURRENCY
+    search_concurrency: int = SEARCH_MAX_CONCURRENCY
+    embedding: asyncio.Semaphore = field(init=False)
+    search: asyncio.Semaphore = field(init=False)
+    llm: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        self.embedding = asyncio.Semaphore(self.embedding_concurrency)
+        self.search = asyncio.Semaphore(self.search_concurrency)
+        self.llm = asyncio.Semaphore(self.llm_concurrency)
 
 
 class RAGSystem:
@@ -26,7 +67,10 @@ class RAGSystem:
         client: Optional[VectorDatabaseClient] = None,
         llm=None,
         top_k: int = 5,
-        similarity_threshold: float = 0.0
+        similarity_threshold: float = 0.0,
+        embedding_client: Optional[EmbeddingClient] = None,
+        retriever: Optional[Retriever] = None,
+        context_packer: Optional[ContextPacker] = None
     ):
         """
         Initialize the RAG system.
@@ -36,11 +80,17 @@ class RAGSystem:
             llm: LLM instance for answer generation
             top_k: Number of chunks to retrieve
             similarity_threshold: Minimum similarity score for retrieval
+            embedding_client: EmbeddingClient for query embeddings
+            retriever: Retriever to share between systems (e.g. to reuse its
+                query embedding cache). Created from client and embedding_client if not provided.
+            context_packer: Fits retrieved chunks into the prompt token budget.
+                Uses CONTEXT_TOKEN_BUDGET if not provided.
         """
-        self.retriever = Retriever(client=client)
+        self.retriever = retriever or Retriever(client=client, embedding_client=embedding_client)
         self.llm = llm
         self.top_k = top_k
         self.similarity_threshold = similarity_threshold
+        self.context_packer = context_packer or ContextPacker()
 
     def answer(self, question: Union[Question, str]) -> GeneratedAnswer:
         """
@@ -52,43 +102,139 @@ class RAGSystem:
         Returns:
             GeneratedAnswer with answer text and citations
         """
-        # Extract query text and optional section context
-        if isinstance(question, Question):
-            query = question.text
-            # Enhance query with section if available
-            if question.section:
-                query = f"{question.section}: {question.text}"
-        else:
-            # Legacy: accept plain string
-            query = question
-        
-        results = self.retriever.search(query, top_k=self.top_k, threshold=self.similarity_threshold)
+        timings = StageTimings()
+        query = self.build_query(question)
+        results = self.retriever.search(
+            query, top_k=self.top_k, threshold=self.similarity_threshold, timings=timings
+        )
 
         if not results:
-            return GeneratedAnswer(
-                answer="I cannot find this information in the documentation.",
-                citations=[]
-            )
+            return GeneratedAnswer(answer=NO_ANSWER, citations=[], timings=timings)
 
-        prompt = self._build_prompt(query, results)
-        response = self.llm.invoke(prompt)
-        citations = self._extract_citations(results)
+        start = time.perf_counter()
+        context = self.context_packer.pack(results)
+        if not context.results:
+            # Budget too small for any chunk: an empty context cannot ground an answer
+            return GeneratedAnswer(answer=NO_ANSWER, citations=[], context_tokens=0, timings=timings)
+        prompt = self._build_prompt(query, context)
+        timings.prompt_ms = _elapsed_ms(start)
 
-        return GeneratedAnswer(answer=response, citations=citations)
+        start = time.perf_counter()
+        response, usage = invoke_with_usage(self.llm, prompt)
+        timings.generation_ms = _elapsed_ms(start)
+        timings.prompt_tokens = usage.get("prompt_tokens")
+        timings.completion_tokens = usage.get("completion_tokens")
+        citations = self._extract_citations(context.results)
 
-    def _build_prompt(self, query: str, results: List[SearchResult]) -> str:
-        """Build the prompt with context from retrieved chunks."""
-        context_parts = []
-        for i, result in enumerate(results, 1):
-            context_parts.append(f"[{i}] {result.chunk.content}")
+        return GeneratedAnswer(
+            answer=response,
+            citations=citations,
+            context_tokens=context.tokens,
+            timings=timings
+        )
 
-        context = "\n\n".join(context_parts)
+    async def aanswer(
+        self,
+        question: Union[Question, str],
+        limits: Optional[PipelineLimits] = None
+    ) -> GeneratedAnswer:
+        """
+        Async variant of answer().
 
-        return f"""You are a compliance assistant. Answer the question using ONLY the provided context.
-If the answer cannot be found in the context, say "I cannot find this information in the documentation."
+        Uses llm.ainvoke() when available, otherwise runs llm.invoke() in a
+        worker thread, so other questions can retrieve while this one generates.
 
-Context:
-{context}
+        Args:
+            question: Question object (preferred) or query string (legacy)
+            limits: Stage semaphores shared across concurrent calls; a fresh,
+                unshared set is used if not provided
+        """
+        limits = limits or PipelineLimits()
+        timings = StageTimings()
+        query = self.build_query(question)
+        results = await self.retriever.asearch(
+            query,
+            top_k=self.top_k,
+            threshold=self.similarity_threshold,
+            embedding_limit=limits.embedding,
+            search_limit=limits.search,
+            timings=timings
+        )
+
+        if not results:
+            return GeneratedAnswer(answer=NO_ANSWER, citations=[], timings=timings)
+
+        start = time.perf_counter()
+        context = self.context_packer.pack(results)
+        if not context.results:
+            return GeneratedAnswer(answer=NO_ANSWER, citations=[], context_tokens=0, timings=timings)
+        prompt = self._build_prompt(query, context)
+        timings.prompt_ms = _elapsed_ms(start)
+        async with limits.llm:
+            # Timed inside the semaphore so queueing for the LLM is not counted
+            start = time.perf_counter()
+            response, usage = await ainvoke_with_usage(self.llm, prompt)
+            timings.generation_ms = _elapsed_ms(start)
+        timings.prompt_tokens = usage.get("prompt_tokens")
+        timings.completion_tokens = usage.get("completion_tokens")
+
+        return GeneratedAnswer(
+            answer=response,
+            citations=self._extract_citations(context.results),
+            context_tokens=context.tokens,
+            timings=timings
+        )
+
+    async def aclose(self) -> None:
+        """Release async resources of aanswer(); await before the event loop ends."""
+        await self.retriever.aclose()
+
+    def answer_stream(self, question: Union[Question, str]) -> Iterator[Union[List[Citation], str]]:
+        """
+        Generate an answer incrementally.
+
+        Yields the list of citations first, as soon as retrieval is done,
+        then answer text fragments as the LLM produces them. LLMs without a
+        stream() method yield the whole answer as a single fragment.
+
+        Args:
+            question: Question object (preferred) or query string (legacy)
+        """
+        query = self.build_query(question)
+        results = self.retriever.search(query, top_k=self.top_k, threshold=self.similarity_threshold)
+
+        if not results:
+            yield []
+            yield NO_ANSWER
+            return
+
+        context = self.context_packer.pack(results)
+        if not context.results:
+            yield []
+            yield NO_ANSWER
+            return
+
+        yield self._extract_citations(context.results)
+        prompt = self._build_prompt(query, context)
+        if hasattr(self.llm, "stream"):
+            yield from self.llm.stream(prompt)
+        else:
+            yield self.llm.invoke(prompt)
+
+    @staticmethod
+    def build_query(question: Union[Question, str]) -> str:
+        """Return the retrieval query text, prefixed with the section if the question has one."""
+        if isinstance(question, Question):
+            # Enhance query with section if available
+            if question.section:
+                return f"{question.section}: {question.text}"
+            return question.text
+        # Legacy: accept plain string
+        return question
+
+    def _build_prompt(self, query: str, context: PackedContext) -> str:
+        """Build the prompt: the static PROMPT_PREFIX followed by context and question."""
+        return f"""{PROMPT_PREFIX}{context.text}
 
 Question: {query}
 
@@ -103,3 +249,8 @@ Answer:"""
             )
             for result in results
         ]
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000.0
@@ -0,0 +1,87 @@
+"""
+Reranking stages applied to retrieved chunks.
+
+Maximal marginal relevance (MMR) picks chunks that are relevant to the query
+but not redundant with chunks already picked, so overlapping neighbours from
+the chunker do not fill the prompt with the same text twice.
+"""
+
+from typing import List
+import numpy as np
+from src.infrastructure.database.base import SearchResult
+from src.rag.ingestion.embedder import Embedding
+
+
+def mmr_select(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    top_k: int,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Select candidate rows by maximal marginal relevance.
+
+    Each step picks the row maximizing
+    lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, selected)).
+    All similarities come from one mat-vec and one Gram matrix product;
+    each of the top_k steps is a single vectorized update.
+
+    Args:
+        query: (dims,) query vector
+        candidates: (n, dims) candidate vectors
+        top_k: Number of rows to select
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only
+
+    Returns:
+        Selected row indices in selection order
+    """
+    n = len(candidates)
+    k = min(top_k, n)
+    if k <= 0:
+        return []
+
+    vectors = _normalize(np.asarray(candidates, dtype=np.float32))
+    relevance = vectors @ _normalize(np.asarray(query, dtype=np.float32)[None, :])[0]
+    pairwise = vectors @ vectors.T
+
+    redundancy = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected = []
+    for _ in range(k):
+        # Before anything is selected the redundancy term is zero
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * penalty
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, pairwise[best])
+    return selected
+
+
+def mmr_rerank(
+    query_embedding: Embedding,
+    results: List[SearchResult],
+    top_k: int,
+    lambda_mult: float = 0.5
+) -> List[SearchResult]:
+    """
+    Rerank search results by maximal marginal relevance.
+
+    Results must carry their embeddings (search with include_embeddings=True).
+    Similarity scores are left as returned by the search.
+
+    Returns:
+        Up to top_k results in MMR selection order
+    """
+    if not results:
+        return []
+    candidates = np.stack([result.chunk.embedding.array for result in results])
+    return [results[i] for i in mmr_select(query_embedding.array, candidates, top_k, lambda_mult)]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length, leaving zero rows as they are."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,101 @@
+"""
+In-process cache of vector search results.
+
+A search for (query, top_k, threshold) is deterministic until the corpus
+changes, so entries are tagged with the database client's generation counter
+and ignored once it moves on. Results are sorted by similarity, which lets an
+entry fetched with a larger top_k and a lower threshold answer any narrower
+request by filtering and slicing.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+from src.infrastructure.database.base import SearchResult
+
+
+@dataclass
+class _Entry:
+    generation: int
+    top_k: int
+    threshold: float
+    results: List[SearchResult]
+
+    def covers(self, generation: int, top_k: int, threshold: float) -> bool:
+        """Whether this entry holds the complete answer for the request."""
+        return self.generation == generation and self.top_k >= top_k and self.threshold <= threshold
+
+
+class RetrievalCache:
+    """Bounded LRU of search results, one superset entry per key."""
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Keys kept before the least recently used is evicted (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        key: Hashable,
+        generation: Optional[int],
+        top_k: int,
+        threshold: float
+    ) -> Optional[List[SearchResult]]:
+        """
+        Return cached results for the request, or None on a miss.
+
+        Args:
+            key: Identifies the query (text, model, filters, ...)
+            generation: Current corpus generation; None bypasses the cache
+            top_k: Maximum number of results wanted
+            threshold: Minimum similarity wanted
+        """
+        if self.max_entries <= 0 or generation is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.covers(generation, top_k, threshold):
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return [r for r in entry.results if r.similarity >= threshold][:top_k]
+
+    def put(
+        self,
+        key: Hashable,
+        generation: Optional[int],
+        top_k: int,
+        threshold: float,
+        results: List[SearchResult]
+    ) -> None:
+        """Store results unless the existing entry for key already covers them."""
+        if self.max_entries <= 0 or generation is None:
+            return
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is None or not existing.covers(generation, top_k, threshold):
+                self._entries[key] = _Entry(generation, top_k, threshold, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_entries
+        }
@@ -1,32 +1,97 @@
 """
 Retriever module for similarity search.
 
-Finds relevant document chunks for a given query using vector similarity.
+Finds relevant document chunks for a given query using vector similarity,
+optionally fused with full-text (BM25) matches and diversified by MMR.
 """
 
-from typing import List, Optional
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from src.config import (
+    RETRIEVAL_MODE, RRF_K, MMR_LAMBDA, MMR_FETCH_K,
+    QUERY_EMBEDDING_CACHE_SIZE, RETRIEVAL_CACHE_SIZE
+)
 from src.infrastructure.database.factory import get_db_client
-from src.infrastructure.database.base import VectorDatabaseClient, SearchResult
-from src.rag.ingestion.embedder import generate_embedding
+from src.infrastructure.database.base import VectorDatabaseClient, ChunkFilter, SearchResult
+from src.domain.models import StageTimings
+from src.rag.ingestion.embedder import (
+    EMBEDDING_MODEL, Embedding, EmbeddingClient,
+    agenerate_embedding, generate_embedding, generate_embeddings, get_embedding_client
+)
+from src.rag.retrieval_cache import RetrievalCache
+from src.rag.reranking import mmr_rerank
 
 
 class Retriever:
     """Retrieves relevant document chunks using vector similarity search."""
 
-    def __init__(self, client: Optional[VectorDatabaseClient] = None):
+    MODES = ("vector", "hybrid")
+
+    def __init__(
+        self,
+        client: Optional[VectorDatabaseClient] = None,
+        embedding_client: Optional[EmbeddingClient] = None,
+        mode: str = RETRIEVAL_MODE,
+        rrf_k: int = RRF_K,
+        mmr_lambda: float = MMR_LAMBDA,
+        fetch_k: int = MMR_FETCH_K,
+        query_cache_size: int = QUERY_EMBEDDING_CACHE_SIZE,
+        result_cache_size: int = RETRIEVAL_CACHE_SIZE
+    ):
         """
         Initialize the retriever.
 
         Args:
             client: VectorDatabaseClient instance. Creates one from factory if not provided.
+            embedding_client: EmbeddingClient for query embeddings. Uses the
+                shared client behind generate_embedding if not provided.
+            mode: "vector" for embedding search, or "hybrid" to fuse it with
+                the client's full-text search by reciprocal-rank fusion
+                (requires client.supports_text_search)
+            rrf_k: Rank constant for reciprocal-rank fusion in hybrid mode
+            mmr_lambda: MMR relevance/diversity trade-off; 1.0 disables reranking
+            fetch_k: Candidates over-fetched for MMR before reducing to top_k
+            query_cache_size: Query embeddings kept in the in-process LRU (0 disables it)
+            result_cache_size: Queries whose vector search results are cached
+                until the client's generation changes (0 disables it)
         """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown retrieval mode '{mode}'. Expected one of {self.MODES}")
         self.client = client or get_db_client()
+        if mode == "hybrid" and not self.client.supports_text_search:
+            # Fail here rather than with NotImplementedError on the first query
+            raise ValueError(
+                f"Hybrid retrieval needs full-text search, which {type(self.client).__name__} "
+                f"does not support; use mode 'vector'"
+            )
+        self.embedding_client = embedding_client
+        self.mode = mode
+        self.rrf_k = rrf_k
+        self.mmr_lambda = mmr_lambda
+        self.fetch_k = fetch_k
+        # LRU of query embeddings keyed by (model, text); guarded by a lock
+        # because hybrid mode embeds on a worker thread
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[Tuple[str, str], Embedding]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.result_cache = RetrievalCache(result_cache_size)
+        # Hybrid mode embeds the query on this thread while the full-text query runs
+        self._embed_pool = ThreadPoolExecutor(max_workers=1) if mode == "hybrid" else None
 
     def search(
         self,
         query: str,
         top_k: int = 5,
-        threshold: float = 0.0
+        threshold: float = 0.0,
+        filters: Optional[ChunkFilter] = None,
+        timings: Optional[StageTimings] = None
     ) -> List[SearchResult]:
         """
         Search for chunks similar to the query text.
@@ -35,13 +100,389 @@ class Retriever:
             query: Natural language query
             top_k: Maximum number of results to return
             threshold: Minimum similarity score (0.0 to 1.0)
+            filters: Restrict results to a document and/or section
+            timings: If given, receives embedding_ms (query embedding requests)
+                and search_ms (the rest of the retrieval wall time)
+
+        Returns:
+            List of SearchResult objects, sorted by similarity descending.
+            In hybrid mode similarity holds the fused RRF score; with MMR
+            enabled results are in MMR selection order.
+        """
+        start = _start_timing(timings)
+        fetch_k = self._fetch_count(top_k)
+        if self.mode == "hybrid":
+            embedding, results = self._hybrid_search(query, fetch_k, threshold, filters, timings)
+        else:
+            embedding, results = None, self._cached_results(query, fetch_k, threshold, filters)
+            if results is None:
+                embedding = self._embed(query, timings)
+                results = self._vector_search([query], [embedding], fetch_k, threshold, filters)[0]
+        selected = self._select(query, results, top_k, embedding, timings)
+        _finish_timing(timings, start)
+        return selected
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        threshold: float = 0.0,
+        filters: Optional[ChunkFilter] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Search for several queries in one pass.
+
+        Queries missing from the result cache are embedded with one batched
+        request and searched with the client's batched search_by_embeddings.
+
+        Args:
+            queries: Natural language queries
+            top_k: Maximum number of results per query
+            threshold: Minimum similarity score (0.0 to 1.0)
+            filters: Restrict results to a document and/or section
+
+        Returns:
+            One list of SearchResult objects per query, in query order
+        """
+        if not queries:
+            return []
+        fetch_k = self._fetch_count(top_k)
+        hybrid = self.mode == "hybrid"
+        candidates = self._candidate_count(fetch_k) if hybrid else fetch_k
+
+        vector_hits = [self._cached_results(query, candidates, threshold, filters) for query in queries]
+        embeddings: List[Optional[Embedding]] = [None] * len(queries)
+        missing = [i for i, hits in enumerate(vector_hits) if hits is None]
+        if missing:
+            missing_queries = [queries[i] for i in missing]
+            fresh_embeddings = self._embed_many(missing_queries)
+            fresh_hits = self._vector_search(missing_queries, fresh_embeddings, candidates, threshold, filters)
+            for i, embedding, hits in zip(missing, fresh_embeddings, fresh_hits):
+                embeddings[i], vector_hits[i] = embedding, hits
+
+        if hybrid:
+            vector_hits = [
+                self._fuse(hits, self.client.search_by_text(
+                    query,
+                    top_k=candidates,
+                    filters=filters,
+                    include_embeddings=self.uses_mmr
+                ), fetch_k)
+                for query, hits in zip(queries, vector_hits)
+            ]
+        return [
+            self._select(query, hits, top_k, embedding)
+            for query, embedding, hits in zip(queries, embeddings, vector_hits)
+        ]
+
+    async def asearch(
+        self,
+        query: str,
+        top_k: int = 5,
+        threshold: float = 0.0,
+        filters: Optional[ChunkFilter] = None,
+        embedding_limit: Optional[asyncio.Semaphore] = None,
+        search_limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[StageTimings] = None
+    ) -> List[SearchResult]:
+        """
+        Async variant of search().
+
+        The query embedding is awaited (bounded by embedding_limit) and the
+        database queries run in worker threads (bounded by search_limit), so
+        the event loop keeps serving other questions meanwhile. SQLiteClient
+        opens its connection with check_same_thread=False and serializes
+        access with an RLock, so it can be queried from any thread.
+
+        Returns:
+            Same results as search() for the same arguments
+        """
+        start = _start_timing(timings)
+        fetch_k = self._fetch_count(top_k)
+        hybrid = self.mode == "hybrid"
+        candidates = self._candidate_count(fetch_k) if hybrid else fetch_k
+
+        results = self._cached_results(query, candidates, threshold, filters)
+        embedding = None
+        if results is None or self.uses_mmr:
+            embedding = await self._aembed(query, embedding_limit, timings)
+        async with search_limit or nullcontext():
+            if results is None:
+                results = (await asyncio.to_thread(
+                    self._vector_search, [query], [embedding], candidates, threshold, filters
+                ))[0]
+            if hybrid:
+                lexical = await asyncio.to_thread(
+                    self.client.search_by_text,
+                    query, top_k=candidates, filters=filters, include_embeddings=self.uses_mmr
+                )
+                results = self._fuse(results, lexical, fetch_k)
+        selected = self._select(query, results, top_k, embedding, timings)
+        _finish_timing(timings, start)
+        return selected
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client asearch() opened on the running event loop."""
+        await (self.embedding_client or get_embedding_client()).aclose()
+
+    @property
+    def caches_results(self) -> bool:
+        """Whether vector search results are cached (needs a client with a generation counter)."""
+        return self.result_cache.max_entries > 0 and self.client.generation is not None
+
+    @property
+    def uses_mmr(self) -> bool:
+        """Whether results are reranked by maximal marginal relevance."""
+        return self.mmr_lambda < 1.0
+
+    def _hybrid_search(
+        self,
+        query: str,
+        top_k: int,
+        threshold: float,
+        filters: Optional[ChunkFilter],
+        timings: Optional[StageTimings] = None
+    ) -> Tuple[Optional[Embedding], List[SearchResult]]:
+        """
+        Fuse full-text and vector results for one query.
+
+        On a result cache miss the query embedding (an HTTP round trip) is
+        computed in the background while the full-text query runs; the
+        threshold applies to vector hits only.
 
         Returns:
-            List of SearchResult objects, sorted by similarity descending
+            The query embedding (None if vector hits came from the cache) and
+            the fused top_k results
         """
-        embedding = generate_embedding(query)
-        return self.client.search_by_embedding(
-            query_embedding=embedding,
-            top_k=top_k,
-            threshold=threshold
+        candidates = self._candidate_count(top_k)
+        vector = self._cached_results(query, candidates, threshold, filters)
+        pending = None if vector is not None else self._embed_pool.submit(self._embed, query, timings)
+        lexical = self.client.search_by_text(
+            query, top_k=candidates, filters=filters, include_embeddings=self.uses_mmr
         )
+        embedding = None
+        if pending is not None:
+            embedding = pending.result()
+            vector = self._vector_search([query], [embedding], candidates, threshold, filters)[0]
+        return embedding, self._fuse(vector, lexical, top_k)
+
+    def _vector_search(
+        self,
+        queries: List[str],
+        embeddings: List[Embedding],
+        top_k: int,
+        threshold: float,
+        filters: Optional[ChunkFilter]
+    ) -> List[List[SearchResult]]:
+        """Run the client's vector search and store each result list in the result cache."""
+        generation = self.client.generation
+        if len(embeddings) == 1:
+            results = [self.client.search_by_embedding(
+                query_embedding=embeddings[0],
+                top_k=top_k,
+                threshold=threshold,
+                filters=filters,
+                include_embeddings=self.uses_mmr
+            )]
+        else:
+            results = self.client.search_by_embeddings(
+                query_embeddings=embeddings,
+                top_k=top_k,
+                threshold=threshold,
+                filters=filters,
+                include_embeddings=self.uses_mmr
+            )
+        for query, hits in zip(queries, results):
+            self.result_cache.put(self._result_key(query, filters), generation, top_k, threshold, hits)
+        return results
+
+    def _cached_results(
+        self,
+        query: str,
+        top_k: int,
+        threshold: float,
+        filters: Optional[ChunkFilter]
+    ) -> Optional[List[SearchResult]]:
+        """Vector hits for the request from the result cache, or None."""
+        return self.result_cache.get(self._result_key(query, filters), self.client.generation, top_k, threshold)
+
+    def _result_key(self, query: str, filters: Optional[ChunkFilter]) -> Hashable:
+        """Key result cache entries by everything except top_k and threshold."""
+        return (*self._cache_key(query), filters, self.uses_mmr)
+
+    def _fuse(
+        self,
+        vector: List[SearchResult],
+        lexical: List[SearchResult],
+        top_k: int
+    ) -> List[SearchResult]:
+        """Merge vector and full-text hits by reciprocal-rank fusion."""
+        return reciprocal_rank_fusion([vector, lexical], k=self.rrf_k)[:top_k]
+
+    def _select(
+        self,
+        query: str,
+        results: List[SearchResult],
+        top_k: int,
+        embedding: Optional[Embedding] = None,
+        timings: Optional[StageTimings] = None
+    ) -> List[SearchResult]:
+        """Reduce fetched results to top_k, by MMR when enabled."""
+        if self.uses_mmr:
+            if embedding is None:
+                embedding = self._embed(query, timings)
+            return mmr_rerank(embedding, results, top_k, self.mmr_lambda)
+        return results[:top_k]
+
+    def _fetch_count(self, top_k: int) -> int:
+        """Results fetched before final selection: the MMR pool, or just top_k."""
+        return max(top_k, self.fetch_k) if self.uses_mmr else top_k
+
+    @staticmethod
+    def _candidate_count(top_k: int) -> int:
+        """Results fetched from each source before fusion, so fused ranks have depth."""
+        return top_k * 2
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and size of the query embedding cache."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "size": len(self._query_cache),
+            "max_size": self.query_cache_size
+        }
+
+    def _embed(self, query: str, timings: Optional[StageTimings] = None) -> Embedding:
+        """Embed the query, serving repeats from the query cache."""
+        cached = self._cache_get(query)
+        if cached is not None:
+            return cached
+        start = time.perf_counter()
+        if self.embedding_client is not None:
+            embedding = self.embedding_client.embed(query)
+        else:
+            embedding = generate_embedding(query)
+        _add_embedding_time(timings, start)
+        self._cache_put(query, embedding)
+        return embedding
+
+    async def _aembed(
+        self,
+        query: str,
+        limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[StageTimings] = None
+    ) -> Embedding:
+        """Async _embed(); limit bounds concurrent embedding requests."""
+        cached = self._cache_get(query)
+        if cached is not None:
+            return cached
+        async with limit or nullcontext():
+            # Time the request itself, not the wait for a free slot
+            start = time.perf_counter()
+            if self.embedding_client is not None:
+                embedding = await self.embedding_client.aembed(query)
+            else:
+                embedding = await agenerate_embedding(query)
+            _add_embedding_time(timings, start)
+        self._cache_put(query, embedding)
+        return embedding
+
+    def _embed_many(self, queries: List[str]) -> List[Embedding]:
+        """Embed several queries, requesting only the ones not in the query cache."""
+        embeddings = [self._cache_get(query) for query in queries]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            texts = [queries[i] for i in missing]
+            if self.embedding_client is not None:
+                fresh = self.embedding_client.embed_many(texts)
+            else:
+                fresh = generate_embeddings(texts)
+            for i, embedding in zip(missing, fresh):
+                embeddings[i] = embedding
+                self._cache_put(queries[i], embedding)
+        return embeddings
+
+    def _cache_key(self, query: str) -> Tuple[str, str]:
+        """Key the query cache by embedding model as well as text."""
+        model = self.embedding_client.model if self.embedding_client is not None else EMBEDDING_MODEL
+        return (model, query)
+
+    def _cache_get(self, query: str) -> Optional[Embedding]:
+        """Return the cached embedding for query and count the hit or miss."""
+        if self.query_cache_size <= 0:
+            return None
+        key = self._cache_key(query)
+        with self._query_cache_lock:
+            embedding = self._query_cache.get(key)
+            if embedding is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+                self._query_cache.move_to_end(key)
+            return embedding
+
+    def _cache_put(self, query: str, embedding: Embedding) -> None:
+        """Store an embedding, evicting the least recently used entry when full."""
+        if self.query_cache_size <= 0:
+            return
+        key = self._cache_key(query)
+        with self._query_cache_lock:
+            self._query_cache[key] = embedding
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000.0
+
+
+def _start_timing(timings: Optional[StageTimings]) -> float:
+    """Reset the retrieval stages of timings and return the start time."""
+    if timings is not None:
+        timings.embedding_ms = 0.0
+        timings.search_ms = None
+    return time.perf_counter()
+
+
+def _add_embedding_time(timings: Optional[StageTimings], start: float) -> None:
+    """Add an embedding request's duration to timings.embedding_ms."""
+    if timings is not None:
+        timings.embedding_ms = (timings.embedding_ms or 0.0) + _elapsed_ms(start)
+
+
+def _finish_timing(timings: Optional[StageTimings], start: float) -> None:
+    """
+    Set search_ms to the retrieval wall time not spent embedding.
+
+    In hybrid mode the embedding overlaps the full-text query, so the two
+    stages can add up to less than their separate durations.
+    """
+    if timings is not None:
+        timings.search_ms = max(0.0, _elapsed_ms(start) - timings.embedding_ms)
+
+
+def reciprocal_rank_fusion(result_lists: List[List[SearchResult]], k: int = RRF_K) -> List[SearchResult]:
+    """
+    Merge ranked result lists by reciprocal-rank fusion.
+
+    Each chunk scores sum(1 / (k + rank)) over the lists it appears in (rank
+    starting at 1), so the raw scores of different retrievers never need to be
+    comparable. Ties keep the order of first appearance.
+
+    Returns:
+        SearchResult objects sorted by fused score descending, with similarity
+        set to that score
+    """
+    scores: Dict[Tuple[str, str, int], float] = {}
+    chunks = {}
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            key = (result.chunk.key.document_id, result.chunk.key.chunk_id, result.chunk.key.revision)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            chunks.setdefault(key, result.chunk)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [SearchResult(chunk=chunks[key], similarity=scores[key]) for key in ranked]
@@ -33,6 +33,54 @@ class TestOrchestrator:
         assert len(result.citations) == 1
         assert result.citations[0].key.document_id == "security-doc"
 
+    def test_answer_stream_yields_citations_then_tokens(
+        self, vector_db, mock_llm, mock_embeddings
+    ):
+        """Stream citations before any answer text, then the answer in fragments."""
+        # Given
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("security-doc", "auth-section", 1),
+            status="active",
+            content="finanso supports OAuth 2.0 and SAML authentication methods.",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        orchestrator = Orchestrator(client=vector_db, llm=mock_llm)
+
+        # When
+        stream = orchestrator.answer_stream("What authentication methods does finanso support?")
+        citations = next(stream)
+        prompt_before_tokens = mock_llm.last_prompt
+        fragments = list(stream)
+
+        # Then
+        assert [c.key.document_id for c in citations] == ["security-doc"]
+        assert prompt_before_tokens is None  # generation starts only once citations are consumed
+        assert len(fragments) > 1
+        assert "".join(fragments) == "This is a mock answer."
+
+    def test_answer_stream_falls_back_to_invoke(
+        self, vector_db, mock_embeddings
+    ):
+        """LLMs without stream() yield the whole answer at once; empty retrieval skips the LLM."""
+        # Given
+        class InvokeOnlyLLM:
+            def invoke(self, prompt):
+                return "Full answer."
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", "chunk", 1),
+            status="active",
+            content="Some content",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        orchestrator = Orchestrator(client=vector_db, llm=InvokeOnlyLLM())
+        empty = Orchestrator(client=vector_db, llm=InvokeOnlyLLM(), similarity_threshold=1.1)
+
+        # When / Then
+        assert list(orchestrator.answer_stream("question"))[1:] == ["Full answer."]
+        assert list(empty.answer_stream("question")) == [[], "I cannot find this information in the documentation."]
+
     def test_handle_empty_retrieval_results(
         self, vector_db, mock_llm, mock_embeddings
     ):
@@ -102,3 +150,125 @@ class TestOrchestrator:
     def test_state_flows_through_langgraph_nodes(self):
         """Verify state contains retrieved chunks before generation."""
         pass
+
+
+class TestAsyncOrchestrator:
+    """Tests for the pipelined async questionnaire path."""
+
+    def test_aprocess_questionnaire_overlaps_retrieval_with_generation(
+        self, vector_db, mock_embeddings
+    ):
+        """Retrieve later questions while earlier ones generate, keeping answer order."""
+        import asyncio
+        # Given
+        events = []
+
+        class SlowAsyncLLM:
+            active = 0
+            peak = 0
+
+            async def ainvoke(self, prompt):
+                SlowAsyncLLM.active += 1
+                SlowAsyncLLM.peak = max(SlowAsyncLLM.peak, SlowAsyncLLM.active)
+                events.append("llm_start")
+                await asyncio.sleep(0.01)
+                events.append("llm_end")
+                SlowAsyncLLM.active -= 1
+                return prompt.rsplit("Question: ", 1)[1].split("\n")[0]
+
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", "chunk", 1),
+            status="active",
+            content="Some content",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        orchestrator = Orchestrator(client=vector_db, llm=SlowAsyncLLM())
+        retriever = orchestrator.rag_system.retriever
+        original_asearch = retriever.asearch
+
+        async def recording_asearch(query, **kwargs):
+            results = await original_asearch(query, **kwargs)
+            events.append("search")
+            return results
+        retriever.asearch = recording_asearch
+        questions = ["Q1?", "Q2?", "Q3?"]
+
+        # When
+        answers = asyncio.run(orchestrator.aprocess_questionnaire(questions, llm_concurrency=1))
+
+        # Then
+        assert [a.answer for a in answers] == questions
+        assert SlowAsyncLLM.peak == 1
+        assert events.count("search") == 3
+        assert max(i for i, e in enumerate(events) if e == "search") < events.index("llm_end")
+
+    def test_aanswer_runs_sync_llm_in_thread(self, vector_db, mock_llm, mock_embeddings):
+        """LLMs without ainvoke() are called through a worker thread."""
+        import asyncio
+        # Given
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", "chunk", 1),
+            status="active",
+            content="Some content",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        orchestrator = Orchestrator(client=vector_db, llm=mock_llm)
+
+        # When
+        result = asyncio.run(orchestrator.rag_system.aanswer("What is MFA?"))
+
+        # Then
+        assert result.answer == "This is a mock answer."
+        assert [c.key.chunk_id for c in result.citations] == ["chunk"]
+
+    def test_aanswer_searches_database_off_event_loop(self, vector_db, mock_llm, mock_embeddings):
+        """Database queries run in a worker thread, not on the event loop thread."""
+        import asyncio
+        import threading
+        # Given
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", "chunk", 1),
+            status="active",
+            content="Some content",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        orchestrator = Orchestrator(client=vector_db, llm=mock_llm)
+        retriever = orchestrator.rag_system.retriever
+        original_search = retriever._vector_search
+        search_threads = []
+
+        def recording_search(*args, **kwargs):
+            search_threads.append(threading.get_ident())
+            return original_search(*args, **kwargs)
+        retriever._vector_search = recording_search
+
+        # When
+        result = asyncio.run(orchestrator.rag_system.aanswer("What is MFA?"))
+
+        # Then
+        assert [c.key.chunk_id for c in result.citations] == ["chunk"]
+        assert search_threads and threading.get_ident() not in search_threads
+
+    def test_aprocess_questionnaire_closes_async_embedding_client(self, vector_db, mock_llm, mock_embeddings):
+        """The loop-bound embedding HTTP client is closed before the event loop ends."""
+        import asyncio
+        from src.rag.ingestion.embedder import EmbeddingClient
+        # Given
+        embedding_client = EmbeddingClient()
+        orchestrator = Orchestrator(client=vector_db, llm=mock_llm)
+        orchestrator.rag_system.retriever.embedding_client = embedding_client
+
+        async def run():
+            http_client, _ = embedding_client._async_resources()
+            await orchestrator.aprocess_questionnaire([])
+            return http_client
+
+        # When
+        http_client = asyncio.run(run())
+
+        # Then
+        assert http_client.is_closed
+        assert embedding_client._async_client is None
@@ -127,4 +127,85 @@ class TestQuestionnaireRunner:
         for ans in answers:
             assert isinstance(ans, AnswerFailure)
             assert ans.error_message == "LLM failure"
-            assert ans.question_id in ["test-q:Q1", "test-q:Q2"]
\ No newline at end of file
+            assert ans.question_id in ["test-q:Q1", "test-q:Q2"]
+
+    def test_concurrent_mode_saves_answers_and_failures(self, mock_rag_system, questionnaire_store, run_store, run_config):
+        """Answer questions on a worker pool with the same results as sequential mode."""
+        # Given
+        runner = QuestionnaireRunner(
+            rag_system=mock_rag_system,
+            questionnaire_store=questionnaire_store,
+            run_store=run_store,
+            max_workers=2,
+            commit_batch_size=1
+        )
+
+        def answer(question):
+            if question.question_id == "Q2":
+                raise RuntimeError("LLM failure")
+            return GeneratedAnswer(answer=f"Answer to {question.text}", citations=[])
+
+        mock_rag_system.answer.side_effect = answer
+
+        # When
+        runner.run_questionnaire(questionnaire_id="test-q", run=run_config)
+
+        # Then
+        answers = {a.question_id: a for a in run_store.get_answers_for_run(run_config.id)}
+        assert isinstance(answers["test-q:Q1"], AnswerSuccess)
+        assert answers["test-q:Q1"].answer_text == "Answer to What is your security policy?"
+        assert isinstance(answers["test-q:Q2"], AnswerFailure)
+        assert answers["test-q:Q2"].error_message == "LLM failure"
+
+    def test_concurrent_workers_share_sqlite_client(
+        self, mock_embeddings, mock_llm, db_client, questionnaire_store, run_store, run_config
+    ):
+        """Run real retrieval against one SQLite connection from several worker threads."""
+        # Given
+        from src.rag.rag_system import RAGSystem
+        from src.infrastructure.database.base import ChunkRecord
+        from src.rag.ingestion.embedder import Embedding
+        db_client.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc1", chunk_id="c1", revision=1),
+            status="active",
+            content="We encrypt data with AES-256.",
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+        runner = QuestionnaireRunner(
+            rag_system=RAGSystem(client=db_client, llm=mock_llm),
+            questionnaire_store=questionnaire_store,
+            run_store=run_store,
+            max_workers=4
+        )
+
+        # When
+        runner.run_questionnaire(questionnaire_id="test-q", run=run_config)
+
+        # Then
+        answers = run_store.get_answers_for_run(run_config.id)
+        assert len(answers) == 2
+        assert all(isinstance(a, AnswerSuccess) and len(a.citations) == 1 for a in answers)
+
+    def test_resume_skips_answered_questions(self, mock_rag_system, questionnaire_store, run_store, run_config):
+        """Reopen an existing run and answer only the questions without a successful answer."""
+        # Given: Q1 answered, Q2 failed in an interrupted run
+        runner = QuestionnaireRunner(
+            rag_system=mock_rag_system,
+            questionnaire_store=questionnaire_store,
+            run_store=run_store
+        )
+        mock_rag_system.answer.side_effect = [
+            GeneratedAnswer(answer="First answer.", citations=[]),
+            RuntimeError("Ollama went away"),
+        ]
+        runner.run_questionnaire(questionnaire_id="test-q", run=run_config)
+
+        # When
+        mock_rag_system.answer.side_effect = [GeneratedAnswer(answer="Retried answer.", citations=[])]
+        runner.run_questionnaire(questionnaire_id="test-q", run=run_config, resume=True)
+
+        # Then
+        answers = {a.question_id: a for a in run_store.get_answers_for_run(run_config.id)}
+        assert answers["test-q:Q1"].answer_text == "First answer."
+        assert answers["test-q:Q2"].answer_text == "Retried answer."
+        assert mock_rag_system.answer.call_count == 3
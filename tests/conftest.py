@@ -8,7 +8,7 @@ from src.infrastructure.database.supabase_client import ChunkKey, ChunkRecord
 
 
 from src.infrastructure.database.sqlite_client import SQLiteClient
-from tests.mocks import MockLLM, fake_generate_embedding, fake_generate_embeddings
+from tests.mocks import MockLLM, fake_agenerate_embedding, fake_generate_embedding, fake_generate_embeddings
 
 
 def pytest_addoption(parser):
@@ -29,6 +29,12 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(skip_slow)
 
 
+@pytest.fixture(autouse=True)
+def disable_embedding_cache(monkeypatch):
+    """Keep the persistent on-disk embedding cache out of the test run."""
+    monkeypatch.setattr("src.rag.ingestion.embedder.EMBEDDING_CACHE_ENABLED", False)
+
+
 @pytest.fixture
 def vector_db():
     """Provide an in-memory SQLiteClient for fast tests."""
@@ -60,6 +66,14 @@ def mock_embeddings(monkeypatch):
         "src.rag.retriever.generate_embedding",
         fake_generate_embedding
     )
+    monkeypatch.setattr(
+        "src.rag.retriever.generate_embeddings",
+        fake_generate_embeddings
+    )
+    monkeypatch.setattr(
+        "src.rag.retriever.agenerate_embedding",
+        fake_agenerate_embedding
+    )
 
 
 @pytest.fixture
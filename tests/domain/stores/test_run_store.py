@@ -2,7 +2,7 @@
 
 import pytest
 
-from src.domain.models import Questionnaire, Question, Run, RunConfig, AnswerSuccess, RetrievedChunk, Citation, ChunkKey
+from src.domain.models import Questionnaire, Question, Run, RunConfig, AnswerSuccess, RetrievedChunk, Citation, ChunkKey, StageTimings
 from src.domain.stores.run_store import RunStore
 from src.domain.stores.questionnaire_store import QuestionnaireStore
 from src.infrastructure.database.sqlite_client import SQLiteClient
@@ -192,6 +192,28 @@ class TestRunStore:
         assert retrieved.run_id == "run-001"
         assert retrieved.question_id == "ikea:Q1.1"
 
+    def test_save_answer_with_stage_timings(self, store, setup_questions):
+        """Save an answer's stage timings and read them back per run."""
+        # Given
+        store.save_run(SAMPLE_RUN)
+        timings = StageTimings(
+            embedding_ms=12.5, search_ms=3.0, prompt_ms=0.4, generation_ms=2100.0,
+            prompt_tokens=640, completion_tokens=85
+        )
+        answer = AnswerSuccess(
+            id="answer-timed", run_id="run-001", question_id="ikea:Q1.2",
+            answer_text="Yes.", timings=timings
+        )
+
+        # When
+        store.save_answer(answer)
+        retrieved = store.get_answer("answer-timed")
+        by_question = store.get_timings_for_run("run-001")
+
+        # Then
+        assert retrieved.timings == timings
+        assert by_question == {"ikea:Q1.2": timings}
+
     def test_list_runs_by_status(self, store):
         """List runs filtered by status."""
         # Given
@@ -1,29 +1,25 @@
 """Tests for domain models factory methods."""
 
 import pytest
-from unittest.mock import Mock
-from src.domain.models import AnswerSuccess, AnswerFailure, Question, Citation, ChunkKey
+from src.domain.models import AnswerSuccess, AnswerFailure, Question, Citation, ChunkKey, StageTimings
+from src.rag.rag_system import GeneratedAnswer
 
 class TestDomainFactories:
     """Test suite for domain model factory methods."""
 
     def test_answer_success_factory(self):
-        """Test creating AnswerSuccess from mocked GeneratedAnswer."""
+        """Test creating AnswerSuccess from a GeneratedAnswer."""
         # Given
         question = Question(id="q1", questionnaire_id="qid", question_id="Q1", text="?")
-        
-        mock_citation = Mock()
-        mock_citation.key.document_id = "doc1"
-        mock_citation.key.chunk_id = "chk1"
-        mock_citation.key.revision = 1
-        mock_citation.content_snippet = "snippet"
-        
-        mock_generated = Mock()
-        mock_generated.answer = "Success"
-        mock_generated.citations = [mock_citation]
+        generated = GeneratedAnswer(
+            answer="Success",
+            citations=[Citation(key=ChunkKey("doc1", "chk1", 1), content_snippet="snippet")],
+            context_tokens=42,
+            timings=StageTimings(generation_ms=1234.6)
+        )
 
         # When
-        answer = AnswerSuccess.from_GeneratedAnswer("run1", question, mock_generated)
+        answer = AnswerSuccess.from_GeneratedAnswer("run1", question, generated)
 
         # Then
         assert isinstance(answer, AnswerSuccess)
@@ -32,6 +28,9 @@ class TestDomainFactories:
         assert len(answer.citations) == 1
         assert answer.citations[0].key.document_id == "doc1"
         assert answer.citations[0].content_snippet == "snippet"
+        assert answer.context_tokens == 42
+        assert answer.generation_time_ms == 1235
+        assert answer.timings is generated.timings
 
     def test_answer_failure_factory(self):
         """Test creating AnswerFailure from exception."""
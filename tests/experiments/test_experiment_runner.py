@@ -379,3 +379,100 @@ class TestExperimentRunner:
         assert result["run_id"] is not None
         assert result["questions_answered"] == 3
         assert result["success"] is True
+
+    def test_resume_skips_trials_with_saved_report(
+        self, db_client, questionnaire_store, run_store,
+        evaluation_store, ground_truth_run, mock_embeddings, mock_rag_system, mock_llm
+    ):
+        """Resume returns the saved result of an evaluated trial without re-running it."""
+        # Given: trial 1 of config-A already evaluated
+        from src.application.evaluation.evaluator import EvaluationReport, QuestionResult
+        config = RunConfig(
+            id="config-A",
+            name="Config A",
+            llm_model="llama3.2",
+            llm_temperature=0.5,
+            retrieval_top_k=5,
+            similarity_threshold=0.0,
+            chunk_size=800,
+            chunk_overlap=100,
+            embedding_model="mxbai-embed-large",
+            embedding_dimensions=1024,
+        )
+        trial_config = RunConfig(**{**config.__dict__, "id": "config-A-trial1", "name": "Config A - Trial 1"})
+        run_store.save_run(Run(id="run-config-A-trial1-old", config=trial_config))
+        evaluation_store.save_report(EvaluationReport(
+            run_id="run-config-A-trial1-old",
+            gt_run_id="gt-run",
+            results={"exp-q:Q1": QuestionResult(question_id="exp-q:Q1", answer_relevancy=0.9)},
+            overall_metrics={"mean_answer_relevancy": 0.9}
+        ))
+        runner = ExperimentRunner(
+            db_client=db_client,
+            questionnaire_store=questionnaire_store,
+            run_store=run_store,
+            evaluation_store=evaluation_store,
+            rag_system=mock_rag_system
+        )
+
+        # When
+        results = runner.run_experiments(
+            questionnaire_id="exp-q",
+            ground_truth_run_id="gt-run",
+            configs=[config],
+            trials_per_config=1,
+            resume=True
+        )
+
+        # Then
+        trial = results["config-A"]["trials"][0]
+        assert trial["run_id"] == "run-config-A-trial1-old"
+        assert trial["mean_answer_relevancy"] == 0.9
+        mock_llm.invoke.assert_not_called()
+
+    def test_prefetch_serves_every_config_from_one_search(
+        self, db_client, questionnaire_store, run_store,
+        evaluation_store, mock_embeddings, mock_llm
+    ):
+        """Prefetched retrieval at the widest settings answers narrower configs without searching again."""
+        # Given
+        from src.infrastructure.database.sqlite_client import ChunkRecord
+        from src.rag.ingestion.embedder import Embedding
+        from src.rag.rag_system import RAGSystem
+        for i in range(4):
+            db_client.insert_chunk(ChunkRecord(
+                key=ChunkKey("test-doc", f"chunk{i}", 1),
+                status="active",
+                content=f"Test content {i}",
+                embedding=Embedding(vector=[0.1] * 1024)
+            ))
+        runner = ExperimentRunner(
+            db_client=db_client,
+            questionnaire_store=questionnaire_store,
+            run_store=run_store,
+            evaluation_store=evaluation_store
+        )
+        base = dict(
+            llm_model="llama3.2", llm_temperature=0.5, chunk_size=800, chunk_overlap=100,
+            embedding_model="mxbai-embed-large", embedding_dimensions=1024
+        )
+        configs = [
+            RunConfig(id="wide", name="Wide", retrieval_top_k=4, similarity_threshold=0.0, **base),
+            RunConfig(id="narrow", name="Narrow", retrieval_top_k=2, similarity_threshold=0.5, **base),
+        ]
+        questions = questionnaire_store.get_questions("exp-q")
+        runner.prefetch_retrieval(questions, configs)
+        db_client.search_by_embeddings = MagicMock(wraps=db_client.search_by_embeddings)
+
+        # When
+        answers = [
+            RAGSystem(llm=mock_llm, top_k=config.retrieval_top_k,
+                      similarity_threshold=config.similarity_threshold,
+                      retriever=runner.retriever).answer(question)
+            for config in configs
+            for question in questions
+        ]
+
+        # Then
+        db_client.search_by_embeddings.assert_not_called()
+        assert [len(a.citations) for a in answers] == [4, 4, 4, 2, 2, 2]
@@ -0,0 +1,52 @@
+"""Tests for model-affinity scheduling of experiment trials."""
+
+from src.domain.models import RunConfig
+from src.experiments.scheduler import count_model_loads, declaration_order, schedule_trials
+
+
+def _config(id: str, model: str) -> RunConfig:
+    return RunConfig(
+        id=id, name=id, llm_model=model, llm_temperature=0.5, retrieval_top_k=5,
+        similarity_threshold=0.0, chunk_size=800, chunk_overlap=100,
+        embedding_model="mxbai-embed-large", embedding_dimensions=1024
+    )
+
+
+CONFIGS = [
+    _config("a", "llama3.2"),
+    _config("b", "mistral"),
+    _config("c", "llama3.2"),
+    _config("d", "mistral"),
+]
+
+
+def test_trials_are_grouped_by_model_in_first_appearance_order():
+    """Trials of the same model run back to back, keeping declaration order within a group."""
+    # When
+    schedule = schedule_trials(CONFIGS, trials_per_config=2)
+
+    # Then
+    assert [(t.config.id, t.trial_index) for t in schedule] == [
+        ("a", 0), ("a", 1), ("c", 0), ("c", 1),
+        ("b", 0), ("b", 1), ("d", 0), ("d", 1),
+    ]
+
+
+def test_schedule_loads_each_model_once():
+    """Interleaved models load on every switch in declaration order, once each when scheduled."""
+    # When
+    declared = count_model_loads(declaration_order(CONFIGS, trials_per_config=2))
+    scheduled = count_model_loads(schedule_trials(CONFIGS, trials_per_config=2))
+
+    # Then
+    assert declared == 4
+    assert scheduled == 2
+
+
+def test_single_model_keeps_declaration_order():
+    """A sweep over one model runs exactly as declared."""
+    # Given
+    configs = [_config("x", "llama3.2"), _config("y", "llama3.2")]
+
+    # When/Then
+    assert schedule_trials(configs, 3) == declaration_order(configs, 3)
@@ -187,4 +187,40 @@ class VectorDatabaseContract:
             assert results[0].similarity > 0.9
         finally:
             for r in records:
-                client.delete_chunk(r.key)
\ No newline at end of file
+                client.delete_chunk(r.key)
+
+    def test_batched_vector_search(self, client):
+        """Test that search_by_embeddings returns one result list per query, in order."""
+        vec_a = [0.0] * 1024; vec_a[0] = 1.0
+        vec_b = [0.0] * 1024; vec_b[1] = 1.0
+
+        records = [
+            ChunkRecord(
+                key=ChunkKey("batch-doc", "c1", 1),
+                status="active",
+                content="Batch A",
+                embedding=Embedding(vec_a)
+            ),
+            ChunkRecord(
+                key=ChunkKey("batch-doc", "c2", 1),
+                status="active",
+                content="Batch B",
+                embedding=Embedding(vec_b)
+            )
+        ]
+
+        for r in records:
+            client.delete_chunk(r.key)
+
+        try:
+            client.batch_insert_chunks(records)
+
+            results = client.search_by_embeddings(
+                [Embedding(vec_b), Embedding(vec_a)], top_k=1, threshold=0.9
+            )
+
+            assert [[r.chunk.content for r in hits] for hits in results] == [["Batch B"], ["Batch A"]]
+            assert client.search_by_embeddings([]) == []
+        finally:
+            for r in records:
+                client.delete_chunk(r.key)
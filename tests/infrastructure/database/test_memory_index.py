@@ -0,0 +1,146 @@
+"""
+Tests for InMemoryVectorIndex using the VectorDatabaseContract.
+"""
+
+import pytest
+from src.infrastructure.database.base import ChunkFilter, ChunkKey, ChunkRecord
+from src.infrastructure.database.memory_index import InMemoryVectorIndex
+from src.infrastructure.database.sqlite_client import SQLiteClient
+from src.rag.ingestion.embedder import Embedding
+from .contract_vector_db import VectorDatabaseContract
+
+
+def _unit(*axes) -> list:
+    """Return a 1024-d vector with 1.0 on the given axes."""
+    vec = [0.0] * 1024
+    for axis in axes:
+        vec[axis] = 1.0
+    return vec
+
+
+def _chunk(chunk_id: str, vec: list, revision: int = 1, document_id: str = "doc", metadata=None) -> ChunkRecord:
+    return ChunkRecord(
+        key=ChunkKey(document_id, chunk_id, revision),
+        status="active",
+        content=f"Content {chunk_id} r{revision}",
+        embedding=Embedding(vector=vec),
+        metadata=metadata
+    )
+
+
+class TestInMemoryVectorIndex(VectorDatabaseContract):
+    """
+    Runs the standard contract tests against InMemoryVectorIndex.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_mocks(self, mock_embeddings):
+        """Automatically mock embeddings for all tests in this class."""
+        pass
+
+    @pytest.fixture(scope="module")
+    def client(self):
+        """Fixture that wraps an in-memory SQLite DB."""
+        index = InMemoryVectorIndex(SQLiteClient(db_path=":memory:"))
+        yield index
+        index.conn.close()
+
+
+@pytest.fixture
+def index():
+    return InMemoryVectorIndex(SQLiteClient(db_path=":memory:"))
+
+
+def test_search_matches_sqlite_ranking(index):
+    """The index returns the same chunks and cosine scores as the SQLite KNN path."""
+    # Given
+    index.batch_insert_chunks([
+        _chunk("a", _unit(0)),
+        _chunk("b", _unit(0, 1)),
+        _chunk("c", _unit(1)),
+    ])
+    query = Embedding(vector=_unit(0))
+
+    # When
+    from_memory = index.search_by_embedding(query, top_k=3, threshold=0.1)
+    from_sqlite = index.client.search_by_embedding(query, top_k=3, threshold=0.1)
+
+    # Then
+    assert [r.chunk.key.chunk_id for r in from_memory] == ["a", "b"]
+    assert [r.chunk.key.chunk_id for r in from_sqlite] == ["a", "b"]
+    for mem, sql in zip(from_memory, from_sqlite):
+        assert mem.similarity == pytest.approx(sql.similarity, abs=1e-5)
+
+
+def test_reloads_after_writes(index):
+    """Inserts and deletes bump the generation and are visible to the next search."""
+    # Given
+    index.insert_chunk(_chunk("a", _unit(0)))
+    query = Embedding(vector=_unit(0))
+    assert len(index.search_by_embedding(query)) == 1
+
+    # When: A new revision supersedes "a" and another chunk is added
+    index.batch_insert_chunks([_chunk("a", _unit(0), revision=2), _chunk("b", _unit(0))])
+    after_insert = index.search_by_embedding(query)
+    index.delete_chunk(ChunkKey("doc", "b", 1))
+    after_delete = index.search_by_embedding(query)
+
+    # Then
+    assert sorted(r.chunk.content for r in after_insert) == ["Content a r2", "Content b r1"]
+    assert [r.chunk.content for r in after_delete] == ["Content a r2"]
+
+
+def test_does_not_reload_without_writes(index, monkeypatch):
+    """Repeated searches reuse the loaded matrix."""
+    # Given
+    index.insert_chunk(_chunk("a", _unit(0)))
+    index.search_by_embedding(Embedding(vector=_unit(0)))
+    loads = []
+    original = index._load
+    monkeypatch.setattr(index, "_load", lambda status: loads.append(status) or original(status))
+
+    # When
+    for _ in range(3):
+        index.search_by_embedding(Embedding(vector=_unit(0)))
+
+    # Then
+    assert loads == []
+
+
+def test_batched_search_matches_single_queries(index):
+    """One matrix-matrix search gives the same results as per-query searches."""
+    # Given
+    index.batch_insert_chunks([
+        _chunk("a", _unit(0)),
+        _chunk("b", _unit(0, 1)),
+        _chunk("c", _unit(1)),
+    ])
+    queries = [Embedding(vector=_unit(0)), Embedding(vector=_unit(1)), Embedding(vector=_unit(2))]
+
+    # When
+    batched = index.search_by_embeddings(queries, top_k=2, threshold=0.1)
+    single = [index.search_by_embedding(q, top_k=2, threshold=0.1) for q in queries]
+
+    # Then
+    assert [[r.chunk.key.chunk_id for r in hits] for hits in batched] == [["a", "b"], ["c", "b"], []]
+    assert [[r.similarity for r in hits] for hits in batched] == [[r.similarity for r in hits] for hits in single]
+
+
+def test_filters_match_sqlite(index):
+    """Filtered searches return the same chunks as the SQLite KNN path."""
+    # Given
+    index.batch_insert_chunks([
+        _chunk("a", _unit(0), metadata={"Header2": "Access"}),
+        _chunk("b", _unit(0, 1), metadata={"Header2": "Backups"}),
+        _chunk("c", _unit(0, 1, 2), document_id="other", metadata={"Header2": "Backups"}),
+    ])
+    query = Embedding(vector=_unit(0))
+
+    for filters in (ChunkFilter(header2="Backups"), ChunkFilter(document_id="other"), ChunkFilter(header3="None")):
+        # When
+        from_memory = index.search_by_embedding(query, top_k=5, filters=filters)
+        from_sqlite = index.client.search_by_embedding(query, top_k=5, filters=filters)
+
+        # Then
+        assert [r.chunk.key for r in from_memory] == [r.chunk.key for r in from_sqlite]
+    assert [r.chunk.key.chunk_id for r in index.search_by_embedding(query, filters=ChunkFilter(header2="Backups"))] == ["b", "c"]
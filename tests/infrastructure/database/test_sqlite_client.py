@@ -7,6 +7,8 @@ import os
 import tempfile
 from pathlib import Path
 from src.infrastructure.database.sqlite_client import SQLiteClient
+from src.infrastructure.database.base import ChunkFilter, ChunkKey, ChunkRecord
+from src.rag.ingestion.embedder import Embedding
 from .contract_vector_db import VectorDatabaseContract
 
 class TestSQLiteClient(VectorDatabaseContract):
@@ -56,3 +58,252 @@ class TestSQLiteClient(VectorDatabaseContract):
         # Verify foreign keys are enabled
         cursor.execute("PRAGMA foreign_keys")
         assert cursor.fetchone()[0] == 1
+
+
+def _legacy_vec_db(db_path: str, records, metadata: str = None):
+    """Create a database with the pre-KNN vec table layout (no metadata columns)."""
+    import sqlite3
+    import sqlite_vec
+    conn = sqlite3.connect(db_path)
+    conn.enable_load_extension(True)
+    sqlite_vec.load(conn)
+    conn.execute("""
+        CREATE TABLE document_chunks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id TEXT, chunk_id TEXT, revision INTEGER,
+            status TEXT, content TEXT, metadata TEXT,
+            UNIQUE(document_id, chunk_id, revision)
+        )
+    """)
+    conn.execute("CREATE VIRTUAL TABLE vec_document_chunks USING vec0(embedding float[1024])")
+    for rowid, (status, content, vector) in enumerate(records, 1):
+        conn.execute(
+            "INSERT INTO document_chunks VALUES (?, 'doc', ?, 1, ?, ?, ?)",
+            (rowid, f"chunk-{rowid}", status, content, metadata)
+        )
+        conn.execute(
+            "INSERT INTO vec_document_chunks (rowid, embedding) VALUES (?, ?)",
+            (rowid, Embedding(vector=vector).to_bytes())
+        )
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_legacy_vec_table(tmp_path):
+    """Existing databases get the status metadata column with their data intact."""
+    # Given: A database created before the KNN layout
+    db_path = str(tmp_path / "legacy.db")
+    vec = [0.0] * 1024; vec[0] = 1.0
+    _legacy_vec_db(db_path, [("active", "Current", vec), ("superseded", "Old", vec)])
+
+    # When
+    client = SQLiteClient(db_path=db_path)
+
+    # Then: Schema upgraded and only the active row is searchable
+    sql = client.conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'vec_document_chunks'"
+    ).fetchone()[0]
+    assert "status text" in sql
+    results = client.search_by_embedding(Embedding(vector=vec), top_k=5)
+    assert [r.chunk.content for r in results] == ["Current"]
+
+
+def test_migrates_numeric_header_metadata(tmp_path):
+    """Non-string header values are stored as text in the vec metadata columns."""
+    # Given: A chunk whose Header2 was stored as a number
+    db_path = str(tmp_path / "legacy.db")
+    vec = [0.0] * 1024; vec[0] = 1.0
+    _legacy_vec_db(db_path, [("active", "Numbered section", vec)], metadata='{"Header2": 5}')
+
+    # When
+    client = SQLiteClient(db_path=db_path)
+
+    # Then: Row kept and filterable by its text label in both search paths
+    label = ChunkFilter(header2="5")
+    by_vector = client.search_by_embedding(Embedding(vector=vec), top_k=5, filters=label)
+    by_text = client.search_by_text("section", filters=label)
+    assert [r.chunk.content for r in by_vector] == ["Numbered section"]
+    assert [r.chunk.content for r in by_text] == ["Numbered section"]
+
+
+def test_failed_migration_keeps_legacy_vectors(tmp_path):
+    """A row that cannot be re-inserted rolls the whole rebuild back."""
+    # Given: A legacy row without a status, which vec0 metadata columns reject
+    import sqlite3
+    import sqlite_vec
+    db_path = str(tmp_path / "legacy.db")
+    vec = [0.0] * 1024; vec[0] = 1.0
+    _legacy_vec_db(db_path, [("active", "Kept", vec), (None, "Broken", vec)])
+
+    # When
+    with pytest.raises(sqlite3.Error):
+        SQLiteClient(db_path=db_path)
+
+    # Then: The old table and both embeddings are still there
+    conn = sqlite3.connect(db_path)
+    conn.enable_load_extension(True)
+    sqlite_vec.load(conn)
+    assert conn.execute("SELECT COUNT(*) FROM vec_document_chunks").fetchone()[0] == 2
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'vec_document_chunks'").fetchone()[0]
+    assert "status" not in sql
+    conn.close()
+
+
+def test_legacy_database_gets_full_text_index(tmp_path):
+    """Chunks stored before the FTS5 table existed are indexed on open."""
+    # Given
+    db_path = str(tmp_path / "legacy.db")
+    vec = [0.0] * 1024; vec[0] = 1.0
+    _legacy_vec_db(db_path, [("active", "Data is encrypted with AES-256.", vec)])
+
+    # When
+    client = SQLiteClient(db_path=db_path)
+
+    # Then
+    results = client.search_by_text("AES-256")
+    assert [r.chunk.content for r in results] == ["Data is encrypted with AES-256."]
+
+
+def test_superseding_updates_vec_status(vector_db):
+    """A new active revision moves the old one out of the KNN status partition."""
+    # Given
+    vec = [0.0] * 1024; vec[0] = 1.0
+    for revision in (1, 2):
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", "chunk-1", revision),
+            status="active",
+            content=f"Revision {revision}",
+            embedding=Embedding(vector=vec)
+        ))
+
+    # When
+    active = vector_db.search_by_embedding(Embedding(vector=vec), top_k=5)
+    superseded = vector_db.search_by_embedding(Embedding(vector=vec), top_k=5, status="superseded")
+
+    # Then
+    assert [r.chunk.content for r in active] == ["Revision 2"]
+    assert [r.chunk.content for r in superseded] == ["Revision 1"]
+
+
+def test_reinserting_a_revision_replaces_its_vector(vector_db):
+    """Re-inserting the same key leaves exactly one vector row behind."""
+    # Given
+    key = ChunkKey("doc", "chunk-1", 1)
+    for content in ("First", "Second"):
+        vector_db.insert_chunk(ChunkRecord(
+            key=key, status="active", content=content,
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+
+    # When
+    count = vector_db.conn.execute("SELECT COUNT(*) FROM vec_document_chunks").fetchone()[0]
+
+    # Then
+    assert count == 1
+
+
+def test_search_returns_cosine_similarity_and_applies_threshold(vector_db):
+    """Similarity is true cosine similarity and rows below threshold are dropped."""
+    # Given: Query along axis 0, one chunk at 45 degrees, one orthogonal
+    query = [0.0] * 1024; query[0] = 1.0
+    diagonal = [0.0] * 1024; diagonal[0] = 1.0; diagonal[1] = 1.0
+    orthogonal = [0.0] * 1024; orthogonal[1] = 1.0
+    for chunk_id, vec in (("diagonal", diagonal), ("orthogonal", orthogonal)):
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", chunk_id, 1), status="active",
+            content=chunk_id, embedding=Embedding(vector=vec)
+        ))
+
+    # When
+    results = vector_db.search_by_embedding(Embedding(vector=query), top_k=5, threshold=0.5)
+
+    # Then
+    assert [r.chunk.content for r in results] == ["diagonal"]
+    assert results[0].similarity == pytest.approx(0.7071, abs=1e-4)
+
+
+def test_reads_skip_embeddings_unless_requested(vector_db):
+    """Search results carry no vector by default; record reads can opt out of it."""
+    # Given
+    vec = [0.0] * 1024; vec[0] = 1.0
+    key = ChunkKey("doc", "c1", 1)
+    vector_db.insert_chunk(ChunkRecord(
+        key=key, status="active", content="c1", embedding=Embedding(vector=vec)
+    ))
+
+    # When
+    light = vector_db.search_by_embedding(Embedding(vector=vec))
+    full = vector_db.search_by_embedding(Embedding(vector=vec), include_embeddings=True)
+    by_status = vector_db.query_chunks_by_status("doc", "active", include_embeddings=False)
+    revisions = vector_db.get_chunk_revisions("doc", "c1")
+
+    # Then
+    assert light[0].chunk.embedding is None
+    assert full[0].chunk.embedding == Embedding(vector=vec)
+    assert by_status[0].embedding is None
+    assert revisions[1].embedding == Embedding(vector=vec)
+
+
+def test_search_by_text_ranks_exact_terms_and_tracks_writes(vector_db):
+    """FTS5 search finds exact terms and follows supersede, reinsert and delete."""
+    # Given
+    vec = [0.1] * 1024
+    for chunk_id, content in (
+        ("soc", "We hold a SOC 2 Type II report."),
+        ("rto", "Our RTO is four hours."),
+        ("other", "Employees complete annual training."),
+    ):
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey("doc", chunk_id, 1), status="active",
+            content=content, embedding=Embedding(vector=vec)
+        ))
+
+    # When
+    hits = vector_db.search_by_text("What is your RTO?")
+    vector_db.insert_chunk(ChunkRecord(
+        key=ChunkKey("doc", "rto", 2), status="active",
+        content="Our RTO is two hours.", embedding=Embedding(vector=vec)
+    ))
+    after_supersede = vector_db.search_by_text("RTO")
+    vector_db.delete_chunk(ChunkKey("doc", "soc", 1))
+    after_delete = vector_db.search_by_text("SOC 2")
+
+    # Then
+    assert [r.chunk.content for r in hits] == ["Our RTO is four hours."]
+    assert hits[0].similarity > 0
+    assert [r.chunk.content for r in after_supersede] == ["Our RTO is two hours."]
+    assert after_delete == []
+    assert vector_db.search_by_text('"*') == []
+
+
+def test_search_filters_are_pushed_into_knn(vector_db):
+    """Document and section filters restrict the candidates, not the returned top_k."""
+    # Given: The nearest chunks belong to another document/section
+    near = [0.0] * 1024; near[0] = 1.0
+    far = [0.0] * 1024; far[0] = 0.2; far[1] = 1.0
+    chunks = [
+        ("policy", "near-1", near, {"Header2": "Access Control"}),
+        ("policy", "near-2", near, {"Header2": "Access Control"}),
+        ("policy", "far-backup", far, {"Header2": "Backups", "Header3": "Retention"}),
+        ("soc2", "far-soc", far, None),
+    ]
+    for document_id, chunk_id, vec, metadata in chunks:
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id, chunk_id, 1), status="active",
+            content=chunk_id, embedding=Embedding(vector=vec), metadata=metadata
+        ))
+    query = Embedding(vector=near)
+
+    # When
+    by_document = vector_db.search_by_embedding(query, top_k=1, filters=ChunkFilter(document_id="soc2"))
+    by_section = vector_db.search_by_embedding(
+        query, top_k=1, filters=ChunkFilter(document_id="policy", header2="Backups")
+    )
+    by_subsection = vector_db.search_by_embedding(query, filters=ChunkFilter(header3="Retention"))
+    text_hits = vector_db.search_by_text("near far", filters=ChunkFilter(header2="Access Control"))
+
+    # Then
+    assert [r.chunk.content for r in by_document] == ["far-soc"]
+    assert [r.chunk.content for r in by_section] == ["far-backup"]
+    assert [r.chunk.content for r in by_subsection] == ["far-backup"]
+    assert sorted(r.chunk.content for r in text_hits) == ["near-1", "near-2"]
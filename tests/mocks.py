@@ -15,6 +15,11 @@ def fake_generate_embeddings(texts: list[str]) -> list[Embedding]:
     return [fake_generate_embedding(text) for text in texts]
 
 
+async def fake_agenerate_embedding(text: str) -> Embedding:
+    """Async variant of fake_generate_embedding."""
+    return fake_generate_embedding(text)
+
+
 class MockLLM:
     """Mock LLM that returns a fixed response."""
 
@@ -26,3 +31,10 @@ class MockLLM:
         """Return fixed response and store the prompt for inspection."""
         self.last_prompt = prompt
         return self.response
+
+    def stream(self, prompt: str):
+        """Yield the fixed response word by word, like a streaming LLM."""
+        self.last_prompt = prompt
+        words = self.response.split(" ")
+        for i, word in enumerate(words):
+            yield word if i == len(words) - 1 else word + " "
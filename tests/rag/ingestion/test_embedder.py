@@ -5,7 +5,7 @@ Tests embedding text via Ollama using mxbai-embed-large model.
 """
 
 import pytest
-from src.rag.ingestion.embedder import generate_embedding, generate_embeddings, Embedding
+from src.rag.ingestion.embedder import generate_embedding, generate_embeddings, Embedding, EmbeddingClient
 
 
 def test_generate_embedding_via_ollama():
@@ -48,22 +48,16 @@ def test_raise_error_when_ollama_unavailable():
     # Given
     text = "Test text for embedding."
     
-    # Temporarily change to unreachable address to simulate Ollama being unavailable
-    import src.rag.ingestion.embedder as embedder
-    original_url = embedder.OLLAMA_API_URL
-    embedder.OLLAMA_API_URL = "http://127.0.0.1:9999/api/embeddings"  # Valid but unreachable port
+    # Point a client at an unreachable address to simulate Ollama being unavailable
+    client = EmbeddingClient(base_url="http://127.0.0.1:9999", max_retries=0)  # Valid but unreachable port
     
-    try:
-        # When/Then
-        with pytest.raises(ConnectionError) as exc_info:
-            generate_embedding(text)
-        
-        # Verify error message is helpful
-        assert "Failed to connect to Ollama" in str(exc_info.value)
-        assert "Is Ollama running?" in str(exc_info.value)
-    finally:
-        # Restore original URL
-        embedder.OLLAMA_API_URL = original_url
+    # When/Then
+    with pytest.raises(ConnectionError) as exc_info:
+        client.embed(text)
+    
+    # Verify error message is helpful
+    assert "Failed to connect to Ollama" in str(exc_info.value)
+    assert "Is Ollama running?" in str(exc_info.value)
 
 
 def test_reject_empty_text():
@@ -82,3 +76,176 @@ def test_reject_empty_text():
     with pytest.raises(ValueError) as exc_info:
         generate_embedding("\n\n")
     assert "Text cannot be empty" in str(exc_info.value)
+
+
+class _FakeEmbedResponse:
+    """Minimal stand-in for a requests.Response from /api/embed."""
+
+    def __init__(self, inputs):
+        # Encode each text's length in the first dimension so order can be verified
+        self._vectors = [[float(len(text))] + [0.0] * 1023 for text in inputs]
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"embeddings": self._vectors}
+
+
+def test_embed_many_batches_and_preserves_order(monkeypatch):
+    """Test that texts are sent in batches and results keep input order."""
+    # Given
+    client = EmbeddingClient(batch_size=2)
+    requests_sent = []
+
+    def fake_post(url, json, timeout):
+        requests_sent.append(json["input"])
+        return _FakeEmbedResponse(json["input"])
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+    texts = ["a" * n for n in (5, 1, 3, 2, 4)]
+
+    # When
+    embeddings = client.embed_many(texts)
+
+    # Then
+    assert len(requests_sent) == 3, "5 texts with batch_size=2 need 3 requests"
+    assert [e.vector[0] for e in embeddings] == [5.0, 1.0, 3.0, 2.0, 4.0]
+
+
+def test_long_text_gets_its_own_batch():
+    """Test that a text over the character budget does not share a batch."""
+    # Given
+    from src.rag.ingestion.embedder import _plan_batches
+    texts = ["short", "x" * 100, "tiny", "small"]
+
+    # When
+    batches = _plan_batches(texts, batch_size=10, max_batch_chars=50)
+
+    # Then
+    assert [1] in batches, "Long text should be isolated"
+    assert sorted(i for batch in batches for i in batch) == [0, 1, 2, 3]
+
+
+def test_client_uses_configured_base_url_and_pooled_session(monkeypatch):
+    """Test that requests go to the configured host through the client's session."""
+    # Given
+    client = EmbeddingClient(base_url="http://ollama-worker-2:11434/", pool_size=4)
+    urls = []
+
+    def fake_post(url, json, timeout):
+        urls.append(url)
+        return _FakeEmbedResponse(json["input"])
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+
+    # When
+    client.embed("first")
+    client.embed("second")
+
+    # Then
+    assert urls == ["http://ollama-worker-2:11434/api/embed"] * 2
+    assert client.session.get_adapter(client.embed_url)._pool_maxsize == 4
+
+
+def test_aembed_many_bounds_concurrency_and_preserves_order(monkeypatch):
+    """Test that async batches respect max_concurrency and keep input order."""
+    # Given
+    import asyncio
+    import json
+    import httpx
+    client = EmbeddingClient(batch_size=1, max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        inputs = json.loads(request.content)["input"]
+        return httpx.Response(200, json=_FakeEmbedResponse(inputs).json())
+
+    original = client._async_resources
+
+    def mock_resources():
+        original()
+        client._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client._async_client, client._async_semaphore
+
+    monkeypatch.setattr(client, "_async_resources", mock_resources)
+    texts = ["a" * n for n in (3, 1, 4, 2, 5)]
+
+    # When
+    embeddings = asyncio.run(client.aembed_many(texts))
+
+    # Then
+    assert peak == 2, "Requests overlap but never exceed max_concurrency"
+    assert [e.vector[0] for e in embeddings] == [3.0, 1.0, 4.0, 2.0, 5.0]
+
+
+def test_aclose_closes_the_loops_async_client():
+    """Test that aclose() closes the client opened on the running loop, so the next loop gets a fresh one."""
+    # Given
+    import asyncio
+    client = EmbeddingClient()
+
+    async def use_and_close():
+        http_client, _ = client._async_resources()
+        await client.aclose()
+        return http_client
+
+    # When
+    first = asyncio.run(use_and_close())
+    second = asyncio.run(use_and_close())
+
+    # Then
+    assert first.is_closed and second.is_closed
+    assert first is not second
+    assert client._async_client is None
+
+
+def test_aembed_raises_connection_error_when_ollama_unavailable():
+    """Test that the async path reports an unreachable Ollama like the sync path."""
+    # Given
+    import asyncio
+    client = EmbeddingClient(base_url="http://127.0.0.1:9999", max_retries=0)
+
+    # When/Then
+    with pytest.raises(ConnectionError) as exc_info:
+        asyncio.run(client.aembed("Test text for embedding."))
+    assert "Failed to connect to Ollama" in str(exc_info.value)
+
+
+def test_embedding_is_float32_backed_with_list_view():
+    """Test that Embedding stores a float32 array but still exposes a list of floats."""
+    # When
+    embedding = Embedding(vector=[0.5] * 1024)
+
+    # Then
+    assert embedding.array.dtype.name == "float32"
+    assert embedding.array.nbytes == 4096
+    assert isinstance(embedding.vector, list)
+    assert all(isinstance(x, float) for x in embedding.vector)
+
+
+def test_embedding_round_trips_through_bytes_without_copy():
+    """Test that from_bytes views the blob and to_bytes returns a buffer over the array."""
+    # Given
+    original = Embedding(vector=[float(i) for i in range(1024)])
+    blob = bytes(original.to_bytes())
+
+    # When
+    restored = Embedding.from_bytes(blob)
+
+    # Then
+    assert restored == original
+    assert not restored.array.flags.owndata, "Should view the blob, not copy it"
+
+
+def test_embedding_rejects_wrong_dimensions():
+    """Test that vectors of the wrong size are rejected."""
+    with pytest.raises(ValueError) as exc_info:
+        Embedding(vector=[0.1] * 10)
+    assert "Expected 1024 dimensions" in str(exc_info.value)
@@ -0,0 +1,96 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import pytest
+from src.rag.ingestion.embedding_cache import EmbeddingCache
+from src.rag.ingestion.embedder import EmbeddingClient
+
+
+@pytest.fixture
+def cache():
+    """Provide an in-memory EmbeddingCache."""
+    return EmbeddingCache(db_path=":memory:", max_entries=3)
+
+
+def test_cache_hit_and_miss_stats(cache):
+    """Test that lookups are counted as hits or misses."""
+    # Given
+    cache.put("known text", "model-a", 4, [0.5, 0.25, 0.0, 1.0])
+
+    # When
+    hit = cache.get("known text", "model-a", 4)
+    miss = cache.get("unknown text", "model-a", 4)
+
+    # Then
+    assert hit.tolist() == [0.5, 0.25, 0.0, 1.0]
+    assert miss is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_includes_model_and_dimensions(cache):
+    """Test that the same text under another model is a miss."""
+    # Given
+    cache.put("text", "model-a", 4, [1.0, 0.0, 0.0, 0.0])
+
+    # When/Then
+    assert cache.get("text", "model-b", 4) is None
+    assert cache.get("text", "model-a", 8) is None
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """Test that the cache stays within max_entries, dropping the LRU entry."""
+    # Given: Cache full with three entries, "first" recently used
+    for text in ("first", "second", "third"):
+        cache.put(text, "model-a", 1, [1.0])
+    cache.get("first", "model-a", 1)
+
+    # When
+    cache.put("fourth", "model-a", 1, [1.0])
+
+    # Then
+    assert len(cache) == 3
+    assert cache.get("second", "model-a", 1) is None
+    assert cache.get("first", "model-a", 1).tolist() == [1.0]
+
+
+def test_entry_count_ignores_replacements_and_survives_reopening(tmp_path):
+    """Test that re-putting a text does not count twice and a reopened cache knows its size."""
+    # Given
+    db_path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(db_path=db_path, max_entries=3)
+    cache.put_many(["a", "b", "a"], "model-a", 1, [[1.0], [2.0], [3.0]])
+    cache.put("b", "model-a", 1, [4.0])
+
+    # When
+    reopened = EmbeddingCache(db_path=db_path, max_entries=3)
+
+    # Then
+    assert len(cache) == 2
+    assert len(reopened) == 2
+    assert reopened.get("a", "model-a", 1).tolist() == [3.0]
+
+
+def test_embed_many_only_requests_uncached_texts(monkeypatch):
+    """Test that cached texts are served locally and not sent to Ollama."""
+    # Given
+    cache = EmbeddingCache(db_path=":memory:")
+    client = EmbeddingClient(cache=cache)
+    sent = []
+
+    def fake_embed_batch(texts):
+        sent.extend(texts)
+        return [[0.1] * 1024 for _ in texts]
+
+    monkeypatch.setattr(client, "_embed_batch", fake_embed_batch)
+    client.embed_many(["alpha", "beta"])
+    sent.clear()
+
+    # When
+    embeddings = client.embed_many(["alpha", "gamma", "beta", "gamma"])
+
+    # Then
+    assert sent == ["gamma"], "Only the new text should be embedded, once"
+    assert len(embeddings) == 4
+    assert cache.stats()["hits"] == 2
@@ -0,0 +1,98 @@
+"""
+Tests for token-budgeted context packing.
+"""
+
+from src.domain.models import ChunkKey
+from src.infrastructure.database.base import ChunkRecord, SearchResult
+from src.rag.context_packer import ContextPacker
+
+
+def _result(chunk_id: str, content: str) -> SearchResult:
+    return SearchResult(
+        chunk=ChunkRecord(key=ChunkKey("doc", chunk_id, 1), status="active", content=content, embedding=None),
+        similarity=0.9
+    )
+
+
+def _words(text: str) -> int:
+    """Deterministic test tokenizer: one token per whitespace-separated word."""
+    return len(text.split())
+
+
+def test_packs_in_rank_order_and_truncates_last_chunk_at_sentence():
+    """Chunks are added whole until the budget runs out; the next one is cut at a sentence end."""
+    # Given
+    packer = ContextPacker(token_budget=12, token_counter=_words)
+    results = [
+        _result("a", "MFA is required for all staff."),                            # "[1] ..." = 7 tokens
+        _result("b", "Keys rotate yearly. Backups are encrypted. Logs are kept."),  # 3 sentences
+        _result("c", "Never reached."),
+    ]
+
+    # When
+    packed = packer.pack(results)
+
+    # Then
+    assert packed.text == "[1] MFA is required for all staff.\n\n[2] Keys rotate yearly."
+    assert [r.chunk.key.chunk_id for r in packed.results] == ["a", "b"]
+    assert packed.tokens == 11
+    assert packed.truncated
+
+
+def test_cuts_at_word_boundary_when_no_sentence_fits():
+    """A chunk whose first sentence does not fit is cut after its last fitting word."""
+    # Given
+    packer = ContextPacker(token_budget=10, token_counter=_words)
+    results = [_result("a", "MFA is required for all staff."), _result("b", "One long sentence here.")]
+
+    # When
+    packed = packer.pack(results)
+
+    # Then
+    assert packed.text == "[1] MFA is required for all staff.\n\n[2] One long"
+    assert [r.chunk.key.chunk_id for r in packed.results] == ["a", "b"]
+    assert packed.tokens == 10
+    assert packed.truncated
+
+
+def test_truncated_chunk_keeps_source_line_breaks():
+    """A cut chunk is a prefix of the original text, so markdown lines stay on their own lines."""
+    # Given
+    content = "## Access\n\n- MFA is required.\n- Keys rotate yearly.\n- Logs are kept."
+    packer = ContextPacker(token_budget=11, token_counter=_words)
+
+    # When
+    packed = packer.pack([_result("a", content)])
+
+    # Then
+    assert packed.text == "[1] ## Access\n\n- MFA is required.\n- Keys rotate yearly."
+    assert packed.truncated
+
+
+def test_drops_chunk_when_no_word_fits():
+    """A chunk whose first word does not fit is left out entirely."""
+    # Given
+    packer = ContextPacker(token_budget=8, token_counter=_words)
+    results = [_result("a", "MFA is required for all staff."), _result("b", "One long sentence here.")]
+
+    # When
+    packed = packer.pack(results)
+
+    # Then
+    assert [r.chunk.key.chunk_id for r in packed.results] == ["a"]
+    assert packed.tokens == 7
+
+
+def test_no_budget_packs_everything():
+    """A budget of 0 disables packing limits."""
+    # Given
+    packer = ContextPacker(token_budget=0)
+    results = [_result(str(i), "x" * 4000) for i in range(7)]
+
+    # When
+    packed = packer.pack(results)
+
+    # Then
+    assert len(packed.results) == 7
+    assert not packed.truncated
+    assert packed.tokens > 7000
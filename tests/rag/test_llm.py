@@ -0,0 +1,29 @@
+"""
+Tests for the LLM factory.
+"""
+
+from src.config import LLM_KEEP_ALIVE
+from src.rag.llm import create_llm
+
+
+def test_create_llm_applies_configured_options():
+    """Test that the factory sets keep_alive from config and leaves num_ctx/num_predict to the model."""
+    # When
+    llm = create_llm(model="llama3.2", temperature=0.3, num_ctx=None, num_predict=None)
+
+    # Then
+    assert llm.model == "llama3.2"
+    assert llm.temperature == 0.3
+    assert llm.keep_alive == LLM_KEEP_ALIVE
+    assert llm.num_ctx is None
+    assert llm.num_predict is None
+
+
+def test_create_llm_passes_opt_in_generation_limits():
+    """Test that explicit num_ctx and num_predict reach the OllamaLLM."""
+    # When
+    llm = create_llm(model="llama3.2", num_ctx=4096, num_predict=256)
+
+    # Then
+    assert llm.num_ctx == 4096
+    assert llm.num_predict == 256
@@ -0,0 +1,110 @@
+"""
+Tests for the persistent LLM response cache.
+"""
+
+import asyncio
+import pytest
+from src.rag.llm_cache import CachedLLM, LLMResponseCache
+
+
+class CountingLLM:
+    """LLM stub that records how often it is called."""
+
+    def __init__(self, model: str = "llama3.2", temperature: float = 0.0, num_ctx: int = 2048):
+        self.model = model
+        self.temperature = temperature
+        self.num_ctx = num_ctx
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> str:
+        self.calls += 1
+        return f"answer to {prompt}"
+
+    def stream(self, prompt: str):
+        self.calls += 1
+        yield "answer to "
+        yield prompt
+
+
+@pytest.fixture
+def cache():
+    """Provide an in-memory LLMResponseCache."""
+    return LLMResponseCache(db_path=":memory:", max_entries=2)
+
+
+def test_repeated_prompt_is_served_from_cache(cache):
+    """Test that an identical prompt only reaches the LLM once."""
+    # Given
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache, max_temperature=0.3)
+
+    # When
+    first = cached.invoke("What is MFA?")
+    second = cached.invoke("What is MFA?")
+
+    # Then
+    assert first == second == "answer to What is MFA?"
+    assert llm.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_key_includes_model_temperature_and_options(cache):
+    """Test that changing the model, temperature or options is a miss."""
+    # Given
+    CachedLLM(CountingLLM(), cache).invoke("Q")
+    variants = [
+        CountingLLM(model="mistral"),
+        CountingLLM(temperature=0.1),
+        CountingLLM(num_ctx=4096),
+    ]
+
+    # When
+    for llm in variants:
+        CachedLLM(llm, cache, max_temperature=0.3).invoke("Q")
+
+    # Then
+    assert [llm.calls for llm in variants] == [1, 1, 1]
+
+
+def test_high_temperature_bypasses_cache(cache):
+    """Test that calls above the cutoff are neither served nor stored."""
+    # Given
+    llm = CountingLLM(temperature=0.8)
+    cached = CachedLLM(llm, cache, max_temperature=0.3)
+
+    # When
+    cached.invoke("Q")
+    cached.invoke("Q")
+
+    # Then
+    assert llm.calls == 2
+    assert len(cache) == 0
+
+
+def test_stream_and_ainvoke_share_entries(cache):
+    """Test that a completed stream is cached and served to ainvoke."""
+    # Given
+    llm = CountingLLM()
+    cached = CachedLLM(llm, cache)
+
+    # When
+    streamed = "".join(cached.stream("Q"))
+    awaited = asyncio.run(cached.ainvoke("Q"))
+
+    # Then
+    assert streamed == awaited == "answer to Q"
+    assert llm.calls == 1
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    """Test that the cache stays within max_entries."""
+    # Given
+    cached = CachedLLM(CountingLLM(), cache)
+
+    # When
+    for prompt in ["a", "b", "c"]:
+        cached.invoke(prompt)
+
+    # Then
+    assert len(cache) == 2
+    assert cache.get(cached.cache_key("a")) is None
@@ -13,6 +13,141 @@ from src.rag.ingestion.embedder import Embedding
 class TestRAGSystem:
     """Tests for answer generation."""
 
+    def test_prompt_context_respects_token_budget(self, mock_embeddings, vector_db, mock_llm):
+        """Test that only packed chunks reach the prompt and citations, and tokens are recorded."""
+        # Given
+        from src.rag.context_packer import ContextPacker
+        for i in range(3):
+            vector_db.insert_chunk(ChunkRecord(
+                key=ChunkKey(document_id="doc-1", chunk_id=f"chunk-{i}", revision=1),
+                status="active",
+                content=f"Chunk {i} first sentence. " + "Filler text. " * 200,
+                embedding=Embedding(vector=[0.1] * 1024)
+            ))
+        rag = RAGSystem(client=vector_db, llm=mock_llm, top_k=3, context_packer=ContextPacker(token_budget=300))
+
+        # When
+        result = rag.answer("What is MFA?")
+
+        # Then
+        assert 0 < result.context_tokens <= 300
+        assert len(result.citations) == 1
+        assert mock_llm.last_prompt.count("first sentence") == 1
+
+    def test_no_answer_when_nothing_fits_the_budget(self, mock_embeddings, vector_db, mock_llm):
+        """Test that the LLM is not prompted with an empty context."""
+        # Given
+        from src.rag.context_packer import ContextPacker
+        from src.rag.rag_system import NO_ANSWER
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="chunk-1", revision=1),
+            status="active",
+            content="MFA requires two factors.",
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+        rag = RAGSystem(client=vector_db, llm=mock_llm, context_packer=ContextPacker(token_budget=1))
+
+        # When
+        result = rag.answer("What is MFA?")
+
+        # Then
+        assert result.answer == NO_ANSWER
+        assert result.citations == []
+        assert mock_llm.last_prompt is None
+
+    def test_prompt_starts_with_static_prefix(self, mock_embeddings, vector_db, mock_llm):
+        """Test that different questions share the same byte-identical prompt prefix."""
+        # Given
+        from src.rag.rag_system import PROMPT_PREFIX
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="chunk-1", revision=1),
+            status="active",
+            content="MFA requires two factors.",
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+        rag = RAGSystem(client=vector_db, llm=mock_llm)
+
+        # When
+        rag.answer("What is MFA?")
+        first = mock_llm.last_prompt
+        rag.answer("Do you encrypt data at rest?")
+        second = mock_llm.last_prompt
+
+        # Then
+        assert first.startswith(PROMPT_PREFIX)
+        assert second.startswith(PROMPT_PREFIX)
+        assert "What is MFA?" not in second
+
+    def test_answer_records_stage_timings(self, mock_embeddings, vector_db, mock_llm):
+        """Test that each pipeline stage is timed on the generated answer."""
+        # Given
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="chunk-1", revision=1),
+            status="active",
+            content="MFA requires two factors.",
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+        rag = RAGSystem(client=vector_db, llm=mock_llm)
+
+        # When
+        result = rag.answer("What is MFA?")
+
+        # Then
+        timings = result.timings
+        assert timings.embedding_ms >= 0.0
+        assert timings.search_ms >= 0.0
+        assert timings.prompt_ms >= 0.0
+        assert timings.generation_ms >= 0.0
+        assert timings.prompt_tokens is None  # MockLLM reports no usage
+
+    def test_aanswer_records_token_counts(self, mock_embeddings, vector_db):
+        """Test that the async path records the token counts reported by the LLM."""
+        import asyncio
+        from langchain_core.language_models import BaseLLM
+        from langchain_core.outputs import Generation, LLMResult
+
+        class UsageReportingLLM(BaseLLM):
+            """LangChain LLM whose generation_info carries Ollama-style counts."""
+
+            @property
+            def _llm_type(self) -> str:
+                return "usage-reporting"
+
+            def _generate(self, prompts, stop=None, run_manager=None, **kwargs):
+                info = {"prompt_eval_count": 120, "eval_count": 8}
+                return LLMResult(generations=[[Generation(text="Answer.", generation_info=info)] for _ in prompts])
+
+        # Given
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="chunk-1", revision=1),
+            status="active",
+            content="MFA requires two factors.",
+            embedding=Embedding(vector=[0.1] * 1024)
+        ))
+        rag = RAGSystem(client=vector_db, llm=UsageReportingLLM())
+
+        # When
+        result = asyncio.run(rag.aanswer("What is MFA?"))
+
+        # Then
+        assert result.answer == "Answer."
+        assert result.timings.prompt_tokens == 120
+        assert result.timings.completion_tokens == 8
+
+    def test_uses_injected_retriever(self, vector_db, mock_llm):
+        """Test that a shared Retriever is used instead of building a new one."""
+        # Given
+        from src.rag.retriever import Retriever
+        retriever = Retriever(client=vector_db)
+
+        # When
+        first = RAGSystem(llm=mock_llm, retriever=retriever)
+        second = RAGSystem(llm=mock_llm, top_k=3, retriever=retriever)
+
+        # Then
+        assert first.retriever is retriever
+        assert second.retriever is retriever
+
     def test_generate_answer_from_retrieved_chunks(
         self, mock_embeddings, vector_db, mock_llm
     ):
@@ -0,0 +1,36 @@
+"""
+Tests for the reranking module.
+"""
+
+import numpy as np
+from src.rag.reranking import mmr_select
+
+
+def _vectors(*rows):
+    return np.array(rows, dtype=np.float32)
+
+
+def test_mmr_skips_near_duplicates():
+    """A near-duplicate of the best hit loses to a less similar but distinct chunk."""
+    # Given: Candidates 0 and 1 are near-identical; 2 is distinct but still relevant
+    query = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+    candidates = _vectors([1.0, 0.05, 0.0], [1.0, 0.06, 0.0], [0.6, 0.0, 0.8])
+
+    # When
+    diverse = mmr_select(query, candidates, top_k=2, lambda_mult=0.5)
+    relevant = mmr_select(query, candidates, top_k=2, lambda_mult=1.0)
+
+    # Then
+    assert diverse == [0, 2]
+    assert relevant == [0, 1]
+
+
+def test_mmr_handles_small_candidate_sets():
+    """top_k larger than the candidate set returns every candidate once."""
+    # Given
+    query = np.array([1.0, 0.0], dtype=np.float32)
+    candidates = _vectors([1.0, 0.0], [0.0, 1.0])
+
+    # When / Then
+    assert sorted(mmr_select(query, candidates, top_k=5)) == [0, 1]
+    assert mmr_select(query, candidates[:0], top_k=3) == []
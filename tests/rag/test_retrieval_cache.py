@@ -0,0 +1,52 @@
+"""
+Tests for the retrieval result cache.
+"""
+
+from src.domain.models import ChunkKey
+from src.infrastructure.database.base import ChunkRecord, SearchResult
+from src.rag.retrieval_cache import RetrievalCache
+
+
+def _results(*similarities):
+    return [
+        SearchResult(
+            chunk=ChunkRecord(
+                key=ChunkKey("doc", f"c{i}", 1), status="active", content=f"c{i}", embedding=None
+            ),
+            similarity=similarity
+        )
+        for i, similarity in enumerate(similarities)
+    ]
+
+
+def test_superset_entry_serves_narrower_requests():
+    """An entry with larger top_k and lower threshold answers narrower requests only."""
+    # Given
+    cache = RetrievalCache(max_entries=10)
+    cache.put("q", generation=1, top_k=4, threshold=0.2, results=_results(0.9, 0.7, 0.5, 0.3))
+
+    # When / Then
+    assert [r.similarity for r in cache.get("q", 1, top_k=2, threshold=0.2)] == [0.9, 0.7]
+    assert [r.similarity for r in cache.get("q", 1, top_k=4, threshold=0.6)] == [0.9, 0.7]
+    assert cache.get("q", 1, top_k=5, threshold=0.2) is None
+    assert cache.get("q", 1, top_k=2, threshold=0.1) is None
+    assert cache.get("q", 2, top_k=2, threshold=0.2) is None
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 3
+
+
+def test_narrower_put_keeps_superset_and_lru_evicts():
+    """Storing a narrower result keeps the superset entry; the oldest key is evicted."""
+    # Given
+    cache = RetrievalCache(max_entries=2)
+    cache.put("a", 1, top_k=5, threshold=0.0, results=_results(0.9, 0.8))
+    cache.put("a", 1, top_k=1, threshold=0.5, results=_results(0.9))
+    cache.put("b", 1, top_k=1, threshold=0.0, results=_results(0.4))
+
+    # When
+    cache.get("a", 1, top_k=5, threshold=0.0)
+    cache.put("c", 1, top_k=1, threshold=0.0, results=_results(0.1))
+
+    # Then
+    assert len(cache.get("a", 1, top_k=5, threshold=0.0)) == 2
+    assert cache.get("b", 1, top_k=1, threshold=0.0) is None
+    assert cache.get("x", None, top_k=1, threshold=0.0) is None
@@ -5,8 +5,8 @@ Tests similarity search functionality for finding relevant document chunks.
 """
 
 import pytest
-from src.rag.retriever import Retriever
-from src.infrastructure.database.supabase_client import ChunkKey, ChunkRecord, SearchResult
+from src.rag.retriever import Retriever, reciprocal_rank_fusion
+from src.infrastructure.database.supabase_client import ChunkFilter, ChunkKey, ChunkRecord, SearchResult
 from src.rag.ingestion.embedder import Embedding
 
 
@@ -84,3 +84,237 @@ class TestRetriever:
         assert len(results) == 1
         assert results[0].chunk.status == "active"
         assert results[0].chunk.content == "Current version"
+
+    def test_uses_injected_embedding_client(self, vector_db):
+        """Test that an injected EmbeddingClient embeds the query."""
+        # Given
+        from unittest.mock import MagicMock
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="chunk-1", revision=1),
+            status="active",
+            content="Encryption at rest uses AES-256.",
+            embedding=Embedding(vector=[0.1] * 1024),
+            metadata=None
+        ))
+        embedding_client = MagicMock()
+        embedding_client.embed.return_value = Embedding(vector=[0.1] * 1024)
+        retriever = Retriever(client=vector_db, embedding_client=embedding_client)
+
+        # When
+        results = retriever.search("How is data encrypted?")
+
+        # Then
+        embedding_client.embed.assert_called_once_with("How is data encrypted?")
+        assert results[0].chunk.content == "Encryption at rest uses AES-256."
+
+    def test_search_many_embeds_queries_in_one_batch(self, vector_db):
+        """Test that search_many embeds all queries at once and keeps query order."""
+        # Given
+        from unittest.mock import MagicMock
+        vec_a = [0.0] * 1024; vec_a[0] = 1.0
+        vec_b = [0.0] * 1024; vec_b[1] = 1.0
+        vector_db.batch_insert_chunks([
+            ChunkRecord(
+                key=ChunkKey(document_id="doc-1", chunk_id="chunk-a", revision=1),
+                status="active",
+                content="Backups run nightly.",
+                embedding=Embedding(vector=vec_a)
+            ),
+            ChunkRecord(
+                key=ChunkKey(document_id="doc-1", chunk_id="chunk-b", revision=1),
+                status="active",
+                content="Access is reviewed quarterly.",
+                embedding=Embedding(vector=vec_b)
+            ),
+        ])
+        embedding_client = MagicMock()
+        embedding_client.embed_many.return_value = [Embedding(vector=vec_b), Embedding(vector=vec_a)]
+        retriever = Retriever(client=vector_db, embedding_client=embedding_client)
+
+        # When
+        results = retriever.search_many(["Access reviews?", "Backups?"], top_k=1)
+
+        # Then
+        embedding_client.embed_many.assert_called_once_with(["Access reviews?", "Backups?"])
+        embedding_client.embed.assert_not_called()
+        assert [hits[0].chunk.content for hits in results] == [
+            "Access is reviewed quarterly.", "Backups run nightly."
+        ]
+
+    def test_hybrid_mode_fuses_lexical_and_vector_hits(self, vector_db):
+        """Test that hybrid search ranks chunks found by both searches first."""
+        # Given: The query embedding points at "mfa" and "aes"; only "aes" shares words with the query
+        from unittest.mock import MagicMock
+        vec_mfa = [0.0] * 1024; vec_mfa[0] = 1.0
+        vec_aes = [0.0] * 1024; vec_aes[0] = 1.0; vec_aes[1] = 1.0
+        vec_far = [0.0] * 1024; vec_far[2] = 1.0
+        for chunk_id, content, vec in (
+            ("mfa", "MFA is enforced for all staff.", vec_mfa),
+            ("aes", "Backups are encrypted with AES-256.", vec_aes),
+            ("keys", "AES-256 keys rotate yearly.", vec_far),
+        ):
+            vector_db.insert_chunk(ChunkRecord(
+                key=ChunkKey(document_id="doc-1", chunk_id=chunk_id, revision=1),
+                status="active", content=content, embedding=Embedding(vector=vec)
+            ))
+        embedding_client = MagicMock()
+        embedding_client.embed.return_value = Embedding(vector=vec_mfa)
+        retriever = Retriever(client=vector_db, embedding_client=embedding_client, mode="hybrid")
+
+        # When
+        results = retriever.search("Are backups AES-256 encrypted?", top_k=3, threshold=0.5)
+
+        # Then: "aes" is in both lists, "keys" comes from full-text search only
+        assert [r.chunk.key.chunk_id for r in results] == ["aes", "mfa", "keys"]
+        assert results[0].similarity > results[1].similarity
+
+    def test_search_applies_filters(self, mock_embeddings, vector_db):
+        """Test that filters restrict results to the requested document."""
+        # Given
+        for document_id in ("soc2-report", "security-policy"):
+            vector_db.insert_chunk(ChunkRecord(
+                key=ChunkKey(document_id=document_id, chunk_id="chunk-1", revision=1),
+                status="active",
+                content=f"Content from {document_id}",
+                embedding=Embedding(vector=[0.1] * 1024)
+            ))
+        retriever = Retriever(client=vector_db)
+
+        # When
+        results = retriever.search("query", filters=ChunkFilter(document_id="security-policy"))
+
+        # Then
+        assert [r.chunk.content for r in results] == ["Content from security-policy"]
+
+    def test_repeated_queries_hit_the_embedding_cache(self, vector_db):
+        """Test that repeated queries are embedded once and counted as cache hits."""
+        # Given
+        from unittest.mock import MagicMock
+        embedding_client = MagicMock()
+        embedding_client.model = "mxbai-embed-large"
+        embedding_client.embed.return_value = Embedding(vector=[0.1] * 1024)
+        embedding_client.embed_many.side_effect = lambda texts: [Embedding(vector=[0.2] * 1024) for _ in texts]
+        retriever = Retriever(
+            client=vector_db, embedding_client=embedding_client, query_cache_size=2, result_cache_size=0
+        )
+
+        # When
+        retriever.search("What is MFA?")
+        retriever.search("What is MFA?")
+        retriever.search_many(["What is MFA?", "Who reviews access?"])
+        retriever.search("Is data encrypted?")  # evicts "What is MFA?"
+        retriever.search("What is MFA?")
+
+        # Then
+        assert embedding_client.embed.call_count == 3
+        embedding_client.embed_many.assert_called_once_with(["Who reviews access?"])
+        assert retriever.cache_stats() == {
+            "hits": 2, "misses": 4, "hit_rate": 2 / 6, "size": 2, "max_size": 2
+        }
+
+    def test_result_cache_serves_narrower_requests_until_corpus_changes(self, vector_db):
+        """Test that cached results answer smaller top_k / higher threshold and expire on writes."""
+        # Given
+        from unittest.mock import MagicMock
+        def vec(*values):
+            v = [0.0] * 1024
+            v[:len(values)] = values
+            return v
+        for chunk_id, vector in (("a", vec(1.0)), ("b", vec(1.0, 1.0)), ("c", vec(0.0, 1.0))):
+            vector_db.insert_chunk(ChunkRecord(
+                key=ChunkKey(document_id="doc-1", chunk_id=chunk_id, revision=1),
+                status="active", content=chunk_id, embedding=Embedding(vector=vector)
+            ))
+        embedding_client = MagicMock()
+        embedding_client.model = "mxbai-embed-large"
+        embedding_client.embed.return_value = Embedding(vector=vec(1.0))
+        retriever = Retriever(client=vector_db, embedding_client=embedding_client, query_cache_size=0)
+        search = MagicMock(wraps=vector_db.search_by_embedding)
+        vector_db.search_by_embedding = search
+
+        # When
+        wide = retriever.search("query", top_k=3, threshold=0.0)
+        narrow = retriever.search("query", top_k=1, threshold=0.0)
+        strict = retriever.search("query", top_k=3, threshold=0.9)
+        searches_before_write = search.call_count
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id="d", revision=1),
+            status="active", content="d", embedding=Embedding(vector=vec(1.0, 0.1))
+        ))
+        after_write = retriever.search("query", top_k=2, threshold=0.0)
+
+        # Then
+        assert [r.chunk.content for r in wide] == ["a", "b", "c"]
+        assert [r.chunk.content for r in narrow] == ["a"]
+        assert [r.chunk.content for r in strict] == ["a"]
+        assert searches_before_write == 1
+        assert [r.chunk.content for r in after_write] == ["a", "d"]
+        assert search.call_count == 2
+        assert retriever.result_cache.stats()["hits"] == 2
+
+    def test_rejects_unknown_mode(self, vector_db):
+        """Test that an unknown retrieval mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown retrieval mode"):
+            Retriever(client=vector_db, mode="keyword")
+
+    def test_rejects_hybrid_mode_without_text_search(self):
+        """Test that hybrid mode fails up front on a client without full-text search."""
+        from unittest.mock import Mock
+        from src.infrastructure.database.base import VectorDatabaseClient
+        # Given
+        client = Mock(spec=VectorDatabaseClient, supports_text_search=False)
+
+        # When / Then
+        with pytest.raises(ValueError, match="full-text search"):
+            Retriever(client=client, mode="hybrid")
+
+
+def test_reciprocal_rank_fusion_sums_reciprocal_ranks():
+    """Chunks score 1/(k + rank) per list they appear in."""
+    # Given
+    def result(chunk_id):
+        return SearchResult(
+            chunk=ChunkRecord(
+                key=ChunkKey(document_id="doc", chunk_id=chunk_id, revision=1),
+                status="active", content=chunk_id, embedding=None
+            ),
+            similarity=0.0
+        )
+
+    # When
+    fused = reciprocal_rank_fusion([[result("a"), result("b")], [result("b"), result("c")]], k=60)
+
+    # Then
+    assert [r.chunk.key.chunk_id for r in fused] == ["b", "a", "c"]
+    assert fused[0].similarity == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[1].similarity == pytest.approx(1 / 61)
+
+
+def test_mmr_mode_drops_redundant_neighbours(vector_db):
+    """Retriever with mmr_lambda < 1 over-fetches and returns diverse chunks."""
+    # Given: Two overlapping chunks closest to the query, one distinct relevant chunk
+    from unittest.mock import MagicMock
+    def vec(*values):
+        v = [0.0] * 1024
+        v[:len(values)] = values
+        return v
+    for chunk_id, vector in (("part-1", vec(1.0, 0.05)), ("part-1-overlap", vec(1.0, 0.06)), ("other", vec(0.6, 0.0, 0.8))):
+        vector_db.insert_chunk(ChunkRecord(
+            key=ChunkKey(document_id="doc-1", chunk_id=chunk_id, revision=1),
+            status="active", content=chunk_id, embedding=Embedding(vector=vector)
+        ))
+    embedding_client = MagicMock()
+    embedding_client.embed.return_value = Embedding(vector=vec(1.0))
+    embedding_client.embed_many.return_value = [Embedding(vector=vec(1.0))]
+    plain = Retriever(client=vector_db, embedding_client=embedding_client)
+    diverse = Retriever(client=vector_db, embedding_client=embedding_client, mmr_lambda=0.5, fetch_k=10)
+
+    # When
+    plain_results = plain.search("query", top_k=2)
+    diverse_results = diverse.search("query", top_k=2)
+    batched_results = diverse.search_many(["query"], top_k=2)
+
+    # Then
+    assert [r.chunk.content for r in plain_results] == ["part-1", "part-1-overlap"]
+    assert [r.chunk.content for r in diverse_results] == ["part-1", "other"]
+    assert [[r.chunk.content for r in hits] for hits in batched_results] == [["part-1", "other"]]